@@ -0,0 +1,441 @@
+"""Benchmarks of XDL loading, saving and compilation.
+
+Usage::
+
+    python scripts/benchmark.py xdlbin [xdl_file graph_file ...]
+    python scripts/benchmark.py props
+    python scripts/benchmark.py access
+    python scripts/benchmark.py parse [xdl_file ...]
+    python scripts/benchmark.py clone [xdl_file graph_file ...]
+    python scripts/benchmark.py graph [graph_file ...]
+    python scripts/benchmark.py array [graph_file]
+
+If no files are given the integration test procedures are used. These need
+the Chemputer platform to be installed, other platforms can be given with
+``--platform module:Class``.
+"""
+import argparse
+import copy
+import importlib
+import os
+import tempfile
+import time
+import tracemalloc
+
+import networkx
+
+from xdl import XDL
+from xdl.constants import VESSEL_PROP_TYPE, REAGENT_PROP_TYPE
+from xdl.hardware import Hardware
+from xdl.steps import Step, templates
+from xdl.utils import array_graph, cache, graph
+from xdl.utils.sanitisation import convert_val_to_std_units
+from xdl.readwrite.xml_generator import xdl_to_xml_string
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+INTEGRATION_FOLDER = os.path.join(HERE, '..', 'tests', 'integration', 'files')
+BIGRIG = os.path.join(HERE, '..', 'tests', 'unit', 'files', 'bigrig.json')
+
+#: Integration test procedures used if no files given, in the form
+#: ``[(xdl_file, graph_file)...]``.
+INTEGRATION_PROCEDURES = [
+    (os.path.join(INTEGRATION_FOLDER, f'{name}.xdl'),
+     os.path.join(INTEGRATION_FOLDER, f'{name}_graph.json'))
+    for name in [
+        'lidocaine',
+        'DMP',
+        'orgsyn_v80p0129',
+        'orgsyn_v81p0262',
+        'orgsyn_v83p0184a',
+        'orgsyn_v83p0193',
+        'orgsyn_v87p0016',
+        'orgsyn_v88p0152_a',
+        'orgsyn_v90p0251',
+    ]
+]
+
+def timeit(f, repeats):
+    """Return best time in seconds of calling ``f`` ``repeats`` times."""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        f()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def get_procedures(files):
+    """Get list of ``(xdl_file, graph_file)`` from command line files."""
+    if not files:
+        return INTEGRATION_PROCEDURES
+    if len(files) % 2:
+        raise ValueError('Files must be given as pairs of XDL and graph file.')
+    return list(zip(files[::2], files[1::2]))
+
+def get_platform(platform):
+    """Import platform class from ``'module:Class'`` str, or return ``None``
+    to use the default platform.
+    """
+    if platform is None:
+        return None
+    module, cls = platform.split(':')
+    return getattr(importlib.import_module(module), cls)
+
+def print_row(name, old, new):
+    print(f'{name:<24} {old * 1000:>10.1f} {new * 1000:>10.1f}'
+          f' {old / new:>8.1f}x')
+
+def save_xdlexe(x, save_path):
+    """Save compiled XDL object as xdlexe, as done in
+    :py:meth:`XDL.prepare_for_execution`.
+    """
+    with open(save_path, 'w') as fd:
+        fd.write(xdl_to_xml_string(
+            x, graph_hash=x.graph_sha256, full_properties=True,
+            full_tree=True))
+
+def benchmark_xdlbin(args):
+    """Compare saving and loading compiled procedures as xdlexe and xdlbin."""
+    print(f'{"":<24} {"xdlexe ms":>10} {"xdlbin ms":>10} {"speedup":>9}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for xdl_file, graph_file in get_procedures(args.files):
+            name = os.path.splitext(os.path.basename(xdl_file))[0]
+            xdlexe_f = os.path.join(tmp, f'{name}.xdlexe')
+            xdlbin_f = os.path.join(tmp, f'{name}.xdlbin')
+
+            x = XDL(xdl_file, platform=args.platform)
+            x.prepare_for_execution(
+                graph_file, interactive=False, save_path=xdlexe_f)
+            x.save(xdlbin_f, file_format='binary')
+
+            print_row(
+                f'{name} save',
+                timeit(lambda: save_xdlexe(x, xdlexe_f), args.repeats),
+                timeit(
+                    lambda: x.save(xdlbin_f, file_format='binary'),
+                    args.repeats),
+            )
+            print_row(
+                f'{name} load',
+                timeit(
+                    lambda: XDL(xdlexe_f, platform=args.platform),
+                    args.repeats),
+                timeit(
+                    lambda: XDL(xdlbin_f, platform=args.platform),
+                    args.repeats),
+            )
+
+def template_step_types():
+    """Return concrete step classes implementing every step template in
+    :py:mod:`xdl.steps.templates` with only the mandatory props, and a valid
+    props dict to instantiate each one with.
+
+    Returns:
+        List[Tuple[type, Dict[str, str]]]: ``[(step_type, props)...]``
+    """
+    type_values = {
+        VESSEL_PROP_TYPE: 'reactor',
+        REAGENT_PROP_TYPE: 'water',
+        float: '1',
+        int: '1',
+        bool: 'false',
+    }
+    step_types = []
+    for template in vars(templates).values():
+        if not (isinstance(template, type) and issubclass(template, Step)):
+            continue
+
+        step_type = type(template.MANDATORY_NAME, (template,), {
+            'PROP_TYPES': dict(template.MANDATORY_PROP_TYPES),
+            'DEFAULT_PROPS': dict(template.MANDATORY_DEFAULT_PROPS),
+            'PROP_LIMITS': dict(template.MANDATORY_PROP_LIMITS),
+            'get_steps': lambda self: [],
+            'execute': lambda self, *args, **kwargs: True,
+        })
+
+        # Props given as str as if read from XDL file.
+        props = {}
+        for prop, prop_type in step_type.PROP_TYPES.items():
+            prop_limit = step_type.PROP_LIMITS.get(prop, None)
+            if prop_limit and prop_limit.enum:
+                props[prop] = prop_limit.enum[0]
+            elif prop_limit and prop_limit.default and prop_type != float:
+                props[prop] = prop_limit.default
+            elif prop_limit and prop_limit.default:
+                # Not all units allowed by prop limits can be converted.
+                try:
+                    convert_val_to_std_units(prop_limit.default)
+                    props[prop] = prop_limit.default
+                except KeyError:
+                    props[prop] = '1'
+            else:
+                props[prop] = type_values.get(prop_type, '')
+        step_types.append((step_type, props))
+    return step_types
+
+def benchmark_props(args):
+    """Measure construction throughput of steps implementing step templates.
+    """
+    n = 200
+    total_props, total_time = 0, 0
+    print(f'{"":<24} {"props":>6} {"steps/s":>10}')
+    for step_type, props in template_step_types():
+        elapsed = timeit(
+            lambda: [step_type(dict(props)) for _ in range(n)], args.repeats)
+        total_props += len(props) * n
+        total_time += elapsed
+        print(f'{step_type.__name__:<24} {len(props):>6} {n / elapsed:>10.0f}')
+    print(f'\n{total_props / total_time:.0f} props/s')
+
+def benchmark_access(args):
+    """Measure getting and setting props of template steps as attributes."""
+    steps = [
+        (step_type(dict(props)), list(props))
+        for step_type, props in template_step_types()
+    ]
+    n = 100
+
+    def get_props():
+        for _ in range(n):
+            for step, props in steps:
+                for prop in props:
+                    getattr(step, prop)
+
+    def set_props():
+        for _ in range(n):
+            for step, props in steps:
+                for prop in props:
+                    setattr(step, prop, step.properties[prop])
+
+    total_props = sum(len(props) for _, props in steps) * n
+    for name, f in [('get', get_props), ('set', set_props)]:
+        elapsed = timeit(f, args.repeats)
+        print(f'{name:<24} {elapsed / total_props * 1e9:>10.0f} ns/prop')
+
+def benchmark_parse(args):
+    """Measure parsing and saving uncompiled procedures as XML."""
+    files = args.files or [
+        xdl_file for xdl_file, _ in INTEGRATION_PROCEDURES]
+    total_parse, total_save = 0, 0
+    print(f'{"":<24} {"parse ms":>10} {"save ms":>10}')
+    for xdl_file in files:
+        name = os.path.splitext(os.path.basename(xdl_file))[0]
+        x = XDL(xdl_file, platform=args.platform)
+        parse_time = timeit(
+            lambda: XDL(xdl_file, platform=args.platform), args.repeats)
+        save_time = timeit(lambda: xdl_to_xml_string(x), args.repeats)
+        total_parse += parse_time
+        total_save += save_time
+        print(f'{name:<24} {parse_time * 1000:>10.1f}'
+              f' {save_time * 1000:>10.1f}')
+    print(f'{"total":<24} {total_parse * 1000:>10.1f}'
+          f' {total_save * 1000:>10.1f}')
+
+def rebuild_step(step):
+    """Copy step by instantiating it again from its properties, as
+    ``copy.deepcopy`` did before :py:meth:`Step.clone`.
+    """
+    props = {k: v for k, v in step.properties.items() if k != 'children'}
+    if 'children' in step.properties and step.children:
+        props['children'] = [rebuild_step(child) for child in step.children]
+    return type(step)(**props)
+
+def rebuild_xdl(x):
+    """Copy procedure by instantiating everything again from properties, as
+    ``copy.deepcopy`` did before :py:meth:`XDL.clone`.
+    """
+    return XDL(
+        steps=[rebuild_step(step) for step in x.steps],
+        reagents=[
+            type(reagent)(**copy.deepcopy(reagent.properties))
+            for reagent in x.reagents
+        ],
+        hardware=Hardware([
+            type(component)(**copy.deepcopy(component.properties))
+            for component in x.hardware
+        ]),
+        logging_level=x.logging_level,
+        platform=type(x.platform),
+    )
+
+def benchmark_clone(args):
+    """Compare copying compiled procedures by instantiating everything again
+    and with XDL.clone.
+    """
+    print(f'{"":<24} {"rebuild ms":>10} {"clone ms":>10} {"speedup":>9}')
+    for xdl_file, graph_file in get_procedures(args.files):
+        name = os.path.splitext(os.path.basename(xdl_file))[0]
+        x = XDL(xdl_file, platform=args.platform)
+        with tempfile.TemporaryDirectory() as tmp:
+            x.prepare_for_execution(
+                graph_file, interactive=False,
+                save_path=os.path.join(tmp, f'{name}.xdlexe'))
+
+        def rebuild():
+            # Substeps are generated again when first used.
+            for step in rebuild_xdl(x).base_steps:
+                pass
+
+        def clone():
+            for step in x.clone().base_steps:
+                pass
+
+        print_row(
+            name,
+            timeit(rebuild, args.repeats),
+            timeit(clone, args.repeats),
+        )
+
+def benchmark_graph(args):
+    """Compare loading graph files by parsing them, from the on-disk graph
+    cache and from the in-memory graph cache.
+    """
+    files = args.files or [
+        graph_file for _, graph_file in INTEGRATION_PROCEDURES] + [
+        os.path.join(INTEGRATION_FOLDER, 'AlkylFluor_graph.graphml')]
+    print(f'{"":<24} {"parse ms":>10} {"disk ms":>10} {"memory ms":>10}')
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ[cache.CACHE_DIR_ENV_VAR] = tmp
+        for graph_file in files:
+            name = os.path.splitext(os.path.basename(graph_file))[0]
+
+            def load_uncached():
+                graph.clear_graph_cache()
+                graph.get_graph(graph_file)
+
+            cache.disable_cache()
+            parse_time = timeit(load_uncached, args.repeats)
+            cache.enable_cache()
+            graph.get_graph(graph_file)
+            disk_time = timeit(load_uncached, args.repeats)
+            memory_time = timeit(
+                lambda: graph.get_graph(graph_file), args.repeats)
+            print(f'{name:<24} {parse_time * 1000:>10.2f}'
+                  f' {disk_time * 1000:>10.2f} {memory_time * 1000:>10.2f}')
+
+def synthetic_rig(rig, copies):
+    """Return graph of ``copies`` copies of rig, with ``_i`` appended to node
+    names of copy ``i``, and the first valve of every copy connected to the
+    first valve of the next copy.
+    """
+    valve = next(node for node, data in rig.nodes(data=True)
+                 if data.get('class', None) == 'ChemputerValve')
+    big = networkx.MultiDiGraph()
+    for i in range(copies):
+        big.update(networkx.relabel_nodes(
+            rig, {node: f'{node}_{i}' for node in rig.nodes}))
+        if i:
+            big.add_edge(f'{valve}_{i - 1}', f'{valve}_{i}', port=['-1', '-1'])
+            big.add_edge(f'{valve}_{i}', f'{valve}_{i - 1}', port=['-1', '-1'])
+    return big
+
+def graph_memory(make_graph):
+    """Return size in bytes of memory allocated by ``make_graph`` that is
+    still in use once it returns.
+    """
+    tracemalloc.start()
+    graph = make_graph()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+    return size
+
+def benchmark_array(args):
+    """Compare memory use and traversal time of networkx graphs and array
+    graphs, for bigrig and a synthetic graph 10 times the size.
+    """
+    rig = graph.get_graph(args.file or BIGRIG)
+    graphs = [('bigrig', rig), ('bigrig x10', synthetic_rig(rig, 10))]
+    print(f'{"":<24} {"networkx":>10} {"array":>10} {"speedup":>8}')
+    for name, nx_graph in graphs:
+        print(f'{name} ({len(nx_graph)} nodes,'
+              f' {nx_graph.number_of_edges()} edges)')
+        # Build once first so lazy imports aren't counted.
+        array_graph.ArrayGraph(nx_graph).all_shortest_path_lengths()
+        nx_size = graph_memory(lambda: graph._copy_graph(nx_graph))
+        array_size = graph_memory(lambda: array_graph.ArrayGraph(nx_graph))
+        print(f'{"memory KiB":<24} {nx_size / 1024:>10.1f}'
+              f' {array_size / 1024:>10.1f} {nx_size / array_size:>8.1f}x')
+
+        arr = array_graph.ArrayGraph(nx_graph)
+        nodes = list(nx_graph.nodes)
+
+        def nx_bfs():
+            for node in nodes:
+                networkx.single_source_shortest_path_length(nx_graph, node)
+
+        def array_bfs():
+            for node in nodes:
+                arr.shortest_path_lengths(node)
+
+        def nx_all_pairs():
+            dict(networkx.all_pairs_shortest_path_length(nx_graph))
+
+        def nx_neighbors():
+            for node in nodes:
+                set(nx_graph.successors(node)) | set(
+                    nx_graph.predecessors(node))
+
+        def array_neighbors():
+            for node in nodes:
+                arr.neighbors(node)
+
+        print_row('BFS from every node ms',
+                  timeit(nx_bfs, args.repeats),
+                  timeit(array_bfs, args.repeats))
+        print_row('all pairs distances ms',
+                  timeit(nx_all_pairs, args.repeats),
+                  timeit(arr.all_shortest_path_lengths, args.repeats))
+        print_row('neighbors of nodes ms',
+                  timeit(nx_neighbors, args.repeats),
+                  timeit(array_neighbors, args.repeats))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument(
+        '--platform', type=get_platform, default=None,
+        help='Platform to use as module:Class, default Chemputer platform.')
+    subparsers = parser.add_subparsers(dest='benchmark')
+    subparsers.required = True
+
+    xdlbin_parser = subparsers.add_parser(
+        'xdlbin', help=benchmark_xdlbin.__doc__)
+    xdlbin_parser.add_argument('files', nargs='*')
+    xdlbin_parser.set_defaults(func=benchmark_xdlbin)
+
+    props_parser = subparsers.add_parser(
+        'props', help=benchmark_props.__doc__)
+    props_parser.set_defaults(func=benchmark_props)
+
+    access_parser = subparsers.add_parser(
+        'access', help=benchmark_access.__doc__)
+    access_parser.set_defaults(func=benchmark_access)
+
+    parse_parser = subparsers.add_parser(
+        'parse', help=benchmark_parse.__doc__)
+    parse_parser.add_argument('files', nargs='*')
+    parse_parser.set_defaults(func=benchmark_parse)
+
+    clone_parser = subparsers.add_parser(
+        'clone', help=benchmark_clone.__doc__)
+    clone_parser.add_argument('files', nargs='*')
+    clone_parser.set_defaults(func=benchmark_clone)
+
+    graph_parser = subparsers.add_parser(
+        'graph', help=benchmark_graph.__doc__)
+    graph_parser.add_argument('files', nargs='*')
+    graph_parser.set_defaults(func=benchmark_graph)
+
+    array_parser = subparsers.add_parser(
+        'array', help=benchmark_array.__doc__)
+    array_parser.add_argument('file', nargs='?')
+    array_parser.set_defaults(func=benchmark_array)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -34,6 +34,11 @@ setup(
         'xdl': get_localisation_files()
     },
     include_package_data=True,
+    entry_points={
+        'console_scripts': [
+            'xdl=xdl.cli:main',
+        ]
+    },
     install_requires=[
         'lxml>=4',
         'networkx>=2',
@@ -44,5 +49,9 @@ setup(
         # socket.io stuff breaking than other stuff breaking.
         'python-socketio==4.6.0',
         'websocket-client==0.57.0'
-    ]
+    ],
+    extras_require={
+        # Compact array backed graphs, see xdl.utils.array_graph
+        'array': ['numpy>=1.16'],
+    }
 )
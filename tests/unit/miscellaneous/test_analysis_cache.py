@@ -0,0 +1,132 @@
+import pytest
+
+from xdl import XDL
+from xdl.steps import Step, AbstractDynamicStep
+from xdl.steps.core import step as step_module
+from xdl.utils.graph import get_graph
+
+from ..utils import generate_procedure, UnitTestPlatform, GRAPH, TransferLiquid
+
+@pytest.mark.unit
+def test_cached_duration_and_reagent_volumes(monkeypatch):
+    """Test durations and reagents consumed of steps are cached, and only
+    recalculated for edited steps and the steps containing them.
+    """
+    x = XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, interactive=False)
+
+    calls = []
+    duration = TransferLiquid.duration
+
+    def counted_duration(self, graph):
+        calls.append(self)
+        return duration(self, graph)
+
+    monkeypatch.setattr(TransferLiquid, 'duration', counted_duration)
+
+    first_duration = x.duration()
+    first_volumes = x.reagent_volumes()
+    assert calls == []
+    assert x.duration() is not first_duration
+    assert x.duration().most_likely == first_duration.most_likely
+    assert x.reagent_volumes() == first_volumes
+
+    # Only the edited step is recalculated.
+    step = x.steps[0]
+    transfer = step.steps[0]
+    transfer.volume += 1
+    assert x.duration().most_likely == first_duration.most_likely + 1
+    assert calls == [transfer]
+    volumes = x.reagent_volumes()
+    assert volumes['flask_water'] == first_volumes['flask_water'] + 1
+
+    # Editing step regenerates substeps, which are all recalculated.
+    step.volume = 20
+    step.reagent_vessel = 'flask_water'
+    x.duration()
+    assert calls[1:] == [step.steps[0]]
+
+    # Copy of graph has the same graph hash, so nothing is recalculated.
+    x.executor._graph = x.executor._graph.copy()
+    calls.clear()
+    x.duration()
+    assert calls == []
+
+    # Graph changed in place, everything recalculated. Repeated steps are only
+    # calculated once.
+    x.executor._graph.nodes['flask_water']['chemical'] = 'ether'
+    x.duration()
+    assert len(calls) == len({
+        id(base_step) for base_step in x.base_steps
+        if type(base_step) is TransferLiquid
+    })
+
+@pytest.mark.unit
+def test_cached_duration_not_recalculated(monkeypatch):
+    """Test cached durations of unchanged steps are returned without getting
+    the durations of their substeps, and that the graph is only hashed once
+    per procedure duration.
+    """
+    x = XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, interactive=False)
+    x.duration()
+
+    substep_calls = []
+    graph_hashes = []
+    cached_duration = Step.cached_duration
+    graph_hash = step_module.get_graph_hash
+
+    def counted_cached_duration(self, graph):
+        substep_calls.append(self)
+        return cached_duration(self, graph)
+
+    def counted_graph_hash(graph):
+        graph_hashes.append(graph)
+        return graph_hash(graph)
+
+    monkeypatch.setattr(Step, 'cached_duration', counted_cached_duration)
+    monkeypatch.setattr(step_module, 'get_graph_hash', counted_graph_hash)
+    x.duration()
+    assert list(map(id, substep_calls)) == list(map(id, x.steps))
+    assert len(graph_hashes) == 1
+
+class DynamicTransfer(AbstractDynamicStep):
+    PROP_TYPES = {
+        'volume': float,
+    }
+
+    def __init__(self, volume, **kwargs):
+        super().__init__(locals())
+
+    def on_start(self):
+        return [TransferLiquid('flask_water', 'reactor', self.volume)]
+
+    def on_continue(self):
+        return []
+
+    def on_finish(self):
+        return []
+
+    def get_simulation_steps(self):
+        return self.on_start()
+
+@pytest.mark.unit
+def test_cached_analysis_of_dynamic_step():
+    """Test cached duration and reagents consumed of dynamic steps follow
+    changes to start block.
+    """
+    graph = get_graph(GRAPH)
+    step = DynamicTransfer(volume=5)
+    step.start_block = []
+    assert step.cached_duration(graph).most_likely == 0
+    assert step.cached_reagents_consumed(graph) == {}
+
+    step.start_block = step.on_start()
+    assert step.cached_duration(graph).most_likely == 5
+    assert step.cached_reagents_consumed(graph) == {'flask_water': 5}
+
+    step.start_block[0].volume = 10
+    assert step.cached_duration(graph).most_likely == 10
+    step.start_block = []
+    assert step.cached_duration(graph).most_likely == 0
+    assert step.cached_reagents_consumed(graph) == {}
@@ -0,0 +1,81 @@
+import os
+
+import networkx
+import pytest
+
+from xdl.errors import XDLGraphMissingDependencyError
+from xdl.utils import array_graph
+from xdl.utils.graph import (
+    get_graph,
+    get_graph_index,
+    get_routing_table,
+    FLASK,
+    VALVE,
+)
+from xdl.utils.hashing import graph_hash
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+BIGRIG = os.path.join(HERE, '..', 'files', 'bigrig.json')
+
+@pytest.mark.unit
+def test_array_graph():
+    """Test array graph gives same neighbors, classes, attributes and paths as
+    networkx graph, and converts back to an identical networkx graph.
+    """
+    pytest.importorskip('numpy')
+    graph = get_graph(BIGRIG)
+    arr = get_graph(BIGRIG, array=True)
+    assert arr is get_graph(BIGRIG, array=True)
+    assert len(arr) == len(graph)
+    assert arr.number_of_edges() == graph.number_of_edges()
+
+    graph_index = get_graph_index(graph)
+    for node in graph.nodes:
+        assert arr.node_ids[arr.nodes[arr.node_id(node)]] == arr.node_id(node)
+        assert set(arr.successors(node)) == set(graph.successors(node))
+        assert set(arr.predecessors(node)) == set(graph.predecessors(node))
+        assert set(arr.neighbors(node)) == set(graph_index.neighbors(node))
+        assert arr.node_data(node) == graph.nodes[node]
+        assert arr.node_attr(node, 'class') == graph.nodes[node]['class']
+    assert arr.node_attr('flask_water', 'missing', 'default') == 'default'
+    for node_class in (FLASK, VALVE):
+        assert arr.nodes_of_class(node_class) == graph_index.nodes_of_class(
+            node_class)
+    assert arr.nodes_of_class('NotAClass') == []
+
+    for src, dest, data in graph.edges(data=True):
+        assert data in arr.edge_data(src, dest)
+
+    routing_table = get_routing_table(graph)
+    distances = arr.all_shortest_path_lengths(fluidic=True)
+    for src in graph.nodes:
+        lengths = arr.shortest_path_lengths(src)
+        expected = networkx.single_source_shortest_path_length(graph, src)
+        for dest in graph.nodes:
+            assert lengths[arr.node_id(dest)] == expected.get(dest, -1)
+
+            path = arr.path(src, dest, fluidic=True)
+            expected_path = routing_table.path(src, dest)
+            if expected_path is None:
+                assert path is None
+                assert distances[arr.node_id(src), arr.node_id(dest)] == -1
+            else:
+                assert len(path) == len(expected_path)
+                assert path[0] == src and path[-1] == dest
+                assert all(routing_table.is_connected(path[i], path[i + 1])
+                           for i in range(len(path) - 1))
+                assert distances[arr.node_id(src), arr.node_id(dest)] == (
+                    len(path) - 1)
+
+    converted = arr.to_networkx()
+    assert graph_hash(converted) == graph_hash(graph)
+    assert list(converted.nodes) == list(graph.nodes)
+    converted.nodes['flask_water']['chemical'] = 'changed'
+    assert arr.node_attr('flask_water', 'chemical') != 'changed'
+
+@pytest.mark.unit
+def test_array_graph_missing_numpy(monkeypatch):
+    """Test helpful error is raised if numpy isn't installed."""
+    monkeypatch.setattr(array_graph, 'numpy', None)
+    with pytest.raises(XDLGraphMissingDependencyError):
+        get_graph(BIGRIG, array=True)
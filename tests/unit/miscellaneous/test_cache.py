@@ -0,0 +1,232 @@
+import os
+import shutil
+import pytest
+from networkx.readwrite import json_graph
+
+from xdl import XDL
+from xdl.cli import main
+from xdl.utils.cache import DiskCache, get_cache
+from xdl.utils import graph as graph_utils
+from xdl.utils.graph import get_graph, clear_graph_cache
+from ..utils import (
+    UnitTestPlatform, generate_procedure, full_xdlexe_str, GRAPH)
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDL_CACHE', '1')
+    monkeypatch.setenv('XDL_CACHE_DIR', str(tmp_path / 'cache'))
+    return tmp_path
+
+@pytest.mark.unit
+def test_disk_cache_lru(tmp_path):
+    cache = DiskCache(str(tmp_path / 'test'), max_size=25)
+    assert cache.get('a') is None
+    for i, key in enumerate(['a', 'b']):
+        cache.set(key, key.encode() * 10)
+        os.utime(cache._entry_path(key), (i, i))
+
+    # Reading a makes b least recently used, so b is evicted.
+    assert cache.get('a') == b'a' * 10
+    cache.set('c', b'c' * 10)
+    assert cache.get('b') is None
+    assert cache.get('a') == b'a' * 10
+    assert cache.get('c') == b'c' * 10
+    assert cache.stats()['entries'] == 2
+    assert cache.stats()['size'] == 20
+
+    # Values larger than cache are not stored
+    cache.set('d', b'd' * 30)
+    assert cache.get('d') is None
+
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+
+@pytest.mark.unit
+def test_parse_cache(cache_dir, monkeypatch):
+    """Test XDL files loaded from parse cache are identical to parsed files,
+    and that parse cache is not used with a different platform.
+    """
+    xdl_f = str(cache_dir / 'procedure.xdl')
+    xdlexe_f = str(cache_dir / 'procedure.xdlexe')
+    json_f = str(cache_dir / 'procedure.json')
+    x = XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform)
+    x.save(xdl_f)
+    x.save(json_f, file_format='json')
+    x.prepare_for_execution(GRAPH, save_path=xdlexe_f)
+
+    parsed = [
+        XDL(xdl_f, platform=UnitTestPlatform),
+        XDL(json_f, platform=UnitTestPlatform),
+        XDL(xdlexe_f, platform=UnitTestPlatform),
+    ]
+    assert get_cache('parse').stats()['entries'] == 3
+
+    def fail(*args, **kwargs):
+        raise AssertionError('File parsed instead of loaded from cache.')
+    monkeypatch.setattr('xdl.xdl.xdl_file_to_objs', fail)
+    monkeypatch.setattr('xdl.readwrite.json.xdl_from_json', fail)
+
+    cached = [
+        XDL(xdl_f, platform=UnitTestPlatform),
+        XDL(json_f, platform=UnitTestPlatform),
+        XDL(xdlexe_f, platform=UnitTestPlatform),
+        XDL(xdlexe_f, platform=UnitTestPlatform, lazy=True),
+    ]
+    assert cached[0].as_string() == parsed[0].as_string()
+    assert cached[1].as_json() == parsed[1].as_json()
+    assert cached[2].compiled
+    assert full_xdlexe_str(cached[2]) == full_xdlexe_str(parsed[2])
+    assert full_xdlexe_str(cached[3]) == full_xdlexe_str(parsed[2])
+
+    # Parsing XML gives steps new UUIDs, so loading from cache must too.
+    def step_uuids(x):
+        steps = list(x.steps)
+        for step in steps:
+            steps.extend(step.properties.get('children', None) or [])
+        return {step.uuid for step in steps}
+    xml_loads = [parsed[0], parsed[2], cached[0], cached[2], cached[3]]
+    uuids = [step_uuids(x) for x in xml_loads]
+    assert sum(map(len, uuids)) == len(set().union(*uuids))
+    assert step_uuids(cached[1]) == step_uuids(parsed[1])
+
+    class OtherPlatform(UnitTestPlatform):
+        pass
+
+    with pytest.raises(AssertionError):
+        XDL(xdl_f, platform=OtherPlatform)
+
+@pytest.mark.unit
+def test_cache_cli(cache_dir, capsys):
+    XDL(generate_procedure(n_blocks=1), platform=UnitTestPlatform).save(
+        str(cache_dir / 'procedure.xdl'))
+    XDL(str(cache_dir / 'procedure.xdl'), platform=UnitTestPlatform)
+
+    main(['cache', 'stats'])
+    assert 'parse: 1 entries' in capsys.readouterr().out
+
+    main(['cache', 'clear'])
+    main(['cache', 'stats'])
+    assert 'parse: 0 entries' in capsys.readouterr().out
+
+@pytest.mark.unit
+def test_platform_fingerprint(monkeypatch):
+    """Test platform fingerprint changes when platform package version or
+    prop specification of a step changes.
+    """
+    platform = UnitTestPlatform()
+    fingerprint = platform.fingerprint
+    assert UnitTestPlatform().fingerprint == fingerprint
+
+    step_type = next(iter(platform.step_library.values()))
+    monkeypatch.setattr(
+        step_type, 'DEFAULT_PROPS', {**step_type.DEFAULT_PROPS, 'new': 1})
+    assert platform.fingerprint != fingerprint
+    monkeypatch.undo()
+    assert platform.fingerprint == fingerprint
+
+    monkeypatch.setattr(
+        'xdl.platforms.abstract_platform._package_version',
+        lambda package: '999')
+    assert platform.fingerprint != fingerprint
+
+@pytest.mark.unit
+def test_compile_cache(cache_dir, monkeypatch):
+    """Test compiling same procedure with same graph loads compiled procedure
+    from compile cache without compiling, and that procedures or graphs that
+    differ are compiled.
+    """
+    compiled = XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform)
+    compiled.prepare_for_execution(GRAPH, interactive=False)
+    assert get_cache('compile').stats()['entries'] == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError('Procedure compiled instead of loaded from cache.')
+    monkeypatch.setattr(
+        'tests.unit.utils.UnitTestExecutor.prepare_for_execution', fail)
+
+    # Same procedure loaded again, UUIDs differ
+    xdlexe_f = str(cache_dir / 'procedure.xdlexe')
+    cached = XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform)
+    steps = list(cached.steps)
+    uuids = [step.uuid for step in steps]
+    cached.prepare_for_execution(
+        GRAPH, interactive=False, save_path=xdlexe_f)
+    assert cached.compiled
+    assert cached.executor._prepared_for_execution
+
+    # Cache hit compiles existing steps, so step objects and UUIDs are kept.
+    assert all(a is b for a, b in zip(cached.steps, steps))
+    assert [step.uuid for step in cached.steps] == uuids
+    assert not any(step.needs_recompile for step in steps)
+    executed = []
+    monkeypatch.setattr(
+        cached.executor, 'execute_step',
+        lambda controller, step, step_indexes: executed.append(
+            (step, step_indexes)))
+    cached.execute(object(), step=steps[2])
+    assert executed == [(steps[2], [2])]
+    assert cached.graph_sha256 == compiled.graph_sha256
+    assert full_xdlexe_str(cached) == full_xdlexe_str(compiled)
+    assert cached.duration().most_likely == compiled.duration().most_likely
+    assert full_xdlexe_str(
+        XDL(xdlexe_f, platform=UnitTestPlatform)) == full_xdlexe_str(compiled)
+
+    # Different procedure
+    x = XDL(generate_procedure(n_blocks=2), platform=UnitTestPlatform)
+    with pytest.raises(AssertionError):
+        x.prepare_for_execution(GRAPH, interactive=False)
+
+    # Different compile options
+    x = XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform)
+    with pytest.raises(AssertionError):
+        x.prepare_for_execution(GRAPH, interactive=False, sanity_check=False)
+
+@pytest.mark.unit
+def test_graph_cache(cache_dir, monkeypatch):
+    """Test graph files are loaded from memory cache, then disk cache, and
+    that changed files are parsed again. Every load should return a separate
+    copy of the graph.
+    """
+    graph_f = str(cache_dir / 'graph.json')
+    shutil.copy(GRAPH, graph_f)
+    clear_graph_cache()
+    graph = get_graph(graph_f)
+    assert get_cache('graph').stats()['entries'] == 1
+
+    parsed = []
+    read_graph_file = graph_utils._read_graph_file
+
+    def counted_read_graph_file(*args, **kwargs):
+        parsed.append(args)
+        return read_graph_file(*args, **kwargs)
+    monkeypatch.setattr(
+        graph_utils, '_read_graph_file', counted_read_graph_file)
+
+    # Changing loaded graph doesn't change cached graph.
+    edge = next(iter(graph.edges))
+    port = list(graph.edges[edge]['port'])
+    graph.edges[edge]['port'][0] = 'changed'
+    graph.remove_node(edge[0])
+    cached = get_graph(graph_f)
+    assert cached is not graph
+    assert cached.edges[edge]['port'] == port
+    assert len(cached) == len(graph) + 1
+
+    # Loaded from disk cache.
+    clear_graph_cache()
+    assert json_graph.node_link_data(get_graph(graph_f)) == (
+        json_graph.node_link_data(cached))
+    assert not parsed
+
+    # File changed, parsed again.
+    with open(graph_f, 'a') as fd:
+        fd.write('\n')
+    assert json_graph.node_link_data(get_graph(graph_f)) == (
+        json_graph.node_link_data(cached))
+    assert len(parsed) == 1
+
+    # Mutable attribute values are copied too.
+    cached.nodes[edge[1]]['extra'] = {'values': [1]}
+    copied = graph_utils._copy_graph(cached)
+    copied.nodes[edge[1]]['extra']['values'].append(2)
+    assert cached.nodes[edge[1]]['extra'] == {'values': [1]}
@@ -0,0 +1,67 @@
+import copy
+import pytest
+
+from xdl import XDL
+from xdl.steps import Async, Repeat
+
+from ..utils import (
+    generate_procedure, full_xdlexe_str, UnitTestPlatform, GRAPH)
+
+@pytest.mark.unit
+def test_clone_step():
+    """Test cloned steps are equal to but independent of original steps, and
+    that UUIDs are kept or regenerated as requested.
+    """
+    x = XDL(generate_procedure(n_blocks=2), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, interactive=False)
+    for step in x.steps:
+        cloned = step.clone()
+        assert cloned == step
+        assert cloned.uuid != step.uuid
+        assert [substep.name for substep in cloned.steps] == [
+            substep.name for substep in step.steps]
+        assert all(
+            cloned_substep is not substep and cloned_substep == substep
+            for cloned_substep, substep in zip(cloned.steps, step.steps))
+        assert step.clone(keep_uuid=True).uuid == step.uuid
+        assert copy.deepcopy(step) == step
+
+    # Repeated children are shared in clone as in original.
+    repeat = next(step for step in x.steps if type(step) is Repeat)
+    cloned = repeat.clone(keep_uuid=True)
+    assert cloned.steps[0] is cloned.children[0]
+    assert cloned.steps[0].uuid == repeat.children[0].uuid
+    assert cloned.steps[0] is not repeat.children[0]
+
+    # Editing clone doesn't affect original.
+    cloned = x.steps[0].clone()
+    cloned.steps[0].volume = 50
+    assert x.steps[0].steps[0].volume == 1
+    cloned.volume = 100
+    assert x.steps[0].volume == 1
+    assert cloned.steps[0].volume == 100
+
+    # Async steps hold execution state so are instantiated again.
+    async_step = Async(children=[x.steps[0]], pid='async')
+    async_step.finished = True
+    cloned = async_step.clone()
+    assert not cloned.finished
+    assert cloned.children[0] == x.steps[0]
+    assert cloned.steps is cloned.children
+
+@pytest.mark.unit
+def test_clone_xdl():
+    """Test cloning compiled procedure gives identical compiled procedure."""
+    x = XDL(generate_procedure(n_blocks=2), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, interactive=False)
+    cloned = x.clone(keep_uuids=True)
+    assert cloned.compiled
+    assert full_xdlexe_str(cloned) == full_xdlexe_str(x)
+    assert [step.uuid for step in cloned.steps] == [
+        step.uuid for step in x.steps]
+    assert cloned.duration().most_likely == x.duration().most_likely
+
+    cloned = copy.deepcopy(x)
+    assert full_xdlexe_str(cloned) == full_xdlexe_str(x)
+    assert not set(step.uuid for step in cloned.steps) & set(
+        step.uuid for step in x.steps)
@@ -0,0 +1,47 @@
+import pytest
+
+from xdl.utils.prop_limits import (
+    PropLimit,
+    ADD_PURPOSE_PROP_LIMIT,
+    WASH_SOLID_STIR_PROP_LIMIT,
+    VOLUME_PROP_LIMIT,
+)
+
+@pytest.mark.unit
+def test_enum_prop_limit():
+    """Test enum fast path gives same results as matching regex."""
+    for value in ['neutralize', 'dilute', 'dilute-further', 'Dilute', '']:
+        assert (ADD_PURPOSE_PROP_LIMIT.validate(value)
+                == bool(ADD_PURPOSE_PROP_LIMIT._pattern.match(value)))
+    assert ADD_PURPOSE_PROP_LIMIT.validate('dilute')
+    assert not ADD_PURPOSE_PROP_LIMIT.validate('evaporate')
+
+    # Explicit regex given with enum
+    assert WASH_SOLID_STIR_PROP_LIMIT.validate('True')
+    assert WASH_SOLID_STIR_PROP_LIMIT.validate('solvent')
+    assert not WASH_SOLID_STIR_PROP_LIMIT.validate('sometimes')
+
+    # Enum values that don't match regex are not accepted by fast path.
+    prop_limit = PropLimit(regex=r'[a-z]+', enum=['top', 'BOTTOM'])
+    assert prop_limit.validate('top')
+    assert not prop_limit.validate('BOTTOM')
+
+@pytest.mark.unit
+def test_prop_limit_regex_recompiled():
+    """Test changing regex or enum of prop limit after creation is respected.
+    """
+    prop_limit = PropLimit(regex=r'[0-9]+')
+    assert prop_limit.validate('10')
+    prop_limit.regex = r'[a-z]+'
+    assert not prop_limit.validate('10')
+    assert prop_limit.validate('abc')
+
+    prop_limit = PropLimit(enum=['top', 'bottom'])
+    prop_limit.enum = ['left', 'right']
+    assert prop_limit.validate('top')
+    prop_limit.regex = prop_limit.generate_enum_regex()
+    assert prop_limit.validate('left')
+    assert not prop_limit.validate('top')
+
+    assert VOLUME_PROP_LIMIT.validate('10 mL')
+    assert not VOLUME_PROP_LIMIT.validate('10 mg')
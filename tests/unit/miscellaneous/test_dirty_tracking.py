@@ -0,0 +1,71 @@
+import pytest
+
+from xdl.steps import Repeat, Wait
+
+from ..utils import AddReagent, TransferLiquid
+
+@pytest.mark.unit
+def test_steps_regenerated_only_on_change():
+    """Test substeps are only regenerated when properties actually change."""
+    step = AddReagent(vessel='reactor', reagent='water', volume='5 mL')
+    step.reagent_vessel = 'flask_water'
+    substeps = step.steps
+    assert step.steps is substeps
+
+    # Same value after sanitization, steps not regenerated.
+    step.volume = '5 mL'
+    step.reagent_vessel = 'flask_water'
+    assert step.steps is substeps
+
+    step.volume = 10
+    assert step.steps is not substeps
+    assert step.steps[0].volume == 10
+
+    # Editing properties dict directly then calling update regenerates steps.
+    substeps = step.steps
+    step.properties['volume'] = '1 mL'
+    assert step.steps is substeps
+    step.update()
+    assert step.steps is not substeps
+    assert step.steps[0].volume == 1
+
+@pytest.mark.unit
+def test_steps_regenerated_on_children_change():
+    """Test steps with children are regenerated when child steps are added,
+    removed or replaced, but not when properties of children change.
+    """
+    transfer = TransferLiquid('flask_water', 'reactor', '5 mL')
+    repeat = Repeat(repeats=2, children=[transfer, Wait(time='1 min')])
+    assert len(repeat.steps) == 4
+
+    transfer.volume = 10
+    assert repeat.steps[0] is transfer
+
+    repeat.children.pop()
+    assert len(repeat.steps) == 2
+
+    repeat.children[0] = Wait(time='2 min')
+    assert repeat.steps[0] is repeat.children[0]
+
+    repeat.children = [transfer]
+    assert repeat.steps == [transfer, transfer]
+
+@pytest.mark.unit
+def test_deferred_substeps_update():
+    """Test deferred substeps update is discarded if properties change."""
+    updated = []
+
+    step = AddReagent(vessel='reactor', reagent='water', volume='5 mL')
+    step.defer_substeps_update(updated.append)
+    step.steps
+    assert updated == [step]
+
+    step.defer_substeps_update(updated.append)
+    step.volume = '5 mL'
+    step.steps
+    assert updated == [step, step]
+
+    step.defer_substeps_update(updated.append)
+    step.volume = 15
+    step.steps
+    assert updated == [step, step]
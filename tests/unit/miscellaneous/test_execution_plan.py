@@ -0,0 +1,60 @@
+import pytest
+
+from xdl import XDL
+from xdl.errors import XDLExecutionBeforeCompilationError
+from xdl.execution.plan import ExecutionPlan
+from xdl.steps import Async, Await, Wait
+
+from ..utils import (
+    generate_procedure, UnitTestPlatform, GRAPH, TransferLiquid)
+
+@pytest.mark.unit
+def test_execution_plan():
+    """Test execution plan lists base steps of procedure in execution order
+    with index paths and parent chains.
+    """
+    x = XDL(
+        generate_procedure(n_blocks=2, repeats=2), platform=UnitTestPlatform)
+    with pytest.raises(XDLExecutionBeforeCompilationError):
+        x.execution_plan
+    x.prepare_for_execution(GRAPH, interactive=False)
+    plan = x.execution_plan
+
+    assert len(plan) == len(x.base_steps)
+    for entry, base_step in zip(plan, x.base_steps):
+        assert entry.step is base_step
+        step = x.steps[entry.index_path[0]]
+        for parent, i in zip(entry.parents, entry.index_path[1:]):
+            assert parent is step
+            step = step.steps[i]
+        assert step is entry.step
+        assert entry.level == len(entry.index_path) - 1
+
+    # Jump straight to steps
+    for step in x.steps:
+        start, end = plan.step_range(step.uuid)
+        assert [entry.step for entry in plan[start:end]] == step.base_steps
+    wash = x.steps[1]
+    assert plan.index(wash.uuid) == plan.step_range(x.steps[0].uuid)[1]
+    with pytest.raises(KeyError):
+        plan.index('not-a-uuid')
+
+    # WashVessel -> Repeat -> AddReagent -> TransferLiquid
+    index = plan.index(wash.uuid)
+    repeat = wash.steps[0]
+    add = repeat.steps[0]
+    assert plan[index].index_path == (1, 0, 0, 0)
+    assert plan.starting_parents(index) == (wash, repeat, add)
+    assert plan.starting_parents(index + 1) == ()
+    # Second AddReagent in Repeat is the same object, but starts again.
+    assert plan.starting_parents(index + 3) == (add,)
+
+@pytest.mark.unit
+def test_execution_plan_async():
+    """Test async and await markers of plan entries."""
+    async_step = Async(pid='transfer', children=[
+        TransferLiquid('flask_water', 'reactor', '5 mL')])
+    plan = ExecutionPlan([async_step, Wait(time=10), Await(pid='transfer')])
+    assert [entry.is_async for entry in plan] == [True, False, False]
+    assert [entry.is_await for entry in plan] == [False, False, True]
+    assert plan[0].step is async_step
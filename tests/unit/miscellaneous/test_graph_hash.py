@@ -0,0 +1,56 @@
+import json
+import pytest
+
+from xdl import XDL
+from xdl.utils.graph import get_graph
+from xdl.utils.hashing import graph_hash
+
+from ..utils import generate_procedure, UnitTestPlatform, GRAPH
+
+@pytest.mark.unit
+def test_graph_hash():
+    """Test graph hash doesn't depend on node positions or on the order of
+    nodes and edges, but does depend on everything else.
+    """
+    graph = get_graph(GRAPH)
+    with open(GRAPH) as fd:
+        graph_json = json.load(fd)
+    graph_json['nodes'].reverse()
+    graph_json['links'].reverse()
+    for node in graph_json['nodes']:
+        node['x'] += 100
+    assert graph_hash(get_graph(graph_json)) == graph_hash(graph)
+
+    # Hash updated when graph changes, including values changed in place.
+    original_hash = graph_hash(graph)
+    graph.nodes['flask_water']['chemical'] = 'ether'
+    assert graph_hash(graph) != original_hash
+    graph.nodes['flask_water']['chemical'] = 'water'
+    assert graph_hash(graph) == original_hash
+    edge = next(iter(graph.edges))
+    port = graph.edges[edge]['port']
+    graph.edges[edge]['port'] = list(port)
+    assert graph_hash(graph) == original_hash
+    graph.edges[edge]['port'][0] = '99'
+    assert graph_hash(graph) != original_hash
+    graph.edges[edge]['port'] = port
+    assert graph_hash(graph) == original_hash
+    graph.add_edge('flask_water', 'flask_ether')
+    assert graph_hash(graph) != original_hash
+
+@pytest.mark.unit
+def test_legacy_graph_hash(tmp_path):
+    """Test xdlexe files with graph hash calculated by previous versions can
+    still be recompiled with the graph they were compiled with.
+    """
+    x = XDL(generate_procedure(n_blocks=2), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, interactive=False)
+    graph = get_graph(GRAPH)
+    assert x.graph_sha256 == graph_hash(graph)
+    assert x.executor._legacy_graph_hash(graph) != x.graph_sha256
+
+    x.graph_sha256 = x.executor._legacy_graph_hash(graph)
+    xdlexe_f = str(tmp_path / 'procedure.xdlexe')
+    x.recompile(save_path=xdlexe_f)
+    loaded = XDL(xdlexe_f, platform=UnitTestPlatform)
+    assert loaded.recompile(GRAPH) == []
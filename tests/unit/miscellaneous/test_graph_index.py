@@ -0,0 +1,85 @@
+import gc
+import weakref
+import pytest
+
+from xdl.utils.graph import (
+    get_graph,
+    get_graph_index,
+    get_reagent_vessel,
+    get_vessel_stirrer,
+    undirected_neighbors,
+    FLASK,
+    REACTOR,
+    IKA_RCT_DIGITAL,
+    RZR_2052,
+)
+
+def make_graph():
+    return get_graph({
+        'directed': True,
+        'multigraph': True,
+        'graph': {},
+        'nodes': [
+            {'id': 'flask_water', 'class': FLASK, 'chemical': 'water'},
+            {'id': 'flask_ether', 'class': FLASK, 'chemical': 'ether'},
+            {'id': 'reactor', 'class': REACTOR},
+            {'id': 'heater', 'class': IKA_RCT_DIGITAL},
+            {'id': 'stirrer', 'class': RZR_2052},
+        ],
+        'links': [
+            {'source': 'flask_water', 'target': 'reactor'},
+            {'source': 'reactor', 'target': 'flask_water'},
+            {'source': 'flask_ether', 'target': 'reactor'},
+            {'source': 'heater', 'target': 'reactor'},
+        ],
+    })
+
+@pytest.mark.unit
+def test_graph_index():
+    """Test graph lookups using index."""
+    graph = make_graph()
+    index = get_graph_index(graph)
+    assert get_graph_index(graph) is index
+    assert list(undirected_neighbors(graph, 'reactor')) == [
+        'flask_water', 'flask_ether', 'heater']
+    assert index.nodes_of_class(FLASK) == ['flask_water', 'flask_ether']
+    assert index.attached_devices('reactor') == ['heater']
+    assert get_reagent_vessel(graph, 'ether') == 'flask_ether'
+    assert get_reagent_vessel(graph, 'acetone') is None
+    assert get_vessel_stirrer(graph, 'reactor') == 'heater'
+    assert list(undirected_neighbors(graph, 'missing')) == []
+
+@pytest.mark.unit
+def test_graph_index_rebuilt_on_change():
+    """Test lookups follow changes to graph."""
+    graph = make_graph()
+    get_graph_index(graph)
+
+    graph.add_edge('stirrer', 'reactor')
+    assert get_vessel_stirrer(graph, 'reactor') == 'stirrer'
+    graph.remove_node('stirrer')
+    assert get_vessel_stirrer(graph, 'reactor') == 'heater'
+
+    graph.nodes['flask_ether']['chemical'] = 'acetone'
+    assert get_reagent_vessel(graph, 'ether') is None
+    assert get_reagent_vessel(graph, 'acetone') == 'flask_ether'
+
+    graph.add_node('flask_thf', **{'class': FLASK, 'chemical': 'thf'})
+    assert get_reagent_vessel(graph, 'thf') == 'flask_thf'
+
+    # First flask containing reagent is found after an earlier flask is
+    # changed to contain it.
+    graph.nodes['flask_water']['chemical'] = 'thf'
+    assert get_reagent_vessel(graph, 'thf') == 'flask_water'
+    assert get_graph_index(graph).nodes_of_class(FLASK) == [
+        'flask_water', 'flask_ether', 'flask_thf']
+
+@pytest.mark.unit
+def test_graph_index_doesnt_keep_graph_alive():
+    """Test indexed graphs are garbage collected once no longer used."""
+    graph = make_graph()
+    get_graph_index(graph)
+    graph_ref = weakref.ref(graph)
+    del graph
+    gc.collect()
+    assert graph_ref() is None
@@ -0,0 +1,57 @@
+import pytest
+
+from xdl import XDL
+
+from ..utils import (
+    generate_procedure, full_xdlexe_str, UnitTestPlatform, GRAPH, AddReagent)
+
+@pytest.mark.unit
+def test_parallel_compile():
+    """Test compiling with several workers gives the same result as compiling
+    steps one after the other.
+    """
+    xdl_str = generate_procedure(n_blocks=20)
+    x = XDL(xdl_str, platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, interactive=False)
+    parallel_x = XDL(xdl_str, platform=UnitTestPlatform)
+    parallel_x.prepare_for_execution(
+        GRAPH, interactive=False, compile_workers=4)
+    assert full_xdlexe_str(x) == full_xdlexe_str(parallel_x)
+
+@pytest.mark.unit
+def test_parallel_compile_errors_in_step_order(monkeypatch):
+    """Test error of first failing step is raised, and steps that aren't graph
+    read only are compiled after all steps before them.
+    """
+    on_prepare_for_execution = AddReagent.on_prepare_for_execution
+    prepared = []
+
+    def failing_on_prepare_for_execution(self, graph):
+        on_prepare_for_execution(self, graph)
+        prepared.append(self.volume)
+        if self.volume in [5, 15]:
+            raise ValueError(self.volume)
+
+    monkeypatch.setattr(
+        AddReagent, 'on_prepare_for_execution',
+        failing_on_prepare_for_execution)
+    x = XDL(generate_procedure(n_blocks=20), platform=UnitTestPlatform)
+    with pytest.raises(ValueError, match=r'^5\.0$'):
+        x.prepare_for_execution(GRAPH, interactive=False, compile_workers=4)
+
+    def recorded_on_prepare_for_execution(self, graph):
+        on_prepare_for_execution(self, graph)
+        prepared.append(self)
+
+    monkeypatch.setattr(
+        AddReagent, 'on_prepare_for_execution',
+        recorded_on_prepare_for_execution)
+    monkeypatch.setattr(AddReagent, 'GRAPH_READ_ONLY', False)
+    prepared.clear()
+    x = XDL(generate_procedure(n_blocks=20), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, interactive=False, compile_workers=4)
+    top_level_steps = [step for step in x.steps if type(step) is AddReagent]
+    assert [
+        step for step in prepared
+        if any(step is top_level_step for top_level_step in top_level_steps)
+    ] == top_level_steps
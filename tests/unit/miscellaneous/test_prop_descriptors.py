@@ -0,0 +1,55 @@
+import pytest
+
+from xdl.errors import XDLFailedPropLimitError
+from xdl.utils.xdl_base import PropDescriptor
+
+from ..utils import TransferLiquid
+
+class ShadowedTransferLiquid(TransferLiquid):
+    """Step with prop that has the same name as a class attribute."""
+
+    PROP_TYPES = dict(TransferLiquid.PROP_TYPES, note=str)
+
+    note = 'class attribute'
+
+    def __init__(self, from_vessel, to_vessel, volume, note='', **kwargs):
+        super().__init__(from_vessel, to_vessel, volume, note=note)
+
+@pytest.mark.unit
+def test_prop_descriptors():
+    """Test props are accessed through descriptors, and that values are still
+    sanitized and validated when set.
+    """
+    step = TransferLiquid('flask_water', 'reactor', '5 mL')
+    assert type(TransferLiquid.__dict__['volume']) is PropDescriptor
+    assert step.volume == 5
+    version = step._properties_version
+
+    step.volume = '2 mL'
+    assert step.properties['volume'] == 2
+    assert step._properties_version == version + 1
+    step.volume = 2
+    assert step._properties_version == version + 1
+    with pytest.raises(XDLFailedPropLimitError):
+        step.volume = 'a lot'
+
+    # Attributes that aren't props are set and got as normal.
+    step.extra = 3
+    assert step.extra == 3
+    assert 'extra' not in step.properties
+    with pytest.raises(AttributeError):
+        step.missing
+
+@pytest.mark.unit
+def test_shadowed_prop_fallback():
+    """Test props with the same name as a class attribute don't replace the
+    class attribute, but setting them still updates properties.
+    """
+    step = ShadowedTransferLiquid(
+        'flask_water', 'reactor', '5 mL', note='first')
+    assert ShadowedTransferLiquid.__dict__['note'] == 'class attribute'
+    assert step.properties['note'] == 'first'
+    step.note = '  second  '
+    assert step.properties['note'] == 'second'
+    step.volume = '1 mL'
+    assert step.properties['volume'] == 1
@@ -0,0 +1,104 @@
+from typing import List, Union
+
+import pytest
+
+from xdl.errors import (
+    XDLFailedPropLimitError,
+    XDLTypeConversionError,
+    XDLUndeclaredDefaultPropError,
+)
+from xdl.steps import AbstractBaseStep
+
+from ..utils import AddReagent, WashVessel
+
+class ConvertProps(AbstractBaseStep):
+    PROP_TYPES = {
+        'names': List[str],
+        'port': Union[str, int],
+        'stir': Union[bool, str],
+        'flag': bool,
+    }
+
+    def __init__(self, names, port, stir, flag, **kwargs):
+        super().__init__(locals())
+
+    def execute(self, platform_controller, logger=None, level=0):
+        return True
+
+class BadDefaultStep(AbstractBaseStep):
+    PROP_TYPES = {
+        'volume': float,
+    }
+
+    DEFAULT_PROPS = {
+        'mass': '1 g',
+    }
+
+    def __init__(self, volume, **kwargs):
+        super().__init__(locals())
+
+    def execute(self, platform_controller, logger=None, level=0):
+        return True
+
+class BoolStr(object):
+    def __str__(self):
+        return 'True'
+
+@pytest.mark.unit
+def test_prop_schema_compiled_once():
+    """Test prop specification is compiled once per class and shared between
+    instances without changing class attributes.
+    """
+    step1 = WashVessel('filter', 'water', '10 mL')
+    step2 = WashVessel('filter', 'ether', '5 mL', comment='Wash')
+    assert step1._get_schema() is step2._get_schema()
+    assert step1._get_schema() is not AddReagent._get_schema()
+    assert step1.PROP_TYPES is step2.PROP_TYPES
+    assert step1.PROP_TYPES['comment'] is str
+    assert 'comment' not in WashVessel.PROP_TYPES
+    assert 'comment' not in WashVessel.DEFAULT_PROPS
+    assert step1.comment == '' and step2.comment == 'Wash'
+
+@pytest.mark.unit
+def test_prop_schema_cleaning():
+    """Test values are cleaned according to prop type and prop limit."""
+    step = AddReagent('  filter ', 'water', '1  L', time='None')
+    assert step.vessel == 'filter'
+    assert step.volume == 1000
+    assert step.time is None
+    step.time = 'default'
+    assert step.time == 10
+    step.volume = 2
+    assert type(step.volume) == float
+
+    step = WashVessel('filter', 'water', 10, repeats='3')
+    assert step.repeats == 3
+
+    step = ConvertProps('a None b', '2', 'solvent', 'true')
+    assert step.names == ['a', None, 'b']
+    assert step.port == 2
+    assert step.stir == 'solvent'
+    assert step.flag is True
+    step.port = 'top'
+    step.stir = 'false'
+    assert step.port == 'top'
+    assert step.stir is False
+
+    with pytest.raises(XDLFailedPropLimitError):
+        AddReagent('filter', 'water', '10 g')
+
+    with pytest.raises(XDLFailedPropLimitError):
+        WashVessel('filter', 'water', '10 mL', repeats='two')
+
+    # Value passes prop limit as str but can't be converted.
+    with pytest.raises(XDLTypeConversionError):
+        ConvertProps('a', 1, True, BoolStr())
+
+@pytest.mark.unit
+def test_prop_types_validated_every_instance_until_valid():
+    """Test invalid prop specifications are still caught when validation is
+    only done once per class.
+    """
+    for _ in range(2):
+        with pytest.raises(XDLUndeclaredDefaultPropError):
+            BadDefaultStep('10 mL')
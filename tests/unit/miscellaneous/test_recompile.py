@@ -0,0 +1,53 @@
+import pytest
+
+from xdl import XDL
+from xdl.errors import (
+    XDLRecompileBeforeCompilationError,
+    XDLRecompileOnDifferentGraphError,
+)
+
+from ..utils import (
+    generate_procedure, full_xdlexe_str, UnitTestPlatform, GRAPH, AddReagent)
+
+def edit_procedure(x):
+    """Change properties of steps and add step to procedure."""
+    x.steps[0].reagent = 'ether'
+    x.steps[1].volume = 15
+    x.steps[2].children[0].reagent = 'ether'
+    x.steps.append(AddReagent(vessel='reactor', reagent='ether', volume=1))
+
+@pytest.mark.unit
+def test_recompile(tmp_path):
+    """Test recompiling edited procedure only recompiles edited steps, and
+    gives the same result as compiling the edited procedure from scratch.
+    """
+    xdl_str = generate_procedure(n_blocks=3)
+    x = XDL(xdl_str, platform=UnitTestPlatform)
+    with pytest.raises(XDLRecompileBeforeCompilationError):
+        x.recompile()
+    x.prepare_for_execution(GRAPH, interactive=False)
+    assert x.recompile() == []
+
+    edit_procedure(x)
+    assert x.steps[0].reagent_vessel == 'flask_water'
+    recompiled = x.recompile()
+    assert recompiled == [
+        x.steps[0], x.steps[1], x.steps[2].children[0], x.steps[-1]]
+    assert x.steps[0].reagent_vessel == 'flask_ether'
+    save_path = str(tmp_path / 'procedure.xdlexe')
+    assert x.recompile(save_path=save_path) == []
+
+    full = XDL(xdl_str, platform=UnitTestPlatform)
+    edit_procedure(full)
+    full.prepare_for_execution(GRAPH, interactive=False)
+    assert full_xdlexe_str(x) == full_xdlexe_str(full)
+    assert x.duration().most_likely == full.duration().most_likely
+    assert len(x.execution_plan) == len(full.execution_plan)
+
+    # Procedures loaded from xdlexe are compiled and need graph to recompile.
+    loaded = XDL(save_path, platform=UnitTestPlatform)
+    assert loaded.recompile(GRAPH) == []
+    loaded.steps[0].volume = 3
+    assert loaded.recompile(GRAPH) == [loaded.steps[0]]
+    with pytest.raises(XDLRecompileOnDifferentGraphError):
+        loaded.recompile({'nodes': [{'id': 'reactor'}], 'links': []})
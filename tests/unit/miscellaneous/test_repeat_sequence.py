@@ -0,0 +1,51 @@
+import pytest
+
+from xdl import XDL
+from xdl.steps import Repeat, Wait
+from xdl.steps.utils import RepeatSequence
+
+from ..utils import generate_procedure, UnitTestPlatform, GRAPH, TransferLiquid
+
+@pytest.mark.unit
+def test_repeat_sequence():
+    """Test RepeatSequence behaves like the expanded list of repeated steps.
+    """
+    children = [TransferLiquid('flask_water', 'reactor', '5 mL'),
+                Wait(time='1 min')]
+    expanded = children * 3
+    steps = RepeatSequence(children, 3)
+    assert len(steps) == 6
+    assert list(steps) == expanded
+    assert steps == expanded
+    assert steps[4] is children[0]
+    assert steps[-1] is children[1]
+    assert steps[1:5] == expanded[1:5]
+    assert steps.index(children[1]) == 1
+    with pytest.raises(IndexError):
+        steps[6]
+    assert len(RepeatSequence(children, 0)) == 0
+    assert len(RepeatSequence([], 5)) == 0
+
+@pytest.mark.unit
+def test_repeat_analysis_not_expanded(tmp_path):
+    """Test Repeat duration, reagents consumed and base steps are the child
+    results multiplied by repeats, and that writing large repeats works.
+    """
+    transfer = TransferLiquid('flask_water', 'reactor', '5 mL')
+    repeat = Repeat(repeats=10000, children=[transfer, Wait(time='1 min')])
+    assert isinstance(repeat.steps, RepeatSequence)
+    assert len(repeat.base_steps) == 20000
+
+    duration = repeat.duration(None)
+    assert duration.most_likely == pytest.approx(10000 * 65)
+    assert repeat.reagents_consumed(None) == {'flask_water': 50000}
+
+    x = XDL(generate_procedure(n_blocks=1), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, interactive=False)
+    for file_format, ext in [('xml', 'xdlexe'), ('binary', 'xdlbin')]:
+        save_path = str(tmp_path / f'procedure.{ext}')
+        x.save(save_path, file_format=file_format)
+        loaded = XDL(save_path, platform=UnitTestPlatform)
+        for step, loaded_step in zip(x.steps, loaded.steps):
+            assert [s.name for s in step.base_steps] == [
+                s.name for s in loaded_step.base_steps]
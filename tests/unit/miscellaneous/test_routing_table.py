@@ -0,0 +1,94 @@
+import pytest
+
+from xdl.utils.cache import get_cache
+from xdl.utils.graph import (
+    clear_graph_cache,
+    get_graph,
+    get_routing_table,
+    RoutingTable,
+    FLASK,
+    REACTOR,
+    VALVE,
+    PUMP,
+    RZR_2052,
+)
+
+def make_graph():
+    def link(src, dest, port='(0,0)'):
+        return {'source': src, 'target': dest, 'port': port}
+
+    return get_graph({
+        'directed': True,
+        'multigraph': True,
+        'graph': {},
+        'nodes': [
+            {'id': 'flask_water', 'class': FLASK, 'chemical': 'water', 'x': 0},
+            {'id': 'valve1', 'class': VALVE},
+            {'id': 'pump1', 'class': PUMP},
+            {'id': 'valve2', 'class': VALVE},
+            {'id': 'reactor', 'class': REACTOR},
+            {'id': 'stirrer', 'class': RZR_2052},
+        ],
+        'links': [
+            link('flask_water', 'valve1'),
+            link('valve1', 'pump1'),
+            link('pump1', 'valve1'),
+            link('valve1', 'valve2'),
+            link('valve2', 'valve1'),
+            link('valve2', 'reactor'),
+            link('reactor', 'valve2'),
+            link('stirrer', 'reactor', port='(,)'),
+        ],
+    })
+
+@pytest.mark.unit
+def test_routing_table():
+    """Test shortest paths follow fluidic edges in edge direction."""
+    routing_table = RoutingTable(make_graph())
+    assert routing_table.path('flask_water', 'reactor') == (
+        'flask_water', 'valve1', 'valve2', 'reactor')
+    assert routing_table.distance('flask_water', 'reactor') == 3
+    assert routing_table.nodes_between('flask_water', 'reactor') == (
+        'valve1', 'valve2')
+    assert routing_table.path('reactor', 'reactor') == ('reactor',)
+    assert routing_table.path('reactor', 'flask_water') is None
+    assert not routing_table.is_connected('reactor', 'flask_water')
+    assert not routing_table.is_connected('stirrer', 'reactor')
+    assert routing_table.fluidic_neighbors('valve1') == (
+        'flask_water', 'pump1', 'valve2')
+    assert routing_table.fluidic_neighbors('reactor') == ('valve2',)
+
+    loaded = RoutingTable.from_bytes(routing_table.to_bytes())
+    assert loaded.graph_hash == routing_table.graph_hash
+    assert loaded.path('flask_water', 'reactor') == routing_table.path(
+        'flask_water', 'reactor')
+    assert loaded.fluidic_neighbors('valve1') == (
+        routing_table.fluidic_neighbors('valve1'))
+
+@pytest.mark.unit
+def test_get_routing_table(tmp_path, monkeypatch):
+    """Test routing tables are shared by graphs with the same graph hash, and
+    are loaded from disk cache if caches are enabled.
+    """
+    monkeypatch.setenv('XDL_CACHE', '1')
+    monkeypatch.setenv('XDL_CACHE_DIR', str(tmp_path / 'cache'))
+    graph = make_graph()
+    routing_table = get_routing_table(graph)
+    moved_graph = make_graph()
+    moved_graph.nodes['flask_water']['x'] = 100
+    assert get_routing_table(moved_graph) is routing_table
+    assert get_cache('routing').stats()['entries'] == 1
+
+    graph.remove_edge('valve1', 'valve2')
+    changed = get_routing_table(graph)
+    assert changed is not routing_table
+    assert changed.path('flask_water', 'reactor') is None
+
+    def fail(*args, **kwargs):
+        raise AssertionError('Routing table computed instead of loaded.')
+    clear_graph_cache()
+    monkeypatch.setattr(RoutingTable, '_build', fail)
+    loaded = get_routing_table(moved_graph)
+    assert loaded is not routing_table
+    assert loaded.path('flask_water', 'reactor') == routing_table.path(
+        'flask_water', 'reactor')
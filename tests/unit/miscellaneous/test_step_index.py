@@ -0,0 +1,81 @@
+import pytest
+
+from xdl import XDL
+from xdl.steps import Repeat
+from xdl.steps.step_index import StepIndex
+
+from ..utils import generate_procedure, UnitTestPlatform, GRAPH, AddReagent
+
+@pytest.mark.unit
+def test_step_index():
+    """Test steps are found by UUID at every level of step tree, and that
+    index follows edits to procedure.
+    """
+    x = XDL(generate_procedure(n_blocks=2), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, interactive=False)
+    index = x.step_index
+
+    for i, step in enumerate(x.steps):
+        assert x.get_step(step.uuid) is step
+        assert index.path(step.uuid) == ((None, i),)
+        assert index.parents(step.uuid) == ()
+        for j, substep in enumerate(step.steps):
+            assert x.get_step(substep.uuid) is substep
+            assert index.parents(substep.uuid)[-1] is step
+
+    repeat = next(step for step in x.steps if type(step) is Repeat)
+    child = repeat.children[0]
+    assert x.get_step(child.uuid) is child
+    assert index.parents(child.uuid) == (repeat,)
+    assert index.path(child.uuid)[-1] == ('children', 0)
+
+    with pytest.raises(KeyError):
+        x.get_step('not-a-uuid')
+    assert 'not-a-uuid' not in index
+
+    # Substeps regenerated after edit are found.
+    step = x.steps[0]
+    old_substep = step.steps[0]
+    step.volume = 5
+    assert step.steps[0] is not old_substep
+    assert x.get_step(step.steps[0].uuid) is step.steps[0]
+
+    # Steps added to procedure are found.
+    new_step = AddReagent(vessel='reactor', reagent='ether', volume=1)
+    x.steps.append(new_step)
+    assert x.get_step(new_step.uuid) is new_step
+    assert x.step_index is index
+
+@pytest.mark.unit
+def test_step_index_misses(monkeypatch):
+    """Test looking up UUIDs not in step tree only indexes step tree again
+    if it has changed since it was last indexed.
+    """
+    x = XDL(generate_procedure(n_blocks=2), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, interactive=False)
+    index = x.step_index
+
+    builds = []
+    build = StepIndex._build
+
+    def counted_build(self):
+        builds.append(self)
+        build(self)
+
+    monkeypatch.setattr(StepIndex, '_build', counted_build)
+    for _ in range(3):
+        assert 'not-a-uuid' not in index
+        assert x._top_level_step_index(x.steps[1]) == 1
+    assert builds == []
+
+    # Step changed, so step tree indexed again once.
+    x.steps[0].volume = 5
+    assert 'not-a-uuid' not in index
+    assert 'not-a-uuid' not in index
+    assert len(builds) == 1
+
+    # Top level step added, so step tree indexed again once.
+    x.steps.append(AddReagent(vessel='reactor', reagent='ether', volume=1))
+    assert 'not-a-uuid' not in index
+    assert 'not-a-uuid' not in index
+    assert len(builds) == 2
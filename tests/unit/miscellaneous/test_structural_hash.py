@@ -0,0 +1,115 @@
+import pytest
+
+from xdl import XDL
+from xdl.hardware import Hardware
+from xdl.steps import Repeat, Wait
+from xdl.utils.hashing import structural_hash
+from xdl.utils.misc import steps_are_equal
+from ..utils import UnitTestPlatform, AddReagent, generate_procedure
+
+@pytest.mark.unit
+def test_structural_hash_stable():
+    """Test structural hash is the same for same procedure loaded twice, even
+    though UUIDs differ.
+    """
+    x = XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform)
+    y = XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform)
+    assert x.steps[0].uuid != y.steps[0].uuid
+    assert x.structural_hash == y.structural_hash
+    assert x == y
+
+    z = XDL(generate_procedure(n_blocks=2), platform=UnitTestPlatform)
+    assert x.structural_hash != z.structural_hash
+    assert x != z
+
+@pytest.mark.unit
+def test_structural_hash_invalidation():
+    """Test cached structural hash is invalidated when properties of step, or
+    of its children, change.
+    """
+    step = AddReagent(vessel='reactor', reagent='water', volume='5 mL')
+    original_hash = step.structural_hash
+
+    step.volume = 10
+    assert step.structural_hash != original_hash
+    step.volume = '5 mL'
+    assert step.structural_hash == original_hash
+
+    step.properties['reagent'] = 'ether'
+    step.update()
+    assert step.structural_hash != original_hash
+
+    repeat = Repeat(repeats=2, children=[
+        AddReagent(vessel='reactor', reagent='water', volume='5 mL'),
+        Wait(time='1 min'),
+    ])
+    original_hash = repeat.structural_hash
+    repeat.children[1].time = 120
+    assert repeat.structural_hash != original_hash
+    repeat.children.pop()
+    assert repeat.structural_hash != original_hash
+
+    x = XDL(generate_procedure(n_blocks=1), platform=UnitTestPlatform)
+    y = XDL(generate_procedure(n_blocks=1), platform=UnitTestPlatform)
+    original_hash = x.structural_hash
+    x.steps[0].volume = 100
+    assert x.structural_hash != original_hash
+    assert x != y
+    x.steps[0].volume = y.steps[0].volume
+    assert x.structural_hash == original_hash
+    x.steps.append(Wait(time=60))
+    assert x.structural_hash != original_hash
+
+@pytest.mark.unit
+def test_structural_hash_equal_values():
+    """Test values that compare equal give the same structural hash."""
+    step = Wait(time=60, comment='')
+    other_step = Wait(time=60.0, comment=None)
+    assert step.structural_hash == other_step.structural_hash
+    assert steps_are_equal(step, other_step)
+
+    other_step.comment = 'Wait for reaction'
+    assert not steps_are_equal(step, other_step)
+
+@pytest.mark.unit
+def test_structural_hash_not_recalculated(monkeypatch):
+    """Test cached structural hashes are returned without hashing children,
+    and that editing a step only recalculates hashes of it and the steps
+    containing it.
+    """
+    repeat = Repeat(repeats=2, children=[
+        Wait(time='1 min'),
+        Repeat(repeats=3, children=[Wait(time='2 mins'), Wait(time='3 mins')]),
+    ])
+    x = XDL(
+        steps=[repeat, Wait(time='4 mins')],
+        reagents=[],
+        hardware=Hardware([]),
+        platform=UnitTestPlatform,
+    )
+    original_hash = x.structural_hash
+
+    calls = []
+    hash_function = structural_hash
+
+    def counted_structural_hash(name, *args, **kwargs):
+        calls.append(name)
+        return hash_function(name, *args, **kwargs)
+
+    monkeypatch.setattr(
+        'xdl.steps.core.step.structural_hash', counted_structural_hash)
+    monkeypatch.setattr('xdl.xdl.structural_hash', counted_structural_hash)
+
+    assert x.structural_hash == original_hash
+    assert calls == []
+
+    repeat.children[1].children[0].time = 60
+    assert x.structural_hash != original_hash
+    assert calls == ['Wait', 'Repeat', 'Repeat', 'XDL']
+
+    # Clones are invalidated by their own children.
+    clone = repeat.clone()
+    clone_hash = clone.structural_hash
+    clone.children[0].time = 30
+    assert clone.structural_hash != clone_hash
+    assert repeat.structural_hash == clone_hash
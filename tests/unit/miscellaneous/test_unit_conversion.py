@@ -0,0 +1,37 @@
+import pytest
+
+from xdl.utils.sanitisation import (
+    convert_val_to_std_units,
+    convert_vals_to_std_units,
+    _convert_str_to_std_units,
+)
+
+@pytest.mark.unit
+def test_convert_val_to_std_units():
+    """Test values are converted to standard units, and repeated strings are
+    looked up in memo.
+    """
+    assert convert_val_to_std_units('1 L') == 1000
+    assert convert_val_to_std_units('2 hrs') == 7200
+    assert convert_val_to_std_units('-20 °C') == -20
+    assert convert_val_to_std_units('5') == 5
+    assert convert_val_to_std_units('solvent') == 'solvent'
+    assert convert_val_to_std_units(5) == 5
+
+    hits = _convert_str_to_std_units.cache_info().hits
+    assert convert_val_to_std_units('1 L') == 1000
+    assert _convert_str_to_std_units.cache_info().hits == hits + 1
+
+    # Unknown units aren't remembered and raise every time.
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            convert_val_to_std_units('1 mol')
+
+@pytest.mark.unit
+def test_convert_vals_to_std_units():
+    """Test converting many values in one call."""
+    vals = ['10 mL', 5, None, '0.5 L', '10 mL', '30 mins']
+    assert convert_vals_to_std_units(vals) == [10, 5, None, 500, 10, 1800]
+    assert convert_vals_to_std_units(iter(vals)) == [
+        convert_val_to_std_units(val) for val in vals]
+    assert convert_vals_to_std_units([]) == []
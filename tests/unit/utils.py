@@ -0,0 +1,211 @@
+"""Minimal platform only depending on xdl, so that loading, compiling, saving
+and executing procedures can be tested without a full platform package
+installed.
+"""
+import os
+
+from xdl.constants import VESSEL_PROP_TYPE, REAGENT_PROP_TYPE
+from xdl.execution.abstract_executor import AbstractXDLExecutor
+from xdl import XDL
+from xdl.platforms.abstract_platform import AbstractPlatform
+from xdl.readwrite.xml_generator import xdl_to_xml_string
+from xdl.steps import (
+    AbstractStep, AbstractBaseStep, Repeat, Wait, Async, Await)
+from xdl.steps.utils import FTNDuration
+from xdl.utils.graph import get_graph, get_reagent_vessel
+from xdl.utils.misc import SanityCheck
+from xdl.utils.prop_limits import VOLUME_PROP_LIMIT, TIME_PROP_LIMIT
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+FOLDER = os.path.join(HERE, 'files')
+
+#: Graph that procedures generated by :py:func:`generate_procedure` can be
+#: compiled against.
+GRAPH = os.path.join(FOLDER, 'lidocaine_graph.json')
+
+class TransferLiquid(AbstractBaseStep):
+    PROP_TYPES = {
+        'from_vessel': str,
+        'to_vessel': str,
+        'volume': float,
+    }
+
+    PROP_LIMITS = {
+        'volume': VOLUME_PROP_LIMIT,
+    }
+
+    def __init__(self, from_vessel, to_vessel, volume, **kwargs):
+        super().__init__(locals())
+
+    def execute(self, platform_controller, logger=None, level=0):
+        platform_controller.log.append(
+            ('transfer', self.from_vessel, self.to_vessel, self.volume))
+        return True
+
+    def reagents_consumed(self, graph):
+        return {self.from_vessel: self.volume}
+
+    def duration(self, graph):
+        return FTNDuration(self.volume, self.volume, self.volume)
+
+class AddReagent(AbstractStep):
+    GRAPH_READ_ONLY = True
+
+    PROP_TYPES = {
+        'vessel': VESSEL_PROP_TYPE,
+        'reagent': REAGENT_PROP_TYPE,
+        'volume': float,
+        'time': float,
+        'reagent_vessel': str,
+    }
+
+    DEFAULT_PROPS = {
+        'time': '10 s',
+        'reagent_vessel': None,
+    }
+
+    INTERNAL_PROPS = [
+        'reagent_vessel',
+    ]
+
+    PROP_LIMITS = {
+        'volume': VOLUME_PROP_LIMIT,
+        'time': TIME_PROP_LIMIT,
+    }
+
+    def __init__(
+        self,
+        vessel,
+        reagent,
+        volume,
+        time='default',
+        reagent_vessel='default',
+        **kwargs
+    ):
+        super().__init__(locals())
+
+    def on_prepare_for_execution(self, graph):
+        self.reagent_vessel = get_reagent_vessel(graph, self.reagent)
+        if self.reagent_vessel is None:
+            self.reagent_vessel = f'flask_{self.reagent}'
+
+    def sanity_checks(self, graph):
+        return [
+            SanityCheck(self.reagent_vessel is not None),
+        ]
+
+    def get_steps(self):
+        return [
+            TransferLiquid(self.reagent_vessel, self.vessel, self.volume),
+            Wait(self.time),
+        ]
+
+class WashVessel(AbstractStep):
+    GRAPH_READ_ONLY = True
+
+    PROP_TYPES = {
+        'vessel': VESSEL_PROP_TYPE,
+        'solvent': REAGENT_PROP_TYPE,
+        'volume': float,
+        'repeats': int,
+    }
+
+    DEFAULT_PROPS = {
+        'repeats': 2,
+    }
+
+    PROP_LIMITS = {
+        'volume': VOLUME_PROP_LIMIT,
+    }
+
+    def __init__(self, vessel, solvent, volume, repeats='default', **kwargs):
+        super().__init__(locals())
+
+    def get_steps(self):
+        return [
+            Repeat(repeats=self.repeats, children=[
+                AddReagent(
+                    vessel=self.vessel, reagent=self.solvent,
+                    volume=self.volume),
+                TransferLiquid(self.vessel, 'waste', self.volume),
+            ])
+        ]
+
+class UnitTestController:
+    """Fake platform controller recording everything executed."""
+    simulation = True
+
+    def __init__(self):
+        self.log = []
+
+class UnitTestExecutor(AbstractXDLExecutor):
+    def prepare_for_execution(self, graph_file, **kwargs):
+        self._graph = get_graph(graph_file)
+        self.add_internal_properties()
+        self.perform_sanity_checks()
+        self._prepared_for_execution = True
+
+class UnitTestPlatform(AbstractPlatform):
+    @property
+    def step_library(self):
+        return {
+            'AddReagent': AddReagent,
+            'WashVessel': WashVessel,
+            'TransferLiquid': TransferLiquid,
+            'Wait': Wait,
+            'Repeat': Repeat,
+            'Async': Async,
+            'Await': Await,
+        }
+
+    @property
+    def executor(self):
+        return UnitTestExecutor
+
+    def graph(self, *args, **kwargs):
+        return None
+
+def generate_procedure(n_blocks: int = 10, repeats: int = 3) -> str:
+    """Generate XDL string of procedure for :py:class:`UnitTestPlatform`.
+
+    Args:
+        n_blocks (int): Number of blocks of three top level steps to include
+            in procedure.
+        repeats (int): Repeat count to use for wash and repeat steps.
+
+    Returns:
+        str: XDL XML string of procedure.
+    """
+    steps = []
+    for i in range(n_blocks):
+        steps.append(
+            f'<AddReagent vessel="reactor" reagent="water" volume="{i + 1} mL"'
+            f' time="{i} s" />')
+        steps.append(
+            f'<WashVessel vessel="reactor" solvent="ether"'
+            f' volume="{i + 2} mL" repeats="{repeats}" />')
+        steps.append(
+            f'<Repeat repeats="{repeats}">'
+            f'<AddReagent vessel="reactor" reagent="water" volume="1.5 mL" />'
+            f'<Wait time="1 min" />'
+            f'</Repeat>')
+    return (
+        '<Synthesis>'
+        '<Hardware><Component id="reactor" type="reactor" /></Hardware>'
+        '<Reagents><Reagent name="water" /><Reagent name="ether" /></Reagents>'
+        '<Procedure>' + ''.join(steps) + '</Procedure>'
+        '</Synthesis>'
+    )
+
+def full_xdlexe_str(x: XDL) -> str:
+    """Return xdlexe string of procedure with every property of every step in
+    the step tree, for comparing compiled procedures.
+
+    Args:
+        x (XDL): Procedure to get xdlexe string of.
+
+    Returns:
+        str: Full xdlexe XML string of procedure.
+    """
+    return xdl_to_xml_string(
+        x, graph_hash=x.graph_sha256, full_properties=True, full_tree=True)
@@ -0,0 +1,55 @@
+import os
+import pytest
+
+from xdl import XDL
+from ..utils import (
+    UnitTestPlatform,
+    UnitTestController,
+    generate_procedure,
+    full_xdlexe_str,
+    GRAPH,
+)
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+FOLDER = os.path.join(HERE, '..', 'files')
+
+@pytest.fixture
+def xdlexe_file():
+    xdlexe_f = os.path.join(FOLDER, 'lazy.xdlexe')
+    x = XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, save_path=xdlexe_f)
+    yield xdlexe_f
+    os.remove(xdlexe_f)
+
+@pytest.mark.unit
+def test_lazy_xdlexe(xdlexe_file):
+    """Test lazily loaded xdlexe gives same step tree and execution as eagerly
+    loaded xdlexe.
+    """
+    eager = XDL(xdlexe_file, platform=UnitTestPlatform)
+    lazy = XDL(xdlexe_file, platform=UnitTestPlatform, lazy=True)
+
+    # Step record of substeps not applied until substeps needed
+    assert lazy.steps[0]._deferred_substeps_update is not None
+    assert full_xdlexe_str(lazy) == full_xdlexe_str(eager)
+    assert lazy.steps[0]._deferred_substeps_update is None
+
+    eager_controller = UnitTestController()
+    lazy_controller = UnitTestController()
+    eager.execute(eager_controller)
+    XDL(xdlexe_file, platform=UnitTestPlatform, lazy=True).execute(
+        lazy_controller)
+    assert lazy_controller.log == eager_controller.log
+    assert ('transfer', 'flask_ether', 'reactor', 2) in lazy_controller.log
+
+@pytest.mark.unit
+def test_lazy_xdlexe_edit(xdlexe_file):
+    """Test editing lazily loaded step before substeps are accessed gives same
+    result as editing eagerly loaded step.
+    """
+    eager = XDL(xdlexe_file, platform=UnitTestPlatform)
+    lazy = XDL(xdlexe_file, platform=UnitTestPlatform, lazy=True)
+    for x in [eager, lazy]:
+        x.steps[0].volume = 7
+        x.steps[1].volume = 8
+    assert full_xdlexe_str(lazy) == full_xdlexe_str(eager)
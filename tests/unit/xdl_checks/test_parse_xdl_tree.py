@@ -0,0 +1,77 @@
+import os
+import pytest
+from lxml import etree
+
+from xdl import XDL
+from xdl.readwrite import parse_xdl_tree, xdl_str_to_objs, xdl_file_to_objs
+from xdl.utils.misc import steps_are_equal
+from ..utils import UnitTestPlatform, generate_procedure, GRAPH
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+FOLDER = os.path.join(HERE, '..', 'files')
+
+@pytest.mark.unit
+def test_parse_xdl_tree():
+    """Test parsing already parsed lxml tree gives same result as parsing
+    XDL string.
+    """
+    xdl_str = generate_procedure(n_blocks=3)
+    from_str = xdl_str_to_objs(xdl_str, UnitTestPlatform())
+    from_tree = parse_xdl_tree(
+        etree.ElementTree(etree.fromstring(xdl_str)), UnitTestPlatform())
+
+    assert from_str['procedure_attrs'] == from_tree['procedure_attrs'] == {}
+    assert len(from_str['steps']['no_section']) == 9
+    for i, step in enumerate(from_str['steps']['no_section']):
+        assert steps_are_equal(step, from_tree['steps']['no_section'][i])
+    assert ([reagent.name for reagent in from_str['reagents']]
+            == [reagent.name for reagent in from_tree['reagents']])
+    assert ([component.id for component in from_str['hardware']]
+            == [component.id for component in from_tree['hardware']])
+
+@pytest.mark.unit
+def test_parse_xdl_tree_xdlexe():
+    """Test graph hash is read from parsed tree of xdlexe file and step record
+    is applied.
+    """
+    xdlexe_f = os.path.join(FOLDER, 'parse_xdl_tree.xdlexe')
+    x = XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, save_path=xdlexe_f)
+
+    parsed_xdl = parse_xdl_tree(etree.parse(xdlexe_f), UnitTestPlatform())
+    assert parsed_xdl['procedure_attrs']['graph_sha256'] == x.graph_sha256
+    for i, step in enumerate(parsed_xdl['steps']['no_section']):
+        assert steps_are_equal(step, x.steps[i])
+
+    y = XDL(xdlexe_f, platform=UnitTestPlatform)
+    assert y.graph_sha256 == x.graph_sha256
+    assert y.compiled
+    os.remove(xdlexe_f)
+
+@pytest.mark.unit
+def test_xdl_file_to_objs():
+    """Test incrementally parsing file gives same result as parsing string,
+    including procedure sections and files not encoded as UTF-8.
+    """
+    xdl_str = generate_procedure(n_blocks=2).replace(
+        '<Procedure>', '<Procedure><Prep>').replace(
+        '</Procedure>',
+        '</Prep><Reaction><Wait time="5 min" comment="25 °C" /></Reaction>'
+        '</Procedure>')
+    xdl_f = os.path.join(FOLDER, 'xdl_file_to_objs.xdl')
+    with open(xdl_f, 'w', encoding='iso-8859-1') as fd:
+        fd.write(xdl_str)
+
+    from_str = xdl_str_to_objs(xdl_str, UnitTestPlatform())
+    from_file = xdl_file_to_objs(xdl_f, UnitTestPlatform())
+    os.remove(xdl_f)
+
+    for section in from_str['steps']:
+        assert (len(from_str['steps'][section])
+                == len(from_file['steps'][section]))
+        for i, step in enumerate(from_str['steps'][section]):
+            assert steps_are_equal(step, from_file['steps'][section][i])
+    assert len(from_file['steps']['prep']) == 6
+    assert from_file['steps']['reaction'][0].comment == '25 °C'
+    assert len(from_file['reagents']) == 2
+    assert len(from_file['hardware'].components) == 1
@@ -3,7 +3,11 @@ import pytest
 from xdl.steps.templates import AbstractAddStep
 from xdl.constants import VESSEL_PROP_TYPE, REAGENT_PROP_TYPE
 from xdl.utils.prop_limits import (
-    VOLUME_PROP_LIMIT, ROTATION_SPEED_PROP_LIMIT, TIME_PROP_LIMIT)
+    VOLUME_PROP_LIMIT,
+    ROTATION_SPEED_PROP_LIMIT,
+    TIME_PROP_LIMIT,
+    ADD_PURPOSE_PROP_LIMIT,
+)
 from xdl.errors import (
     XDLStepTemplateNameError,
     XDLStepTemplateMissingPropError,
@@ -386,3 +390,78 @@ def test_step_template_incorrect_name():
 
     with pytest.raises(XDLStepTemplateNameError):
         Madd(**add_params)
+
+@pytest.mark.unit
+def test_step_template_validated_once(monkeypatch):
+    """Test template is only validated on first instantiation of valid step
+    class, and on every instantiation of invalid step class.
+    """
+    validate = AbstractAddStep.validate
+    validated = []
+
+    def counted_validate(self):
+        validated.append(type(self).__name__)
+        validate(self)
+
+    monkeypatch.setattr(AbstractAddStep, 'validate', counted_validate)
+
+    class Add(AbstractAddStep):
+        PROP_TYPES = {
+            'vessel': VESSEL_PROP_TYPE,
+            'reagent': REAGENT_PROP_TYPE,
+            'volume': float,
+            'time': float,
+            'stir': bool,
+            'stir_speed': float,
+            'viscous': bool,
+            'dropwise': bool,
+            'purpose': str,
+            'speed': float,
+        }
+
+        DEFAULT_PROPS = {
+            'stir': False,
+            'viscous': False,
+            'time': None,
+            'stir_speed': None,
+            'dropwise': False,
+            'purpose': None,
+            'speed': 40,
+        }
+
+        PROP_LIMITS = {
+            'volume': VOLUME_PROP_LIMIT,
+            'time': TIME_PROP_LIMIT,
+            'stir_speed': ROTATION_SPEED_PROP_LIMIT,
+            'purpose': ADD_PURPOSE_PROP_LIMIT,
+        }
+
+        def __init__(
+            self,
+            vessel,
+            reagent,
+            volume,
+            time='default',
+            stir='default',
+            stir_speed='default',
+            viscous='default',
+            dropwise='default',
+            purpose='default',
+            **kwargs
+        ):
+            super().__init__(locals())
+
+        def get_steps(self):
+            return []
+
+    for _ in range(3):
+        Add(**add_params)
+    assert validated == ['Add']
+
+    class Madd(Add):
+        pass
+
+    for _ in range(2):
+        with pytest.raises(XDLStepTemplateNameError):
+            Madd(**add_params)
+    assert validated == ['Add', 'Madd', 'Madd']
@@ -0,0 +1,89 @@
+import pytest
+
+from xdl import XDL
+from xdl.errors import XDLInvalidSaveFormatError
+from xdl.readwrite.binary import (
+    xdl_to_binary, xdl_from_binary, XDLBIN_MAGIC)
+from xdl.readwrite.errors import XDLInvalidBinaryError
+from ..utils import (
+    UnitTestPlatform,
+    UnitTestController,
+    generate_procedure,
+    full_xdlexe_str,
+    GRAPH,
+)
+
+@pytest.mark.unit
+def test_xdlbin_round_trip(tmp_path):
+    """Test compiled procedure saved as xdlbin loads with identical step tree
+    to the same procedure saved as xdlexe, and executes identically.
+    """
+    xdlexe_f = str(tmp_path / 'xdlbin_round_trip.xdlexe')
+    xdlbin_f = str(tmp_path / 'xdlbin_round_trip.xdlbin')
+    x = XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform)
+    x.prepare_for_execution(GRAPH, save_path=xdlexe_f)
+    x.save(xdlbin_f, file_format='binary')
+
+    from_xdlexe = XDL(xdlexe_f, platform=UnitTestPlatform)
+    for lazy in [False, True]:
+        from_xdlbin = XDL(xdlbin_f, platform=UnitTestPlatform, lazy=lazy)
+        assert from_xdlbin.compiled
+        assert from_xdlbin.graph_sha256 == from_xdlexe.graph_sha256
+        assert full_xdlexe_str(from_xdlbin) == full_xdlexe_str(from_xdlexe)
+
+        xdlexe_controller = UnitTestController()
+        xdlbin_controller = UnitTestController()
+        from_xdlexe.execute(xdlexe_controller)
+        from_xdlbin.execute(xdlbin_controller)
+        assert xdlbin_controller.log == xdlexe_controller.log
+
+@pytest.mark.unit
+def test_xdlbin_prepare_for_execution(tmp_path):
+    """Test compiling with .xdlbin save path saves binary format and
+    uncompiled procedure saved as binary can be compiled after loading,
+    without overwriting the file it was loaded from.
+    """
+    xdlbin_f = str(tmp_path / 'xdlbin_prepare.xdlbin')
+    compiled_f = str(tmp_path / 'xdlbin_prepare.compiled.xdlbin')
+    x = XDL(generate_procedure(n_blocks=2), platform=UnitTestPlatform)
+    x.save(xdlbin_f, file_format='binary')
+    with open(xdlbin_f, 'rb') as fd:
+        uncompiled_data = fd.read()
+
+    y = XDL(xdlbin_f, platform=UnitTestPlatform)
+    assert not y.compiled
+    assert y.as_string() == x.as_string()
+    y.prepare_for_execution(GRAPH)
+    with open(xdlbin_f, 'rb') as fd:
+        assert fd.read() == uncompiled_data
+    with open(compiled_f, 'rb') as fd:
+        assert fd.read().startswith(XDLBIN_MAGIC)
+
+    z = XDL(compiled_f, platform=UnitTestPlatform)
+    assert z.compiled
+    assert full_xdlexe_str(z) == full_xdlexe_str(y)
+
+@pytest.mark.unit
+def test_xdlbin_errors(tmp_path):
+    x = XDL(generate_procedure(n_blocks=1), platform=UnitTestPlatform)
+    data = xdl_to_binary(x)
+
+    # Step names are interned, so only written once.
+    steps_data = xdl_to_binary(
+        XDL(generate_procedure(n_blocks=3), platform=UnitTestPlatform))
+    assert steps_data.count(b'AddReagent') == 1
+
+    with pytest.raises(XDLInvalidBinaryError):
+        xdl_from_binary(b'<Synthesis>' + data, UnitTestPlatform())
+
+    # Unsupported format version
+    with pytest.raises(XDLInvalidBinaryError):
+        xdl_from_binary(
+            data[:6] + b'\xff\xff' + data[8:], UnitTestPlatform())
+
+    # Truncated
+    with pytest.raises(XDLInvalidBinaryError):
+        xdl_from_binary(data[:len(data) // 2], UnitTestPlatform())
+
+    with pytest.raises(XDLInvalidSaveFormatError):
+        x.save(str(tmp_path / 'test.xdlbin'), file_format='bin')
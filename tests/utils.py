@@ -3,6 +3,7 @@ import sys
 import shutil
 from xdl import XDL
 from xdl.steps import Step, AbstractBaseStep, UnimplementedStep
+from xdl.steps.utils import RepeatSequence
 from chempiler import Chempiler
 import ChemputerAPI
 import commanduinolabware
@@ -54,11 +55,15 @@ def remove_confirm_steps(step: Step) -> None:
     if isinstance(step, AbstractBaseStep):
         return step
     else:
-        for i in reversed(range(len(step.steps))):
-            if step.steps[i].name == 'Confirm':
-                step.steps.pop(i)
+        # Repeated steps can't be edited, edit children that are repeated.
+        steps = step.steps
+        if isinstance(steps, RepeatSequence):
+            steps = step.children
+        for i in reversed(range(len(steps))):
+            if steps[i].name == 'Confirm':
+                steps.pop(i)
             else:
-                step.steps[i] = remove_confirm_steps(step.steps[i])
+                steps[i] = remove_confirm_steps(steps[i])
         return step
 
 def test_step(step, correct_step_info):
@@ -0,0 +1,63 @@
+"""Command line interface, installed as the ``xdl`` command.
+
+Usage::
+
+    xdl cache stats
+    xdl cache clear [name]
+"""
+import argparse
+import sys
+from typing import List
+
+from .utils.cache import get_all_caches, get_cache, get_cache_dir
+
+def format_size(size: int) -> str:
+    """Return size in bytes as str in MB, e.g. ``'1.5 MB'``."""
+    return f'{size / 1e6:.1f} MB'
+
+def cache_stats(args: argparse.Namespace) -> None:
+    """Print stats of all caches."""
+    print(f'Cache directory: {get_cache_dir()}')
+    caches = get_all_caches()
+    if not caches:
+        print('No caches.')
+    for cache in caches:
+        stats = cache.stats()
+        print(
+            f'{stats["name"]}: {stats["entries"]} entries,'
+            f' {format_size(stats["size"])} / {format_size(stats["max_size"])}'
+        )
+
+def cache_clear(args: argparse.Namespace) -> None:
+    """Remove all entries from all caches, or from given cache."""
+    caches = [get_cache(args.name)] if args.name else get_all_caches()
+    for cache in caches:
+        cache.clear()
+        print(f'Cleared {cache.name} cache.')
+
+def main(argv: List[str] = None) -> None:
+    """Entry point of ``xdl`` command.
+
+    Args:
+        argv (List[str]): Command line arguments. If ``None``, ``sys.argv``
+            is used.
+    """
+    parser = argparse.ArgumentParser(prog='xdl')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    cache_parser = subparsers.add_parser('cache', help='Manage XDL caches.')
+    cache_subparsers = cache_parser.add_subparsers(dest='cache_command')
+    cache_subparsers.required = True
+
+    stats_parser = cache_subparsers.add_parser(
+        'stats', help=cache_stats.__doc__)
+    stats_parser.set_defaults(func=cache_stats)
+
+    clear_parser = cache_subparsers.add_parser(
+        'clear', help=cache_clear.__doc__)
+    clear_parser.add_argument('name', nargs='?')
+    clear_parser.set_defaults(func=cache_clear)
+
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+    args.func(args)
@@ -40,7 +40,7 @@ class XDLInvalidFileTypeError(XDLError):
 
     def __str__(self):
         return f'{self.file_ext} is an invalid XDL file type. Valid file\
- file types: .xdl, .xdlexe, .json'
+ file types: .xdl, .xdlexe, .xdlbin, .json'
 
 class XDLInvalidSaveFormatError(XDLError):
     """Tried to save XDL with invalid file format."""
@@ -50,7 +50,7 @@ class XDLInvalidSaveFormatError(XDLError):
 
     def  __str__(self):
         return f'"{self.file_format}" is an invalid file format for saving\
- XDL. Valid file formats: "xml", "json".'
+ XDL. Valid file formats: "xml", "json", "binary".'
 
 class XDLVesselNotDeclaredError(XDLError):
     """Vessel used in procedure but not declared in Hardware section."""
@@ -106,6 +106,17 @@ class XDLInvalidArgsError(XDLError):
 # Graph #
 #########
 
+class XDLGraphMissingDependencyError(XDLGraphError):
+    """Optional dependency needed by graph feature is not installed."""
+
+    def __init__(self, dependency, feature):
+        self.dependency = dependency
+        self.feature = feature
+
+    def __str__(self):
+        return f'{self.dependency} must be installed to use {self.feature}.\
+ Install it with `pip install {self.dependency}`.'
+
 class XDLGraphInvalidFileTypeError(XDLGraphError):
     """Invalid file type given for loading graph."""
 
@@ -146,6 +157,28 @@ class XDLDoubleCompilationError(XDLCompilationError):
     def __str__(self):
         return 'Cannot compile same XDL object twice.'
 
+class XDLRecompileBeforeCompilationError(XDLCompilationError):
+    """User tries to recompile XDL before compiling it."""
+
+    def __str__(self):
+        return 'Trying to recompile procedure that has not been compiled. First\
+ call xdl_obj.prepare_for_execution(graph).'
+
+class XDLRecompileWithoutGraphError(XDLCompilationError):
+    """User tries to recompile XDL loaded from xdlexe without giving graph."""
+
+    def __str__(self):
+        return 'Graph must be given to recompile procedure loaded from xdlexe.'
+
+class XDLRecompileOnDifferentGraphError(XDLCompilationError):
+    """User tries to recompile XDL using different graph than the one used to
+    compile it.
+    """
+
+    def __str__(self):
+        return 'Trying to recompile XDL on different graph than the one it was\
+ compiled with. Compile procedure from scratch instead.'
+
 #############
 # Execution #
 #############
@@ -1,4 +1,5 @@
-from typing import Any, Union, List
+from typing import Any, Union, List, Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 import hashlib
 import logging
 import copy
@@ -14,12 +15,14 @@ from ..steps.base_steps import (
 from ..steps.logging import (
     start_executing_step_msg, finished_executing_step_msg)
 from ..steps import NON_RECURSIVE_ABSTRACT_STEPS
+from ..steps.utils import RepeatSequence
 from ..errors import (
     XDLExecutionOnDifferentGraphError,
     XDLExecutionBeforeCompilationError
 )
 from ..utils.logging import get_logger, log_duration
 from ..utils.graph import get_graph
+from ..utils.hashing import graph_hash
 if False:
     from ..xdl import XDL
 
@@ -40,11 +43,20 @@ class AbstractXDLExecutor(ABC):
             ``self._xdl`` will be altered to execute on this graph during
             :py:meth`prepare_for_execution`.
         logger (logging.Logger): Logger object for executor to use when logging.
+        compile_workers (int): Number of threads to use to compile top level
+            steps in parallel in :py:meth:`add_internal_properties` and
+            :py:meth:`perform_sanity_checks`. If ``None`` or ``1``, steps are
+            compiled one after the other. Consecutive steps that are graph read
+            only (see ``Step.GRAPH_READ_ONLY``) have internal properties added
+            at the same time, other steps are compiled on their own after all
+            steps before them. Sanity checks are always read only. Errors are
+            raised for the first step in the procedure that fails.
     """
     _prepared_for_execution: bool = False
     _xdl: 'XDL' = None
     _graph: MultiDiGraph = None
     logger: logging.Logger = None
+    compile_workers: int = None
 
     def __init__(self, xdl: 'XDL' = None) -> None:
         """Initalize ``_xdl`` and ``logger`` member variables."""
@@ -56,12 +68,10 @@ class AbstractXDLExecutor(ABC):
     ####################
 
     def _graph_hash(self, graph: MultiDiGraph = None) -> str:
-        """Get SHA 256 hash of graph. Used to determine whether graph used for
-        execution is the same as the one used for compilation.
-
-        Recommended to override this basic implementation, as this will give
-        you a different hash if the position of nodes change, even if the
-        properties and connectivity stays the same.
+        """Get hash of graph. Used to determine whether graph used for
+        execution is the same as the one used for compilation. See
+        :py:func:`xdl.utils.hashing.graph_hash`, the hash doesn't change if
+        nodes are moved in the graph editor.
 
         Args:
             graph (MultiDiGraph): Graph to get hash of.
@@ -69,12 +79,43 @@ class AbstractXDLExecutor(ABC):
         Returns:
             str: Hash of graph.
         """
+        if not graph:
+            graph = self._graph
+        return graph_hash(graph)
+
+    def _legacy_graph_hash(self, graph: MultiDiGraph = None) -> str:
+        """Get graph hash as calculated by previous versions of XDL, the SHA
+        256 hash of the node link data of the graph. Used to verify graph
+        hashes of existing xdlexe files.
+
+        Args:
+            graph (MultiDiGraph): Graph to get hash of.
+
+        Returns:
+            str: Legacy hash of graph.
+        """
         if not graph:
             graph = self._graph
         return hashlib.sha256(
             str(node_link_data(graph)).encode('utf-8')
         ).hexdigest()
 
+    def _graph_hash_matches(
+            self, expected_hash: str, graph: MultiDiGraph = None) -> bool:
+        """Return ``True`` if graph has given hash, as calculated by
+        :py:meth:`_graph_hash` or, for xdlexe files compiled by previous
+        versions of XDL, :py:meth:`_legacy_graph_hash`.
+
+        Args:
+            expected_hash (str): Graph hash procedure was compiled with.
+            graph (MultiDiGraph): Graph to check hash of.
+
+        Returns:
+            bool: ``True`` if graph hash matches, otherwise ``False``.
+        """
+        return (self._graph_hash(graph) == expected_hash
+                or self._legacy_graph_hash(graph) == expected_hash)
+
     def prepare_for_execution(
         self,
         graph_file: Union[str, MultiDiGraph],
@@ -143,8 +184,11 @@ class AbstractXDLExecutor(ABC):
             graph = self._graph
         if steps is None:
             steps = self._xdl.steps
-        for step in steps:
-            do_sanity_check(graph, step)
+        self._compile_steps(
+            lambda step: do_sanity_check(graph, step),
+            steps,
+            lambda step: True,
+        )
 
     def add_internal_properties(
         self,
@@ -166,13 +210,81 @@ class AbstractXDLExecutor(ABC):
         """
         if graph is None:
             graph = self._graph
+
+        # Top level steps, compile in parallel if compile_workers given
         if steps is None:
-            steps = self._xdl.steps
+            self._compile_steps(
+                lambda step: self.add_internal_properties_to_step(graph, step),
+                self._xdl.steps,
+                self._is_graph_read_only,
+            )
+            return
 
         # Iterate through each step
         for step in steps:
             self.add_internal_properties_to_step(graph, step)
 
+    def _compile_steps(
+        self,
+        compile_step: Callable[[Step], None],
+        steps: List[Step],
+        can_run_in_parallel: Callable[[Step], bool],
+    ) -> None:
+        """Call ``compile_step`` for every step in steps list. If
+        :py:attr:`compile_workers` is more than one, consecutive steps that
+        ``can_run_in_parallel`` are compiled at the same time in a thread pool.
+
+        Args:
+            compile_step (Callable[[Step], None]): Function to call with every
+                step.
+            steps (List[Step]): Steps to compile.
+            can_run_in_parallel (Callable[[Step], bool]): Function returning
+                ``True`` if step can be compiled at the same time as other
+                steps.
+
+        Raises:
+            Exception: Error raised by ``compile_step`` for the first step in
+                steps list that fails.
+        """
+        if not self.compile_workers or self.compile_workers < 2:
+            for step in steps:
+                compile_step(step)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.compile_workers) as pool:
+            batch = []
+            for step in steps:
+                if can_run_in_parallel(step):
+                    batch.append(pool.submit(compile_step, step))
+                else:
+                    _wait_in_order(batch)
+                    batch = []
+                    compile_step(step)
+            _wait_in_order(batch)
+
+    def _is_graph_read_only(self, step: Step) -> bool:
+        """Return ``True`` if step can be compiled at the same time as other
+        steps. See ``Step.GRAPH_READ_ONLY``.
+
+        Args:
+            step (Step): Step to check.
+
+        Returns:
+            bool: ``True`` if compiling step only reads the graph and the
+            properties of the step.
+        """
+        read_only = step.GRAPH_READ_ONLY
+        if read_only is None:
+            read_only = (
+                isinstance(step, AbstractBaseStep)
+                and type(step).on_prepare_for_execution
+                is Step.on_prepare_for_execution
+            )
+        if read_only and 'children' in step.properties and step.children:
+            return all(
+                self._is_graph_read_only(child) for child in step.children)
+        return read_only
+
     def add_internal_properties_to_step(
             self, graph: MultiDiGraph, step: Step) -> None:
         """Add internal properties to given step and all its substeps and
@@ -198,7 +310,126 @@ class AbstractXDLExecutor(ABC):
 
         # Recursive steps, add internal proerties to all substeps
         if not isinstance(step, NON_RECURSIVE_ABSTRACT_STEPS):
-            self.add_internal_properties(graph, step.steps)
+            substeps = step.steps
+            # Repeated steps are the same objects, so only prepare them once.
+            if isinstance(substeps, RepeatSequence):
+                substeps = substeps.children
+            self.add_internal_properties(graph, substeps)
+
+    def recompile(
+        self,
+        graph: MultiDiGraph = None,
+        sanity_check: bool = True,
+    ) -> List[Step]:
+        """Compile again only steps of already compiled procedure that need
+        recompiling, i.e. steps that have been added or had their properties
+        changed since the procedure was compiled (see
+        :py:attr:`Step.needs_recompile`). Internal properties are added to
+        these steps and all their substeps and child steps, and sanity checks
+        are performed on them. Everything else is left as it is.
+
+        Platforms that do more during :py:meth:`prepare_for_execution` than
+        adding internal properties to steps, e.g. mapping vessels to the graph,
+        should override this to do the same for the steps returned by
+        :py:meth:`get_steps_to_recompile` before calling this method.
+
+        Args:
+            graph (MultiDiGraph): Graph procedure was compiled with. If not
+                given will use :py:attr:`_graph`.
+            sanity_check (bool): If ``True``, perform sanity checks on
+                recompiled steps.
+
+        Returns:
+            List[Step]: Recompiled steps. Substeps and child steps of these
+            steps are not included.
+        """
+        if graph is None:
+            graph = self._graph
+        self._graph = graph
+
+        steps = self.get_steps_to_recompile()
+        self._compile_steps(
+            lambda step: self.add_internal_properties_to_step(graph, step),
+            steps,
+            self._is_graph_read_only,
+        )
+        if sanity_check:
+            self.perform_sanity_checks(steps, graph)
+        self.mark_compiled(steps)
+        return steps
+
+    def get_steps_to_recompile(self, steps: List[Step] = None) -> List[Step]:
+        """Return outermost steps that need recompiling in given list of steps
+        and their substeps and child steps. If steps list not given defaults
+        to ``self._xdl.steps``.
+
+        Args:
+            steps (List[Step]): List of steps to look for steps that need
+                recompiling in.
+
+        Returns:
+            List[Step]: Steps that need recompiling. Substeps and child steps
+            of these steps are not included as the whole step needs
+            recompiling.
+        """
+        if steps is None:
+            steps = self._xdl.steps
+        to_recompile = []
+        self._find_steps_to_recompile(steps, to_recompile, set())
+        return to_recompile
+
+    def _find_steps_to_recompile(
+        self, steps: List[Step], to_recompile: List[Step], seen: set
+    ) -> None:
+        """Recursively add steps that need recompiling to ``to_recompile``.
+
+        Args:
+            steps (List[Step]): Steps to check.
+            to_recompile (List[Step]): List to add steps that need recompiling
+                to.
+            seen (set): ``id`` of steps already checked. Same step object can
+                occur more than once, e.g. children of ``Repeat``.
+        """
+        for step in steps:
+            if id(step) in seen:
+                continue
+            seen.add(id(step))
+
+            if step.needs_recompile:
+                to_recompile.append(step)
+                continue
+
+            if 'children' in step.properties and step.children:
+                self._find_steps_to_recompile(
+                    step.children, to_recompile, seen)
+
+            if not isinstance(step, NON_RECURSIVE_ABSTRACT_STEPS):
+                substeps = step.steps
+                if isinstance(substeps, RepeatSequence):
+                    substeps = substeps.children
+                self._find_steps_to_recompile(substeps, to_recompile, seen)
+
+    def mark_compiled(self, steps: List[Step] = None) -> None:
+        """Record that all steps in steps list, and all their substeps and
+        child steps, have been compiled with their current properties. If
+        steps list not given defaults to ``self._xdl.steps``.
+
+        Args:
+            steps (List[Step]): List of steps to mark as compiled.
+        """
+        if steps is None:
+            steps = self._xdl.steps
+        for step in steps:
+            step.mark_compiled()
+
+            if 'children' in step.properties and step.children:
+                self.mark_compiled(step.children)
+
+            if not isinstance(step, NON_RECURSIVE_ABSTRACT_STEPS):
+                substeps = step.steps
+                if isinstance(substeps, RepeatSequence):
+                    substeps = substeps.children
+                self.mark_compiled(substeps)
 
     def prepare_dynamic_steps_for_execution(
         self,
@@ -366,7 +597,8 @@ class AbstractXDLExecutor(ABC):
             if hasattr(platform_controller, 'graph'):
 
                 # Check graph hashes match
-                if self._xdl.graph_sha256 == self._graph_hash(
+                if self._graph_hash_matches(
+                        self._xdl.graph_sha256,
                         platform_controller.graph.graph):
 
                     self.logger.info('Executing xdlexe, graph hashes match.')
@@ -413,3 +645,19 @@ class AbstractXDLExecutor(ABC):
 
         else:
             raise XDLExecutionBeforeCompilationError()
+
+def _wait_in_order(futures: List[Future]) -> None:
+    """Wait for futures to finish in order, raising the error of the first
+    future that fails. Futures that haven't started yet are cancelled if one
+    fails.
+
+    Args:
+        futures (List[Future]): Futures to wait for.
+    """
+    try:
+        for future in futures:
+            future.result()
+    except Exception:
+        for future in futures:
+            future.cancel()
+        raise
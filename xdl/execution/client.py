@@ -13,6 +13,7 @@ from threading import Thread
 from ..constants import CHEMIFY_API_URL
 from ..xdl import XDL
 from ..utils.graph import get_graph
+from .plan import ExecutionPlan
 from ..steps import NON_RECURSIVE_ABSTRACT_STEPS, Step
 from ..errors import XDLError
 
@@ -154,9 +155,9 @@ class XDLExecutionClient(object):
     #: Dict of { step_uuid: step_logs }
     _logs: Dict[str, str] = {}
 
-    #: List of step UUIDs for steps that have been successfully completed. Used
-    #: to know which steps to skip when resuming after a pause.
-    _completed_substeps: List[str] = []
+    #: Index in execution plan of entry execution was paused at. Used to know
+    #: where to continue execution from when resuming after a pause.
+    _pause_index: int = 0
 
     #: Flag used to know if a step is in the process of finding its resume
     #: point. I.e. while finding resume point don't log anything.
@@ -403,11 +404,10 @@ class XDLExecutionClient(object):
         self._stop, self._pause = False, False
         self._stop_reading_logs = False
 
-        # If starting from scratch and not resuming, clear log file,
-        #  _completed_substeps list and self._logs[step_uuid].
+        # If starting from scratch and not resuming, clear log file and
+        # self._logs[step_uuid].
         if not self._resuming:
             self._reset_log_file()
-            self._completed_substeps = []
             self._logs[step_uuid] = ''
 
         # Start log reading thread
@@ -420,17 +420,21 @@ class XDLExecutionClient(object):
                 "Can't execute. Platform controller not initialised.")
             return
 
-        # Get step object to instantiate.
-        step = [step for step in self._xdl.steps if step.uuid == step_uuid][0]
+        # Get range of execution plan entries belonging to step. If resuming,
+        # skip entries completed before execution was paused.
+        plan = self._xdl.execution_plan
+        start, end = plan.step_range(step_uuid)
+        if self._resuming:
+            start = self._pause_index
 
         # Initialise failed result.
         failed = False
 
-        # Go through all substeps and recursively execute base steps.
-        for substep in step.steps:
+        # Go through all entries and execute base steps.
+        for i in range(start, end):
 
-            # Execute substep
-            res = self._execute_substep(substep)
+            # Execute entry
+            res = self._execute_plan_entry(plan, i)
 
             # If substep failed, set failed to True, stop execution and emit
             # result.
@@ -445,9 +449,11 @@ class XDLExecutionClient(object):
                 # Reset flags
                 self._stop, self._pause = False, False
 
-                # Store UUID of step for resuming from pause.
+                # Store UUID of step and entry paused at for resuming from
+                # pause.
                 if res == self.STEP_PAUSED:
                     self._pause_uuid = step_uuid
+                    self._pause_index = i
 
                 # Join log reading thread.
                 self._stop_reading_logs = True
@@ -521,10 +527,10 @@ class XDLExecutionClient(object):
             simulation_platform_controller = self._platform_controller
         if not error:
             try:
-                confirm_step_uuids = [
+                confirm_step_uuids = {
                     step['uuid'] for step in self._xdl_summary
                     if step['confirm']
-                ]
+                }
                 for step in self._xdl.steps:
                     if step.uuid not in confirm_step_uuids:
                         self._xdl.executor.execute_step(
@@ -540,7 +546,7 @@ class XDLExecutionClient(object):
             xdlexe (str): xdlexe str to load.
         """
         try:
-            self._xdl = XDL(xdlexe)
+            self._xdl = XDL(xdlexe, lazy=True)
             self._xdl.executor.logger = self._xdl_logger
             self._xdl.logger = self._xdl_logger
             assert self._xdl.compiled is True
@@ -647,11 +653,12 @@ class XDLExecutionClient(object):
             if self._stop_reading_logs:
                 return
 
-    def _execute_substep(self, substep: Step) -> int:
-        """Recursively execute given step and return result code.
+    def _execute_plan_entry(self, plan: ExecutionPlan, index: int) -> int:
+        """Execute entry of execution plan and return result code.
 
         Args:
-            substep (Step): Step to recursively execute.
+            plan (ExecutionPlan): Execution plan of procedure.
+            index (int): Index of entry to execute.
 
         Returns:
             int: Returns one of the following.
@@ -660,46 +667,19 @@ class XDLExecutionClient(object):
                 self.STEP_STOPPED - Step encountered stop flag.
                 self.STEP_PAUSED - Step encountered pause flag.
         """
-        # If resuming and substep has already been executed (UUID in
-        # self._completed_substeps) then just return self.STEP_COMPLETED
-        # without doing or logging anything.
-        if self._resuming and substep.uuid in self._completed_substeps:
-            return self.STEP_COMPLETED
-
-        # Step is executable step, execute and return result.
-        if isinstance(substep, NON_RECURSIVE_ABSTRACT_STEPS):
-            res = self._execute_base_step(substep)
-
-            # Step completed successfully, append step to
-            # self._completed_substeps.
-            if res == self.STEP_COMPLETED:
-                self._completed_substeps.append(substep.uuid)
-            return res
-
-        # Step containg substeps. Recursively execute substeps.
-        else:
-            # Only log this while not resuming otherwise you'll end up with
-            # duplicate log messages on resume.
-            if not self._resuming:
-                self._xdl_logger.info(f'\n{substep.name}')
-
-            # Go through substeps step list and execute each step.
-            for subsubstep in substep.steps:
-                res = self._execute_substep(subsubstep)
-
-                # Return result if result is not self.STEP_COMPLETED
-                if res != self.STEP_COMPLETED:
-                    return res
+        entry = plan[index]
 
-                # Step completed successfully, add to self._completed_substeps.
-                else:
-                    self._completed_substeps.append(subsubstep.uuid)
-
-        # Substep completed successfully, append to self._completed_substeps and
-        # return.
-        self._completed_substeps.append(substep.uuid)
+        # Log names of steps containing entry that start executing here, apart
+        # from top level step. Only log this while not resuming otherwise
+        # you'll end up with duplicate log messages on resume.
+        if not self._resuming:
+            starting_parents = plan.starting_parents(index)
+            if starting_parents and starting_parents[0] is entry.parents[0]:
+                starting_parents = starting_parents[1:]
+            for parent in starting_parents:
+                self._xdl_logger.info(f'\n{parent.name}')
 
-        return self.STEP_COMPLETED
+        return self._execute_base_step(entry.step)
 
     def _execute_base_step(self, base_step: Step) -> int:
         """Execute AbstractBaseStep, AbstractDynamicStep or AbstractAsyncStep.
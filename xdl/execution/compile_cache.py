@@ -0,0 +1,89 @@
+"""On-disk cache of compiled procedures.
+
+If caches are enabled (see :py:mod:`xdl.utils.cache`), procedures compiled
+with :py:meth:`xdl.XDL.prepare_for_execution` are stored in the binary XDL
+format, keyed by the structural hash of the procedure, the hash of the graph,
+the platform fingerprint, the XDL version and the compile options. Compiling the
+same procedure against the same graph again, from any process, then loads the
+compiled procedure from the cache and skips vessel mapping, adding internal
+properties and sanity checks completely.
+"""
+from typing import Any, Dict, Optional
+
+from ..constants import XDL_VERSION
+from ..readwrite.binary import (
+    xdl_to_binary, apply_compiled_binary, XDLBIN_FORMAT_VERSION)
+from ..readwrite.errors import XDLReadError
+from ..utils.cache import get_cache, hash_key
+
+# For type annotations
+if False:
+    from ..xdl import XDL
+
+#: Name of compile cache folder in cache directory.
+COMPILE_CACHE_NAME: str = 'compile'
+
+def compile_cache_key(
+    xdl_obj: 'XDL',
+    graph_hash: str,
+    compile_options: Dict[str, Any],
+) -> str:
+    """Return compile cache key for procedure.
+
+    Args:
+        xdl_obj (XDL): Uncompiled XDL object.
+        graph_hash (str): Hash of graph procedure is compiled with.
+        compile_options (Dict[str, Any]): Keyword arguments given to
+            :py:meth:`xdl.XDL.prepare_for_execution`, which may change the
+            compiled procedure.
+
+    Returns:
+        str: Compile cache key.
+    """
+    return hash_key(
+        xdl_obj.structural_hash,
+        graph_hash,
+        xdl_obj.platform.fingerprint,
+        XDL_VERSION,
+        XDLBIN_FORMAT_VERSION,
+        sorted((k, repr(v)) for k, v in compile_options.items()),
+    )
+
+def load_compiled(
+    key: str,
+    xdl_obj: 'XDL',
+    lazy: bool = False
+) -> Optional[Dict[str, Any]]:
+    """Load compiled procedure from compile cache, applying the compiled step
+    records to the existing steps of ``xdl_obj``.
+
+    Args:
+        key (str): Compile cache key from :py:func:`compile_cache_key`.
+        xdl_obj (XDL): XDL object being compiled.
+        lazy (bool): Passed to :py:func:`xdl.readwrite.apply_compiled_binary`.
+
+    Returns:
+        Optional[Dict[str, Any]]: Dict in the form returned by
+        :py:func:`xdl.readwrite.apply_compiled_binary`, or ``None`` if
+        procedure is not in compile cache.
+    """
+    cache = get_cache(COMPILE_CACHE_NAME)
+    data = cache.get(key)
+    if data is None:
+        return None
+    try:
+        return apply_compiled_binary(data, xdl_obj, lazy=lazy)
+
+    # Entry is corrupt, remove it and compile procedure.
+    except XDLReadError:
+        cache.delete(key)
+        return None
+
+def store_compiled(key: str, xdl_obj: 'XDL') -> None:
+    """Store compiled procedure in compile cache.
+
+    Args:
+        key (str): Compile cache key from :py:func:`compile_cache_key`.
+        xdl_obj (XDL): Compiled XDL object.
+    """
+    get_cache(COMPILE_CACHE_NAME).set(key, xdl_to_binary(xdl_obj))
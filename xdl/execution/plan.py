@@ -0,0 +1,154 @@
+"""Flat execution plan of compiled procedures.
+
+The execution plan lists every step that is executed directly, i.e. base steps,
+dynamic steps and async steps, in the order they are executed, along with the
+index path and chain of parent steps of each one. This means procedures can be
+executed, resumed or analysed by iterating over a list rather than walking the
+step tree recursively, and execution can jump straight to any step.
+
+The plan is built from the substeps of the procedure at the time it is built,
+so it should only be built for compiled procedures, which aren't changed after
+compilation.
+"""
+from typing import Dict, Iterator, List, Tuple
+
+from ..steps import NON_RECURSIVE_ABSTRACT_STEPS, AbstractAsyncStep, Step
+from ..steps.special_steps import Await
+
+class PlanEntry(object):
+    """Step executed directly during execution of procedure.
+
+    Args:
+        step (Step): Base step, dynamic step or async step to execute.
+        index_path (Tuple[int]): Indexes into steps list and substeps lists
+            of step, as used in step execution log messages.
+        parents (Tuple[Step]): Steps containing step, from top level step
+            down to parent of step.
+
+    Attributes:
+        is_async (bool): ``True`` if step is an async step that continues
+            executing in the background, otherwise ``False``.
+        is_await (bool): ``True`` if step is an ``Await`` step that waits for
+            an async step to finish, otherwise ``False``.
+    """
+
+    def __init__(
+        self,
+        step: Step,
+        index_path: Tuple[int],
+        parents: Tuple[Step],
+    ) -> None:
+        self.step = step
+        self.index_path = index_path
+        self.parents = parents
+        self.is_async = isinstance(step, AbstractAsyncStep)
+        self.is_await = type(step) is Await
+
+    @property
+    def level(self) -> int:
+        """Level of recursion of step. ``0`` for top level steps."""
+        return len(self.parents)
+
+    def __repr__(self) -> str:
+        index_path = '.'.join(str(i + 1) for i in self.index_path)
+        return f'PlanEntry({index_path} {self.step.name})'
+
+class ExecutionPlan(object):
+    """Flat list of all steps executed directly during execution of
+    procedure, in execution order.
+
+    Args:
+        steps (List[Step]): Top level steps of compiled procedure.
+    """
+
+    def __init__(self, steps: List[Step]) -> None:
+        self.entries: List[PlanEntry] = []
+
+        # { step_uuid: (start, end) } of entries executed as part of step.
+        self._ranges: Dict[str, Tuple[int, int]] = {}
+
+        for i, step in enumerate(steps):
+            self._add_step(step, (i,), ())
+
+    def _add_step(
+        self, step: Step, index_path: Tuple[int], parents: Tuple[Step]
+    ) -> None:
+        """Add entries for step and all its substeps to plan.
+
+        Args:
+            step (Step): Step to add.
+            index_path (Tuple[int]): Index path of step.
+            parents (Tuple[Step]): Parent chain of step.
+        """
+        start = len(self.entries)
+        if isinstance(step, NON_RECURSIVE_ABSTRACT_STEPS):
+            self.entries.append(PlanEntry(step, index_path, parents))
+        else:
+            substep_parents = parents + (step,)
+            for i, substep in enumerate(step.steps):
+                self._add_step(substep, index_path + (i,), substep_parents)
+
+        # Same step object can occur more than once, e.g. children of
+        # Repeat, in which case only the first occurrence is recorded.
+        if step.uuid not in self._ranges:
+            self._ranges[step.uuid] = (start, len(self.entries))
+
+    def step_range(self, step_uuid: str) -> Tuple[int, int]:
+        """Return range of entries executed as part of given step.
+
+        Args:
+            step_uuid (str): UUID of step. If step occurs more than once in
+                procedure, the first occurrence is used.
+
+        Returns:
+            Tuple[int, int]: ``(start, end)`` indexes of entries executed as
+            part of step. Entries ``start`` to ``end - 1`` are included, so if
+            step doesn't execute anything ``start == end``.
+
+        Raises:
+            KeyError: If no step with given UUID is in procedure.
+        """
+        return self._ranges[step_uuid]
+
+    def index(self, step_uuid: str) -> int:
+        """Return index of first entry executed as part of given step.
+
+        Args:
+            step_uuid (str): UUID of step.
+
+        Returns:
+            int: Index of first entry executed as part of step.
+
+        Raises:
+            KeyError: If no step with given UUID is in procedure.
+        """
+        return self._ranges[step_uuid][0]
+
+    def starting_parents(self, index: int) -> Tuple[Step]:
+        """Return parents of entry that start executing at entry, i.e.
+        parents that the previous entry is not part of.
+
+        Args:
+            index (int): Index of entry.
+
+        Returns:
+            Tuple[Step]: Parents of entry that start executing at entry, from
+            outermost to innermost.
+        """
+        entry = self.entries[index]
+        if index == 0:
+            return entry.parents
+        previous_path = self.entries[index - 1].index_path
+        for level in range(len(entry.parents)):
+            if previous_path[:level + 1] != entry.index_path[:level + 1]:
+                return entry.parents[level:]
+        return ()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, index: int) -> PlanEntry:
+        return self.entries[index]
+
+    def __iter__(self) -> Iterator[PlanEntry]:
+        return iter(self.entries)
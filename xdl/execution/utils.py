@@ -1,6 +1,7 @@
 from networkx import MultiDiGraph
 
 from ..steps import Step, AbstractDynamicStep, NON_RECURSIVE_ABSTRACT_STEPS
+from ..steps.utils import RepeatSequence
 
 def do_sanity_check(graph: MultiDiGraph, step: Step) -> None:
     """Perform sanity checks defined in step ``sanity_checks`` methods
@@ -25,8 +26,12 @@ def do_sanity_check(graph: MultiDiGraph, step: Step) -> None:
 
     # Recursive step
     if not isinstance(step, NON_RECURSIVE_ABSTRACT_STEPS):
-        # Iterate through substep and perform sanity check
-        for substep in step.steps:
+        # Iterate through substep and perform sanity check. Repeated steps
+        # are the same objects, so only check them once.
+        substeps = step.steps
+        if isinstance(substeps, RepeatSequence):
+            substeps = substeps.children
+        for substep in substeps:
             do_sanity_check(graph, substep)
 
     # Dynamic step
@@ -2,7 +2,11 @@ from typing import Optional, Callable, Union, List, Dict, Any, Type
 from networkx import MultiDiGraph
 import json
 import abc
+import functools
+import hashlib
+import sys
 from ..utils.schema import generate_schema
+from ..utils.hashing import canonical_value
 from ..execution.abstract_executor import AbstractXDLExecutor
 from ..steps import Step, AbstractBaseStep
 from ..reagents import Reagent
@@ -72,6 +76,37 @@ class AbstractPlatform(object):
         """
         return None
 
+    @property
+    def fingerprint(self) -> str:
+        """Hash identifying the platform and the step classes in its step
+        library. Used in cache keys so that cached steps are never loaded with
+        a different step library to the one they were created with.
+
+        The hash includes the installed version of every package providing the
+        platform or a step class, and the ``PROP_TYPES``, ``DEFAULT_PROPS`` and
+        ``INTERNAL_PROPS`` of every step class, so upgrading the platform
+        package or changing a step's props invalidates cached steps.
+
+        Returns:
+            str: SHA256 hex digest of platform and step library.
+        """
+        platform_module = type(self).__module__
+        sha256 = hashlib.sha256()
+        sha256.update(f'{platform_module}.{type(self).__qualname__}'.encode())
+
+        packages = {platform_module.split('.')[0]}
+        for step_name, step_type in sorted(self.step_library.items()):
+            packages.add(step_type.__module__.split('.')[0])
+            sha256.update(
+                f'|{step_name}:{step_type.__module__}.{step_type.__qualname__}'
+                .encode())
+            sha256.update(_step_props_signature(step_type).encode())
+
+        for package in sorted(packages):
+            sha256.update(
+                f'|{package}=={_package_version(package)}'.encode())
+        return sha256.hexdigest()
+
     @property
     def schema(self) -> str:
         """Generate platform specific XML schema for XDL files using platform
@@ -247,3 +282,76 @@ class AbstractPlatform(object):
         """
         with open(save_path, 'w') as fd:
             json.dump(self.declaration, fd, indent=2)
+
+@functools.lru_cache(maxsize=None)
+def _package_version(package: str) -> str:
+    """Return installed version of distribution providing top level package,
+    or the package's ``__version__`` if it isn't installed as a distribution.
+
+    Args:
+        package (str): Top level package name.
+
+    Returns:
+        str: Version of package, or ``''`` if version can't be found.
+    """
+    # importlib.metadata only exists from Python 3.8.
+    try:
+        import importlib.metadata as metadata
+    except ImportError:
+        metadata = None
+
+    if metadata is not None:
+        # packages_distributions only exists from Python 3.10.
+        packages_distributions = getattr(
+            metadata, 'packages_distributions', dict)
+        for distribution in packages_distributions().get(package, [package]):
+            try:
+                return metadata.version(distribution)
+            except metadata.PackageNotFoundError:
+                pass
+
+    else:
+        try:
+            import pkg_resources
+        except ImportError:
+            pkg_resources = None
+        if pkg_resources is not None:
+            try:
+                return pkg_resources.get_distribution(package).version
+            except pkg_resources.DistributionNotFound:
+                pass
+
+    return str(getattr(sys.modules.get(package, None), '__version__', ''))
+
+def _step_props_signature(step_type: Type[Step]) -> str:
+    """Return str of prop specification of step class for platform
+    fingerprint.
+
+    Args:
+        step_type (Type[Step]): Step class.
+
+    Returns:
+        str: ``PROP_TYPES``, ``DEFAULT_PROPS`` and ``INTERNAL_PROPS`` of
+        ``step_type``.
+    """
+    prop_types = ','.join(
+        f'{prop}:{_prop_type_str(prop_type)}'
+        for prop, prop_type in sorted(step_type.PROP_TYPES.items())
+    )
+    default_props = canonical_value(dict(step_type.DEFAULT_PROPS))
+    internal_props = ','.join(sorted(step_type.INTERNAL_PROPS))
+    return f'({prop_types})({default_props})({internal_props})'
+
+def _prop_type_str(prop_type: Any) -> str:
+    """Return str of prop type that is the same in every process.
+
+    Args:
+        prop_type (Any): Prop type from ``PROP_TYPES``.
+
+    Returns:
+        str: Qualified name of class, or ``repr`` of any other prop type, e.g.
+        ``'vessel'`` or ``typing.List[str]``.
+    """
+    if isinstance(prop_type, type):
+        return f'{prop_type.__module__}.{prop_type.__qualname__}'
+    return repr(prop_type)
@@ -1,2 +1,5 @@
-from .xml_interpreter import xdl_file_to_objs, xdl_str_to_objs
+from .xml_interpreter import xdl_file_to_objs, xdl_str_to_objs, parse_xdl_tree
 from .xml_generator import xdl_to_xml_string
+from .binary import (
+    xdl_to_binary, xdl_from_binary, apply_compiled_binary,
+    xdl_binary_file_to_objs, objs_to_binary)
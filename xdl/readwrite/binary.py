@@ -0,0 +1,535 @@
+"""Compact binary format for compiled procedures (``.xdlbin``).
+
+The format is an alternative to xdlexe files that is much faster to write and
+read back. It contains the same information as a xdlexe file: the full step
+tree with every property of every step, the reagents, hardware and metadata,
+and the hash of the graph the procedure was compiled with. Property values are
+stored in standard units exactly as they are held in the properties dict of
+each step, so no unit formatting or parsing is done when saving or loading.
+
+Layout (all integers little endian)::
+
+    magic            b'XDLBIN'
+    format version   uint16
+    body             value
+
+A value is a one byte tag followed by its payload:
+
+    ===  =====================================================================
+    Tag  Payload
+    ===  =====================================================================
+    N    None, no payload
+    T    True, no payload
+    F    False, no payload
+    i    int64
+    f    float64
+    s    uint32 byte length, UTF-8 bytes
+    k    interned string, see below
+    l    uint32 item count, values
+    d    uint32 item count, (key, value) pairs
+    ===  =====================================================================
+
+Dict keys and step names are interned. A key is written as a uint16 index into
+the table of keys read so far, or as ``0xFFFF`` followed by a string if it has
+not been seen before, in which case it is added to the table. Step names are
+written with the ``k`` tag followed by the name written as a key.
+
+The body is a dict with keys ``'xdl_version'``, ``'graph_sha256'``,
+``'metadata'``, ``'reagents'``, ``'hardware'`` and ``'steps'``. Reagents,
+hardware and metadata are stored as properties dicts. Every step is stored as
+a list ``[name, properties, children, substeps]``, where ``children`` is a
+list of ``[uuid, step]`` of the steps of the ``children`` property and
+``substeps`` is the full list of steps returned by ``step.steps``. Substeps
+are only stored if the procedure is compiled, otherwise they are generated
+from the step properties on loading.
+Top level steps are stored as ``[section, uuid, step]``.
+"""
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from .errors import XDLInvalidStepTypeError, XDLInvalidBinaryError
+from .xml_interpreter import apply_step_record
+from ..constants import XDL_VERSION
+from ..hardware import Hardware, Component
+from ..metadata import Metadata
+from ..reagents import Reagent
+from ..steps import Step, AbstractBaseStep
+from ..steps.utils import RepeatSequence
+
+# For type annotations
+if False:
+    from ..xdl import XDL
+    from ..platforms import AbstractPlatform
+
+#: Magic bytes at start of every ``.xdlbin`` file.
+XDLBIN_MAGIC: bytes = b'XDLBIN'
+
+#: Version of binary format. Must be incremented whenever the layout changes.
+XDLBIN_FORMAT_VERSION: int = 2
+
+_HEADER = struct.Struct('<6sH')
+_UINT16 = struct.Struct('<H')
+_UINT32 = struct.Struct('<I')
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+
+# Procedure sections in the order steps are stored.
+_SECTIONS = ['no_section', 'prep', 'reaction', 'workup', 'purification']
+
+# Key index signifying that key is new and written in full.
+_NEW_KEY = 0xFFFF
+
+class _InternedStr(str):
+    """String written as an interned key rather than in full, used for step
+    names as the same few step names occur throughout the step tree.
+    """
+
+###########
+# Writing #
+###########
+
+def xdl_to_binary(xdl_obj: 'XDL', graph_hash: str = None) -> bytes:
+    """Convert XDL object to binary format.
+
+    Args:
+        xdl_obj (XDL): XDL object to convert.
+        graph_hash (str): Hash of graph procedure was compiled with. If
+            ``None``, :py:attr:`XDL.graph_sha256` is used.
+
+    Returns:
+        bytes: Binary XDL.
+    """
+    if graph_hash is None:
+        graph_hash = xdl_obj.graph_sha256
+
+    step_sections = xdl_obj.step_sections()
+    steps = {section: [] for section in _SECTIONS}
+    for step in xdl_obj.steps:
+        steps[step_sections.get(step.uuid, 'no_section')].append(step)
+
+    return objs_to_binary({
+        'steps': steps,
+        'hardware': xdl_obj.hardware,
+        'reagents': xdl_obj.reagents,
+        'metadata': xdl_obj.metadata,
+        'procedure_attrs': {'graph_sha256': graph_hash},
+    })
+
+def objs_to_binary(parsed_xdl: Dict[str, Any]) -> bytes:
+    """Convert objects returned by XDL parsers to binary format. Inverse of
+    :py:func:`xdl_from_binary`.
+
+    Args:
+        parsed_xdl (Dict[str, Any]): Dict in the form returned by
+            :py:func:`xdl.readwrite.parse_xdl_tree`.
+
+    Returns:
+        bytes: Binary XDL.
+    """
+    graph_hash = parsed_xdl['procedure_attrs'].get('graph_sha256', None)
+    # Substeps only need to be stored if procedure is compiled, otherwise
+    # they are regenerated from the step properties when loading.
+    full_tree = bool(graph_hash)
+
+    steps = []
+    for section in _SECTIONS:
+        for step in parsed_xdl['steps'][section]:
+            steps.append(
+                [section, step.uuid, _step_to_record(step, full_tree)])
+
+    body = {
+        'xdl_version': XDL_VERSION,
+        'graph_sha256': graph_hash,
+        'metadata': parsed_xdl['metadata'].properties,
+        'reagents': [
+            reagent.properties for reagent in parsed_xdl['reagents']],
+        'hardware': [
+            component.properties for component in parsed_xdl['hardware']],
+        'steps': steps,
+    }
+
+    writer = _BinaryWriter()
+    writer.write(body)
+    return _HEADER.pack(XDLBIN_MAGIC, XDLBIN_FORMAT_VERSION) + writer.getvalue()
+
+def _step_to_record(step: Step, full_tree: bool = True) -> List:
+    """Return binary format record of step and its step tree.
+
+    Args:
+        step (Step): Step to get record of.
+        full_tree (bool): If ``True``, include records of all substeps.
+
+    Returns:
+        List: ``[name, properties, children, substeps]``
+    """
+    properties = {
+        prop: val for prop, val in step.properties.items()
+        if prop != 'children'
+    }
+    children = [
+        [child.uuid, _step_to_record(child, full_tree)]
+        for child in step.properties.get('children', None) or []
+    ]
+    substeps = []
+    if full_tree and not isinstance(step, AbstractBaseStep):
+        steps = step.steps
+        # Repeated steps are the same objects so have the same records.
+        if isinstance(steps, RepeatSequence):
+            substeps = [
+                _step_to_record(substep) for substep in steps.children
+            ] * steps.repeats
+        else:
+            substeps = [_step_to_record(substep) for substep in steps]
+    return [_InternedStr(step.name), properties, children, substeps]
+
+class _BinaryWriter(object):
+    """Writes values in binary format to internal buffer."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._keys = {}
+
+    def getvalue(self) -> bytes:
+        return bytes(self._buffer)
+
+    def write(self, value: Any) -> None:
+        buffer = self._buffer
+        value_type = type(value)
+
+        if value is None:
+            buffer += b'N'
+
+        elif value_type is bool:
+            buffer += b'T' if value else b'F'
+
+        elif value_type is str:
+            encoded = value.encode('utf8')
+            buffer += b's'
+            buffer += _UINT32.pack(len(encoded))
+            buffer += encoded
+
+        elif value_type is _InternedStr:
+            buffer += b'k'
+            self._write_key(value)
+
+        elif value_type is float:
+            buffer += b'f'
+            buffer += _FLOAT64.pack(value)
+
+        elif value_type is int:
+            buffer += b'i'
+            buffer += _INT64.pack(value)
+
+        elif value_type in (list, tuple):
+            buffer += b'l'
+            buffer += _UINT32.pack(len(value))
+            for item in value:
+                self.write(item)
+
+        elif value_type is dict:
+            buffer += b'd'
+            buffer += _UINT32.pack(len(value))
+            for k, v in value.items():
+                self._write_key(str(k))
+                self.write(v)
+
+        # Any other type, e.g. callables, can't be stored so are written as
+        # str, as is the case when writing xdlexe.
+        else:
+            self.write(str(value))
+
+    def _write_key(self, key: str) -> None:
+        index = self._keys.get(key, None)
+        if index is None:
+            if len(self._keys) < _NEW_KEY:
+                self._keys[key] = len(self._keys)
+            encoded = key.encode('utf8')
+            self._buffer += _UINT16.pack(_NEW_KEY)
+            self._buffer += _UINT32.pack(len(encoded))
+            self._buffer += encoded
+        else:
+            self._buffer += _UINT16.pack(index)
+
+###########
+# Reading #
+###########
+
+def xdl_binary_file_to_objs(
+    xdl_file: str,
+    platform: 'AbstractPlatform',
+    lazy: bool = False,
+) -> Dict[str, Any]:
+    """Given binary XDL file return steps, hardware and reagents.
+
+    Args:
+        xdl_file (str): Path to ``.xdlbin`` file.
+        platform (AbstractPlatform): Platform to use when constructing step
+            objects.
+        lazy (bool): See :py:func:`xdl.readwrite.xdl_file_to_objs`.
+
+    Returns:
+        Dict[str, Any]: Same as :py:func:`xdl.readwrite.parse_xdl_tree`.
+    """
+    with open(xdl_file, 'rb') as fd:
+        return xdl_from_binary(fd.read(), platform, lazy=lazy)
+
+def xdl_from_binary(
+    data: bytes,
+    platform: 'AbstractPlatform',
+    lazy: bool = False,
+    keep_uuids: bool = True,
+) -> Dict[str, Any]:
+    """Given binary XDL return steps, hardware and reagents.
+
+    Args:
+        data (bytes): Binary XDL.
+        platform (AbstractPlatform): Platform to use when constructing step
+            objects.
+        lazy (bool): See :py:func:`xdl.readwrite.xdl_file_to_objs`.
+        keep_uuids (bool): If ``True``, steps are given the UUIDs stored in
+            data, otherwise every step gets a new UUID.
+
+    Returns:
+        Dict[str, Any]: Same as :py:func:`xdl.readwrite.parse_xdl_tree`.
+
+    Raises:
+        XDLInvalidBinaryError: If data is not binary XDL, or was written using
+            an unsupported version of the binary format.
+    """
+    body = _read_body(data)
+    steps = {section: [] for section in _SECTIONS}
+    graph_hash = body['graph_sha256']
+    for section, uuid, step_record in body['steps']:
+        step = _step_from_record(
+            step_record, platform.step_library, keep_uuids)
+        if keep_uuids:
+            step.uuid = uuid
+        if graph_hash:
+            apply_step_record(
+                step, _apply_step_record_format(step_record), lazy=lazy)
+        steps[section].append(step)
+
+    procedure_attrs = {}
+    if graph_hash:
+        procedure_attrs['graph_sha256'] = graph_hash
+
+    return {
+        'steps': steps,
+        'hardware': Hardware([
+            Component(**properties) for properties in body['hardware']]),
+        'reagents': [
+            Reagent(**properties) for properties in body['reagents']],
+        'metadata': Metadata(**body['metadata']),
+        'procedure_attrs': procedure_attrs,
+    }
+
+def apply_compiled_binary(
+    data: bytes,
+    xdl_obj: 'XDL',
+    lazy: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """Apply compiled step records in binary XDL to the existing steps of an
+    uncompiled XDL object. Steps keep their UUIDs, so step objects held by the
+    caller stay valid, exactly as if the procedure had been compiled.
+
+    Args:
+        data (bytes): Binary XDL of compiled procedure.
+        xdl_obj (XDL): Uncompiled XDL object with the same procedure.
+        lazy (bool): See :py:func:`xdl.readwrite.xdl_file_to_objs`.
+
+    Returns:
+        Optional[Dict[str, Any]]: Same as :py:func:`xdl_from_binary` without
+        ``'steps'``, or ``None`` if the steps in data do not match the steps
+        of ``xdl_obj``, in which case no steps are changed.
+
+    Raises:
+        XDLInvalidBinaryError: If data is not binary XDL, or was written using
+            an unsupported version of the binary format.
+    """
+    body = _read_body(data)
+    graph_hash = body['graph_sha256']
+    if not graph_hash:
+        return None
+
+    # Steps are stored grouped by section, so group steps the same way to
+    # match them with their records.
+    step_sections = xdl_obj.step_sections()
+    steps = {section: [] for section in _SECTIONS}
+    for step in xdl_obj.steps:
+        steps[step_sections.get(step.uuid, 'no_section')].append(step)
+    steps = [step for section in _SECTIONS for step in steps[section]]
+
+    if len(steps) != len(body['steps']) or any(
+        step.name != step_record[0]
+        for step, (_, _, step_record) in zip(steps, body['steps'])
+    ):
+        return None
+
+    for step, (_, _, step_record) in zip(steps, body['steps']):
+        apply_step_record(
+            step, _apply_step_record_format(step_record), lazy=lazy)
+
+    return {
+        'hardware': Hardware([
+            Component(**properties) for properties in body['hardware']]),
+        'reagents': [
+            Reagent(**properties) for properties in body['reagents']],
+        'metadata': Metadata(**body['metadata']),
+        'procedure_attrs': {'graph_sha256': graph_hash},
+    }
+
+def _read_body(data: bytes) -> Dict[str, Any]:
+    """Check header of binary XDL and decode body.
+
+    Args:
+        data (bytes): Binary XDL.
+
+    Returns:
+        Dict[str, Any]: Decoded body of binary XDL.
+
+    Raises:
+        XDLInvalidBinaryError: If data is not binary XDL, or was written using
+            an unsupported version of the binary format.
+    """
+    if len(data) < _HEADER.size:
+        raise XDLInvalidBinaryError('Data too short.')
+    magic, format_version = _HEADER.unpack_from(data, 0)
+    if magic != XDLBIN_MAGIC:
+        raise XDLInvalidBinaryError('Data does not start with XDLBIN.')
+    if format_version != XDLBIN_FORMAT_VERSION:
+        raise XDLInvalidBinaryError(
+            f'Format version {format_version} is not supported. Supported'
+            f' version: {XDLBIN_FORMAT_VERSION}.')
+
+    try:
+        return _BinaryReader(data, _HEADER.size).read()
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise XDLInvalidBinaryError(f'Unable to decode data. {e}')
+
+def _step_from_record(
+    step_record: List,
+    step_type_dict: Dict[str, type],
+    keep_uuids: bool = True,
+) -> Step:
+    """Instantiate step from binary format record.
+
+    Args:
+        step_record (List): ``[name, properties, children, substeps]``
+        step_type_dict (Dict[str, type]): Dict of step names to step classes.
+        keep_uuids (bool): If ``True``, children are given the UUIDs in
+            record.
+
+    Returns:
+        Step: Step instantiated with properties and children in record.
+    """
+    name, properties, children, _ = step_record
+    if name not in step_type_dict:
+        raise XDLInvalidStepTypeError(name)
+    step_type = step_type_dict[name]
+    properties = dict(properties)
+    if children:
+        properties['children'] = []
+        for uuid, child_record in children:
+            child = _step_from_record(
+                child_record, step_type_dict, keep_uuids)
+            if keep_uuids:
+                child.uuid = uuid
+            properties['children'].append(child)
+    return step_type(**properties)
+
+def _apply_step_record_format(step_record: List) -> Tuple[str, Dict, List]:
+    """Convert binary format record to step record format used by
+    :py:func:`xdl.readwrite.xml_interpreter.apply_step_record`.
+
+    Args:
+        step_record (List): ``[name, properties, children, substeps]``
+
+    Returns:
+        Tuple[str, Dict, List]: ``(step_name, step_properties, substeps)``
+    """
+    name, properties, _, substeps = step_record
+    return (
+        name,
+        properties,
+        [_apply_step_record_format(substep) for substep in substeps]
+    )
+
+class _BinaryReader(object):
+    """Reads values in binary format from data starting at given offset."""
+
+    def __init__(self, data: bytes, offset: int = 0):
+        self._data = data
+        self._offset = offset
+        self._keys = []
+
+    def read(self) -> Any:
+        data = self._data
+        tag = data[self._offset]
+        self._offset += 1
+
+        # N
+        if tag == 78:
+            return None
+
+        # T
+        elif tag == 84:
+            return True
+
+        # F
+        elif tag == 70:
+            return False
+
+        # s
+        elif tag == 115:
+            return self._read_str()
+
+        # k
+        elif tag == 107:
+            return self._read_key()
+
+        # f
+        elif tag == 102:
+            value = _FLOAT64.unpack_from(data, self._offset)[0]
+            self._offset += 8
+            return value
+
+        # i
+        elif tag == 105:
+            value = _INT64.unpack_from(data, self._offset)[0]
+            self._offset += 8
+            return value
+
+        # l
+        elif tag == 108:
+            length = _UINT32.unpack_from(data, self._offset)[0]
+            self._offset += 4
+            return [self.read() for _ in range(length)]
+
+        # d
+        elif tag == 100:
+            length = _UINT32.unpack_from(data, self._offset)[0]
+            self._offset += 4
+            value = {}
+            for _ in range(length):
+                key = self._read_key()
+                value[key] = self.read()
+            return value
+
+        raise XDLInvalidBinaryError(
+            f'Unknown tag {chr(tag)!r} at byte {self._offset - 1}.')
+
+    def _read_str(self) -> str:
+        length = _UINT32.unpack_from(self._data, self._offset)[0]
+        start = self._offset + 4
+        self._offset = start + length
+        return self._data[start:self._offset].decode('utf8')
+
+    def _read_key(self) -> str:
+        index = _UINT16.unpack_from(self._data, self._offset)[0]
+        self._offset += 2
+        if index == _NEW_KEY:
+            key = self._read_str()
+            if len(self._keys) < _NEW_KEY:
+                self._keys.append(key)
+            return key
+        return self._keys[index]
@@ -78,3 +78,17 @@ class XDLJSONMissingPropertiesError(XDLInvalidJSONError):
     """Step missing "properties" object in XDL JSON."""
     def __str__(self):
         return 'XDL element must have "properties" object in XDL JSON.'
+
+##########
+# Binary #
+##########
+
+class XDLInvalidBinaryError(XDLReadError):
+    """Binary XDL supplied is invalid or was written with an unsupported
+    version of the binary format.
+    """
+    def __init__(self, msg):
+        self.msg = msg
+
+    def __str__(self):
+        return f'Invalid binary XDL: {self.msg}'
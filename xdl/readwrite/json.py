@@ -15,6 +15,7 @@ from .errors import (
     XDLJSONMissingStepNameError,
     XDLInvalidPropError,
 )
+from .parse_cache import load_cached
 from ..platforms import AbstractPlatform
 from ..reagents import Reagent
 from ..steps import Step
@@ -30,7 +31,8 @@ VALID_SECTIONS: List[str] = ['steps', 'reagents', 'hardware', 'metadata']
 def xdl_from_json_file(
         xdl_json_file: str, platform: AbstractPlatform) -> Dict[str, Any]:
     """Convert .json file with JSON XDL format to dict containing all
-    information necessary to initialise a XDL object.
+    information necessary to initialise a XDL object. If caches are enabled,
+    the parse cache is used (see :py:mod:`xdl.readwrite.parse_cache`).
 
     Args:
         xdl_json_file (str): Path to XDL JSON file.
@@ -42,9 +44,13 @@ def xdl_from_json_file(
         a XDL object. Format is the following:
         ``{ 'steps': steps, 'reagents': reagents, 'hardware': hardware }``
     """
-    with open(xdl_json_file) as fd:
-        xdl_json = json.load(fd)
-    return xdl_from_json(xdl_json, platform)
+    def parse():
+        with open(xdl_json_file) as fd:
+            xdl_json = json.load(fd)
+        return xdl_from_json(xdl_json, platform)
+
+    # Step UUIDs are stored in JSON files, so cached steps keep them too.
+    return load_cached(xdl_json_file, platform, parse, keep_uuids=True)
 
 def validate_xdl_json(xdl_json: Dict[str, Any]) -> None:
     """Validate XDL JSON Dict is correct format.
@@ -266,17 +272,10 @@ def xdl_to_json(
         Dict[str, Any]: XDL JSON dict produced from ``xdl_obj``.
     """
     xdl_steps_json = []
+    step_sections = xdl_obj.step_sections()
     for step in xdl_obj.steps:
         # Assign step section
-        section = 'no_section'
-        if step.uuid in xdl_obj.prep_steps:
-            section = 'prep'
-        elif step.uuid in xdl_obj.reaction_steps:
-            section = 'reaction'
-        elif step.uuid in xdl_obj.workup_steps:
-            section = 'workup'
-        elif step.uuid in xdl_obj.purification_steps:
-            section = 'purification'
+        section = step_sections.get(step.uuid, 'no_section')
 
         # Create step JSON object and apply section
         xdl_step_json = xdl_step_to_json(step, full_properties)
@@ -0,0 +1,85 @@
+"""Content addressed on-disk cache of parsed XDL files.
+
+If caches are enabled (see :py:mod:`xdl.utils.cache`), the objects parsed
+from a file are stored in the binary XDL format, keyed by the hash of the file
+contents, the XDL version and the fingerprint of the platform. Loading the
+same file again, from any process, then skips parsing and validating the file.
+"""
+from typing import Any, Callable, Dict
+
+from .binary import objs_to_binary, xdl_from_binary, XDLBIN_FORMAT_VERSION
+from .errors import XDLReadError
+from ..constants import XDL_VERSION
+from ..utils.cache import cache_enabled, get_cache, hash_key
+
+# For type annotations
+if False:
+    from ..platforms import AbstractPlatform
+
+#: Name of parse cache folder in cache directory.
+PARSE_CACHE_NAME: str = 'parse'
+
+def parse_cache_key(file_contents: bytes, platform: 'AbstractPlatform') -> str:
+    """Return parse cache key for file.
+
+    Args:
+        file_contents (bytes): Contents of XDL file.
+        platform (AbstractPlatform): Platform file is loaded with.
+
+    Returns:
+        str: Parse cache key.
+    """
+    return hash_key(
+        file_contents,
+        XDL_VERSION,
+        XDLBIN_FORMAT_VERSION,
+        platform.fingerprint,
+    )
+
+def load_cached(
+    xdl_file: str,
+    platform: 'AbstractPlatform',
+    parse: Callable[[], Dict[str, Any]],
+    lazy: bool = False,
+    keep_uuids: bool = False,
+) -> Dict[str, Any]:
+    """Return parsed objects of XDL file from parse cache, falling back to
+    parsing the file if it is not in the cache, or caches are disabled.
+
+    Args:
+        xdl_file (str): Path to XDL file.
+        platform (AbstractPlatform): Platform to load file with.
+        parse (Callable[[], Dict[str, Any]]): Function that parses the file,
+            returning a dict in the form returned by
+            :py:func:`xdl.readwrite.parse_xdl_tree`.
+        lazy (bool): Passed to :py:func:`xdl.readwrite.xdl_from_binary` if
+            file is loaded from cache.
+        keep_uuids (bool): Passed to :py:func:`xdl.readwrite.xdl_from_binary`
+            if file is loaded from cache. Should only be ``True`` if parsing
+            the file gives steps the UUIDs stored in the file, so that
+            separately loaded procedures don't share step UUIDs.
+
+    Returns:
+        Dict[str, Any]: Dict in the form returned by
+        :py:func:`xdl.readwrite.parse_xdl_tree`.
+    """
+    if not cache_enabled():
+        return parse()
+
+    with open(xdl_file, 'rb') as fd:
+        key = parse_cache_key(fd.read(), platform)
+
+    cache = get_cache(PARSE_CACHE_NAME)
+    data = cache.get(key)
+    if data is not None:
+        try:
+            return xdl_from_binary(
+                data, platform, lazy=lazy, keep_uuids=keep_uuids)
+
+        # Entry is corrupt, remove it and parse file.
+        except XDLReadError:
+            cache.delete(key)
+
+    parsed_xdl = parse()
+    cache.set(key, objs_to_binary(parsed_xdl))
+    return parsed_xdl
@@ -1,9 +1,11 @@
 from typing import List
+import copy
 from lxml import etree
 from ..reagents import Reagent
 from ..hardware import Hardware
 from ..metadata import Metadata
 from ..steps import Step
+from ..steps.utils import RepeatSequence
 from ..constants import XDL_VERSION
 from ..utils.misc import format_property
 from ..utils.sanitisation import convert_val_to_std_units
@@ -176,7 +178,9 @@ def _append_procedure_tree(
     procedure_tree = etree.Element('Procedure')
     prep_tree, reaction_tree, workup_tree, purification_tree =\
         None, None, None, None
+    step_sections = xdl_obj.step_sections()
     for step in xdl_obj.steps:
+        section = step_sections.get(step.uuid, None)
         # XDLEXE, don't worry about procedure sections.
         if full_tree:
             procedure_tree.append(_get_step_tree(
@@ -184,7 +188,7 @@ def _append_procedure_tree(
         # Just XDL, generate with procedure sections
         else:
             # Prep steps
-            if step.uuid in xdl_obj.prep_steps:
+            if section == 'prep':
                 if prep_tree is None:
                     prep_tree = etree.Element('Prep')
                 prep_tree.append(_get_step_tree(
@@ -192,7 +196,7 @@ def _append_procedure_tree(
                 ))
 
             # Reaction steps
-            elif step.uuid in xdl_obj.reaction_steps:
+            elif section == 'reaction':
                 if reaction_tree is None:
                     reaction_tree = etree.Element('Reaction')
                 reaction_tree.append(_get_step_tree(
@@ -200,7 +204,7 @@ def _append_procedure_tree(
                 ))
 
             # Workup steps
-            elif step.uuid in xdl_obj.workup_steps:
+            elif section == 'workup':
                 if workup_tree is None:
                     workup_tree = etree.Element('Workup')
                 workup_tree.append(_get_step_tree(
@@ -208,7 +212,7 @@ def _append_procedure_tree(
                 ))
 
             # Purification steps
-            elif step.uuid in xdl_obj.purification_steps:
+            elif section == 'purification':
                 if purification_tree is None:
                     purification_tree = etree.Element('Purification')
                 purification_tree.append(_get_step_tree(
@@ -263,26 +267,50 @@ def _get_step_tree(
         # just raw steps
         if children:
             children_steps_tree = etree.Element('Steps')
-            for substep in step.steps:
-                children_steps_tree.append(
-                    _get_step_tree(
-                        substep,
-                        full_properties=full_properties,
-                        full_tree=full_tree
-                    )
-                )
+            for substep_tree in _get_substep_trees(
+                    step, full_properties=full_properties):
+                children_steps_tree.append(substep_tree)
             step_tree.append(children_steps_tree)
         else:
-            for substep in step.steps:
-                step_tree.append(
-                    _get_step_tree(
-                        substep,
-                        full_properties=full_properties,
-                        full_tree=full_tree,
-                    )
-                )
+            for substep_tree in _get_substep_trees(
+                    step, full_properties=full_properties):
+                step_tree.append(substep_tree)
     return step_tree
 
+def _get_substep_trees(
+    step: Step,
+    full_properties: bool = False,
+) -> List[etree.Element]:
+    """Get full XML trees of substeps of given step. If substeps are a
+    ``RepeatSequence``, trees of the repeated children are only generated once
+    and then copied.
+
+    Args:
+        step (Step): Step to generate substep XML trees for.
+        full_properties (bool): If ``True``, all properties will be written.
+
+    Returns:
+        List[etree.Element]: XML trees of substeps.
+    """
+    steps = step.steps
+    if isinstance(steps, RepeatSequence):
+        child_trees = [
+            _get_step_tree(
+                substep, full_properties=full_properties, full_tree=True)
+            for substep in steps.children
+        ]
+        # Elements can only have one parent, so each repeat needs a copy.
+        return [
+            tree if i == 0 else copy.deepcopy(tree)
+            for i in range(steps.repeats)
+            for tree in child_trees
+        ]
+    return [
+        _get_step_tree(
+            substep, full_properties=full_properties, full_tree=True)
+        for substep in steps
+    ]
+
 def _add_step_property(
     step_tree: etree.Element,
     step: Step,
@@ -1,39 +1,166 @@
-from typing import Dict, List, Any, Tuple
+import os
+import functools
+from typing import Dict, List, Any, Tuple, Union
 from lxml import etree
 from .validation import check_attrs_are_valid
-from .utils import read_file
 from ..constants import SYNTHESIS_ATTRS
 from ..errors import XDLError
-from ..steps import Step, AbstractBaseStep
+from ..steps import Step, AbstractStep, AbstractBaseStep
 from ..reagents import Reagent
 from ..hardware import Hardware, Component
 from ..metadata import Metadata
+from ..utils.logging import get_logger
 
 # For type annotations
 if False:
     from ..platforms import AbstractPlatform
 
+#: Procedure section tags mapped to keys of steps dict returned by parser.
+PROCEDURE_SECTION_TAGS = {
+    'Prep': 'prep',
+    'Reaction': 'reaction',
+    'Workup': 'workup',
+    'Purification': 'purification',
+}
+
 def xdl_file_to_objs(
     xdl_file: str,
     platform: 'AbstractPlatform',
+    lazy: bool = False,
 ) -> Dict[str, Any]:
     """Given XDL file return steps, hardware and reagents.
 
+    The file is parsed incrementally with ``etree.iterparse``. Each top level
+    step is instantiated as soon as its closing tag has been read, and its XML
+    elements are then freed, so peak memory during loading is bounded by the
+    largest top level step rather than by the size of the whole file. This
+    matters for xdlexe files which contain the full step tree.
+
     Args:
         xdl_file (str): Path to XDL file.
         platform (AbstractPlatform): Platform to use when constructing step
             objects from XDL file.
+        lazy (bool): If ``True`` and file is xdlexe, the step record of
+            substeps is only applied when substeps are first accessed. See
+            :py:func:`apply_step_record`.
 
     Returns:
         Dict[str, Any]: All information necessary to initialise XDL object in
         form ``{ 'steps': steps, 'hardware': hardware, 'reagents': reagents }``
     """
-    xdlstr = read_file(xdl_file)
-    return xdl_str_to_objs(xdl_str=xdlstr, platform=platform)
+    if not os.path.getsize(xdl_file):
+        raise XDLError('Empty XDL given.')
+
+    try:
+        return _iterparse_xdl_file(xdl_file, platform, lazy=lazy)
+
+    except etree.XMLSyntaxError as e:
+        # Fall back to ISO-8859-1 in case file was not saved as UTF-8, as in
+        # read_file.
+        logger = get_logger()
+        logger.debug('Unable to parse file using UTF-8.\
+ Falling back to ISO-8859-1')
+        try:
+            return _iterparse_xdl_file(
+                xdl_file, platform, lazy=lazy, encoding='iso-8859-1')
+        except etree.XMLSyntaxError:
+            raise e
+
+def _iterparse_xdl_file(
+    xdl_file: str,
+    platform: 'AbstractPlatform',
+    lazy: bool = False,
+    encoding: str = None,
+) -> Dict[str, Any]:
+    """Incrementally parse XDL file, instantiating top level steps as soon as
+    they have been read and freeing their XML elements afterwards. See
+    :py:func:`xdl_file_to_objs`.
+
+    Args:
+        xdl_file (str): Path to XDL file.
+        platform (AbstractPlatform): Platform to use when constructing step
+            objects from XDL file.
+        lazy (bool): See :py:func:`xdl_file_to_objs`.
+        encoding (str): Encoding to override the encoding of the file with.
+            If ``None``, encoding declared in file is used, or UTF-8 if no
+            encoding is declared.
+
+    Returns:
+        Dict[str, Any]: Same as :py:func:`parse_xdl_tree`.
+    """
+    steps = _empty_steps()
+    components, reagents, metadata = [], [], None
+    synthesis_attrs = {}
+    is_xdlexe = False
+
+    # Depth of current element, <Synthesis> is at depth 1.
+    depth = 0
+    # Tag of current child of <Synthesis> and current procedure section.
+    synthesis_child, section = None, None
+    for event, element in etree.iterparse(
+            xdl_file, events=('start', 'end'), encoding=encoding):
+
+        if event == 'start':
+            depth += 1
+            if depth == 1:
+                synthesis_attrs = _synthesis_attrs_from_element(element)
+                is_xdlexe = 'graph_sha256' in synthesis_attrs
+            elif depth == 2:
+                synthesis_child = element.tag
+            elif depth == 3 and synthesis_child == 'Procedure':
+                section = PROCEDURE_SECTION_TAGS.get(element.tag)
+            continue
+
+        depth -= 1
+        # Finished reading <Synthesis>, nothing left to do.
+        if depth == 0:
+            continue
+
+        # Finished reading child of <Synthesis>
+        elif depth == 1:
+            if element.tag == 'Hardware':
+                components.extend(_components_from_hardware_element(element))
+
+            elif element.tag == 'Reagents':
+                reagents.extend(_reagents_from_reagents_element(element))
+
+            elif element.tag == 'Metadata' and metadata is None:
+                metadata = Metadata(**element.attrib)
+
+        else:
+            # Depth of top level steps, deeper if inside procedure section
+            step_depth = 3 if section else 2
+
+            # Inside element that is still being read, wait until it has been
+            # read completely before using or freeing it.
+            if synthesis_child != 'Procedure' or depth > step_depth:
+                continue
+
+            # Finished reading top level step
+            elif depth == step_depth:
+                step = xdl_to_step(element, platform.step_library)
+                if is_xdlexe:
+                    apply_step_record(
+                        step, get_single_step_record(element), lazy=lazy)
+                steps[section or 'no_section'].append(step)
+
+        # Free element and all previously processed siblings.
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+    return {
+        'steps': steps,
+        'hardware': Hardware(components),
+        'reagents': reagents,
+        'metadata': metadata if metadata is not None else Metadata(),
+        'procedure_attrs': synthesis_attrs,
+    }
 
 def xdl_str_to_objs(
     xdl_str: str,
     platform: 'AbstractPlatform',
+    lazy: bool = False,
 ) -> Dict[str, Any]:
     """Given XDL str return steps, hardware and reagents.
 
@@ -41,37 +168,94 @@ def xdl_str_to_objs(
         xdl_str (str): XDL XML string.
         platform (AbstractPlatform): Platform to use when constructing step
             objects from XDL file.
+        lazy (bool): See :py:func:`xdl_file_to_objs`.
 
     Returns:
         Dict[str, Any]: All information necessary to initialise XDL object in
         form ``{ 'steps': steps, 'hardware': hardware, 'reagents': reagents }``
     """
     if xdl_str:
-        steps, step_record = steps_from_xdl(xdl_str, platform)
-        hardware = hardware_from_xdl(xdl_str)
-        reagents = reagents_from_xdl(xdl_str)
-        metadata = metadata_from_xdl(xdl_str)
-        synthesis_attrs = synthesis_attrs_from_xdl(xdl_str)
-
-        # Loading xdlexe if graph_sha256 in synthesis_attrs
-        if 'graph_sha256' in synthesis_attrs:
-            assert len(steps['no_section']) == len(step_record)
-            for i, step in enumerate(steps['no_section']):
-                apply_step_record(step, step_record[i])
-
-        parsed_xdl = {
-            'steps': steps,
-            'hardware': hardware,
-            'reagents': reagents,
-            'metadata': metadata,
-        }
-        parsed_xdl['procedure_attrs'] = synthesis_attrs
-        return parsed_xdl
+        return parse_xdl_tree(
+            etree.fromstring(xdl_str), platform, lazy=lazy)
     else:
         raise XDLError('Empty XDL given.')
     return None
 
-def apply_step_record(step: Step, step_record_step: Tuple[str, Dict]):
+def parse_xdl_tree(
+    xdl_tree: Union[etree._Element, etree._ElementTree],
+    platform: 'AbstractPlatform',
+    lazy: bool = False,
+) -> Dict[str, Any]:
+    """Given already parsed XDL XML tree return steps, hardware, reagents,
+    metadata and procedure attrs. Every section is extracted in a single walk
+    over the children of the ``<Synthesis>`` element, so the XML only needs to
+    be parsed once.
+
+    Args:
+        xdl_tree (Union[etree._Element, etree._ElementTree]): Parsed XDL tree.
+            Either the ``<Synthesis>`` element or the element tree containing
+            it, e.g. as returned by ``etree.parse``.
+        platform (AbstractPlatform): Platform to use when constructing step
+            objects from XDL tree.
+        lazy (bool): See :py:func:`xdl_file_to_objs`.
+
+    Returns:
+        Dict[str, Any]: All information necessary to initialise XDL object in
+        form ``{ 'steps': steps, 'hardware': hardware, 'reagents': reagents,
+        'metadata': metadata, 'procedure_attrs': procedure_attrs }``
+    """
+    if isinstance(xdl_tree, etree._ElementTree):
+        xdl_tree = xdl_tree.getroot()
+
+    steps, step_record = _empty_steps(), []
+    components, reagents, metadata = [], [], None
+    for element in xdl_tree.findall('*'):
+        if element.tag == 'Procedure':
+            steps, step_record = _steps_from_procedure_element(
+                element, platform)
+
+        elif element.tag == 'Hardware':
+            components.extend(_components_from_hardware_element(element))
+
+        elif element.tag == 'Reagents':
+            reagents.extend(_reagents_from_reagents_element(element))
+
+        elif element.tag == 'Metadata' and metadata is None:
+            metadata = Metadata(**element.attrib)
+
+    synthesis_attrs = _synthesis_attrs_from_element(xdl_tree)
+
+    # Loading xdlexe if graph_sha256 in synthesis_attrs
+    if 'graph_sha256' in synthesis_attrs:
+        assert len(steps['no_section']) == len(step_record)
+        for i, step in enumerate(steps['no_section']):
+            apply_step_record(step, step_record[i], lazy=lazy)
+
+    return {
+        'steps': steps,
+        'hardware': Hardware(components),
+        'reagents': reagents,
+        'metadata': metadata if metadata is not None else Metadata(),
+        'procedure_attrs': synthesis_attrs,
+    }
+
+def apply_step_record(
+    step: Step,
+    step_record_step: Tuple[str, Dict, List],
+    lazy: bool = False
+):
+    """Apply step record of xdlexe to step and all its substeps, recursively.
+
+    Args:
+        step (Step): Step to apply step record to.
+        step_record_step (Tuple[str, Dict, List]): Step record in the form
+            ``(step_name, step_properties, substeps)``.
+        lazy (bool): If ``True``, only properties of ``step`` itself are
+            applied and the step record of its substeps is kept on the step,
+            to be applied the first time :py:attr:`AbstractStep.steps` is
+            accessed. Not done for steps with children, e.g. ``Repeat``, as
+            the children can be accessed directly.
+    """
     assert step.name == step_record_step[0]
     for prop in step.properties:
         # Comments don't need to be applied to step record. No point adding
@@ -87,14 +271,41 @@ older version of XDL. Regenerate the XDLEXE file using the latest\
 version of XDL.")
             step.properties[prop] = step_record_step[1][prop]
     step.update()
-    if not isinstance(step, AbstractBaseStep):
-        try:
-            assert len(step.steps) == len(step_record_step[2])
-        except AssertionError:
-            raise AssertionError(f'{step.steps}\n\n{step_record_step[2]}\
- {len(step.steps)} {len(step_record_step[2])}')
-        for j, substep in enumerate(step.steps):
-            apply_step_record(substep, step_record_step[2][j])
+    # Step properties are now the compiled properties in the step record.
+    step.mark_compiled()
+    # Children are accessible without going through step.steps, so their
+    # properties can't be deferred.
+    if (lazy and isinstance(step, AbstractStep)
+            and 'children' not in step.properties):
+        step.defer_substeps_update(functools.partial(
+            apply_substep_records,
+            substep_records=step_record_step[2],
+            lazy=True
+        ))
+
+    elif not isinstance(step, AbstractBaseStep):
+        apply_substep_records(step, step_record_step[2], lazy=lazy)
+
+def apply_substep_records(
+    step: Step,
+    substep_records: List[Tuple[str, Dict, List]],
+    lazy: bool = False
+):
+    """Apply step records of xdlexe to substeps of step.
+
+    Args:
+        step (Step): Step to apply step records to substeps of.
+        substep_records (List[Tuple[str, Dict, List]]): Step records of
+            substeps in the form ``[(step_name, step_properties, substeps)...]``
+        lazy (bool): Passed on to :py:func:`apply_step_record`.
+    """
+    try:
+        assert len(step.steps) == len(substep_records)
+    except AssertionError:
+        raise AssertionError(f'{step.steps}\n\n{substep_records}\
+ {len(step.steps)} {len(substep_records)}')
+    for j, substep in enumerate(step.steps):
+        apply_step_record(substep, substep_records[j], lazy=lazy)
 
 def synthesis_attrs_from_xdl(xdl_str: str) -> Dict[str, Any]:
     """Return attrs from ``<Synthesis>`` tag. This used to do more but now only
@@ -107,7 +318,19 @@ def synthesis_attrs_from_xdl(xdl_str: str) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Attr dict from ``<Synthesis>`` tag.
     """
-    raw_attr = etree.fromstring(xdl_str).attrib
+    return _synthesis_attrs_from_element(etree.fromstring(xdl_str))
+
+def _synthesis_attrs_from_element(
+        synthesis_element: etree._Element) -> Dict[str, Any]:
+    """Return attrs from ``<Synthesis>`` element.
+
+    Arguments:
+        synthesis_element (etree._Element): ``<Synthesis>`` lxml element.
+
+    Returns:
+        Dict[str, Any]: Attr dict from ``<Synthesis>`` tag.
+    """
+    raw_attr = synthesis_element.attrib
     processed_attr = {}
     for attr in SYNTHESIS_ATTRS:
         if attr['name'] in raw_attr:
@@ -141,41 +364,51 @@ def steps_from_xdl(xdl_str: str, platform: 'AbstractPlatform') -> List[Step]:
         List[Step]: List of Step objects corresponding to procedure described
         in ``xdl_str``.
     """
-    steps = {
+    steps, step_record = _empty_steps(), []
+    xdl_tree = etree.fromstring(xdl_str)
+    for element in xdl_tree.findall('*'):
+        if element.tag == 'Procedure':
+            steps, step_record = _steps_from_procedure_element(
+                element, platform)
+    return steps, step_record
+
+def _empty_steps() -> Dict[str, List[Step]]:
+    """Return empty steps dict with a list for every procedure section."""
+    return {
         'no_section': [],
         'prep': [],
         'reaction': [],
         'workup': [],
         'purification': [],
     }
-    xdl_tree = etree.fromstring(xdl_str)
-    for element in xdl_tree.findall('*'):
-        if element.tag == 'Procedure':
-            step_record = get_full_step_record(element)
-            for child in element.findall('*'):
-                if child.tag == 'Prep':
-                    for step in child.findall('*'):
-                        steps['prep'].append(
-                            xdl_to_step(step, platform.step_library))
-
-                elif child.tag == 'Reaction':
-                    for step in child.findall('*'):
-                        steps['reaction'].append(
-                            xdl_to_step(step, platform.step_library))
-
-                elif child.tag == 'Workup':
-                    for step in child.findall('*'):
-                        steps['workup'].append(
-                            xdl_to_step(step, platform.step_library))
-
-                elif child.tag == 'Purification':
-                    for step in child.findall('*'):
-                        steps['purification'].append(
-                            xdl_to_step(step, platform.step_library))
-
-                else:
-                    steps['no_section'].append(
-                        xdl_to_step(child, platform.step_library))
+
+def _steps_from_procedure_element(
+    procedure_element: etree._Element,
+    platform: 'AbstractPlatform'
+) -> Tuple[Dict[str, List[Step]], List[Tuple]]:
+    """Given ``<Procedure>`` element return steps dict and step record.
+
+    Arguments:
+        procedure_element (etree._Element): ``<Procedure>`` lxml element.
+        platform (AbstractPlatform): Platform to use when constructing step
+            objects.
+
+    Returns:
+        Tuple[Dict[str, List[Step]], List[Tuple]]: Steps dict with keys
+        'no_section', 'prep', 'reaction', 'workup' and 'purification', and
+        full step record of procedure.
+    """
+    steps = _empty_steps()
+    step_record = get_full_step_record(procedure_element)
+    for child in procedure_element.findall('*'):
+        section = PROCEDURE_SECTION_TAGS.get(child.tag)
+        if section:
+            for step in child.findall('*'):
+                steps[section].append(
+                    xdl_to_step(step, platform.step_library))
+        else:
+            steps['no_section'].append(
+                xdl_to_step(child, platform.step_library))
     return steps, step_record
 
 def get_base_steps(step: etree._Element) -> List[AbstractBaseStep]:
@@ -219,10 +452,25 @@ def components_from_xdl(xdl_str: str) -> List[Component]:
     xdl_tree = etree.fromstring(xdl_str)
     for element in xdl_tree.findall('*'):
         if element.tag == 'Hardware':
-            for component_xdl in element.findall('*'):
-                components.append(xdl_to_component(component_xdl))
+            components.extend(_components_from_hardware_element(element))
     return components
 
+def _components_from_hardware_element(
+        hardware_element: etree._Element) -> List[Component]:
+    """Given ``<Hardware>`` element return list of Component objects.
+
+    Arguments:
+        hardware_element (etree._Element): ``<Hardware>`` lxml element.
+
+    Returns:
+        List[Component]: List of Component objects corresponding to
+        components in ``hardware_element``.
+    """
+    return [
+        xdl_to_component(component_xdl)
+        for component_xdl in hardware_element.findall('*')
+    ]
+
 def reagents_from_xdl(xdl_str: str) -> List[Reagent]:
     """Given XDL str return list of Reagent objects.
 
@@ -237,10 +485,25 @@ def reagents_from_xdl(xdl_str: str) -> List[Reagent]:
     xdl_tree = etree.fromstring(xdl_str)
     for element in xdl_tree.findall('*'):
         if element.tag == 'Reagents':
-            for reagent_xdl in element.findall('*'):
-                reagents.append(xdl_to_reagent(reagent_xdl))
+            reagents.extend(_reagents_from_reagents_element(element))
     return reagents
 
+def _reagents_from_reagents_element(
+        reagents_element: etree._Element) -> List[Reagent]:
+    """Given ``<Reagents>`` element return list of Reagent objects.
+
+    Arguments:
+        reagents_element (etree._Element): ``<Reagents>`` lxml element.
+
+    Returns:
+        List[Reagent]: List of Reagent objects corresponding to reagents in
+        ``reagents_element``.
+    """
+    return [
+        xdl_to_reagent(reagent_xdl)
+        for reagent_xdl in reagents_element.findall('*')
+    ]
+
 def xdl_to_step(
     xdl_step_element: etree._Element,
     step_type_dict: Dict[str, type]
@@ -387,4 +650,4 @@ def get_single_step_record(
     else:
         for step in step_element.findall('*'):
             children.append(get_single_step_record(step))
-    return (step_element.tag, step_element.attrib, children)
+    return (step_element.tag, dict(step_element.attrib), children)
@@ -91,6 +91,10 @@ class AbstractAsyncStep(Step):
         """
         self._should_end = True
 
+    def _analysis_substeps(self) -> List[Step]:
+        """Durations and reagents consumed are calculated from children."""
+        return self.properties.get('children', None) or []
+
     def reagents_consumed(self, graph: MultiDiGraph) -> Dict[str, float]:
         """Return dictionary of reagents and volumes consumed in mL like this:
         ``{ reagent: volume... }``. Can be overridden otherwise just recursively
@@ -107,7 +111,7 @@ class AbstractAsyncStep(Step):
         reagents_consumed = {}
         # Get reagents consumed from children (Async step)
         for substep in self.children:
-            step_reagents_consumed = substep.reagents_consumed(graph)
+            step_reagents_consumed = substep.cached_reagents_consumed(graph)
             for reagent, volume in step_reagents_consumed.items():
                 if reagent in reagents_consumed:
                     reagents_consumed[reagent] += volume
@@ -126,5 +130,5 @@ class AbstractAsyncStep(Step):
         """
         duration = FTNDuration(0, 0, 0)
         for step in self.children:
-            duration += step.duration(graph)
+            duration += step.cached_duration(graph)
         return duration
@@ -20,6 +20,12 @@ class AbstractBaseStep(Step, ABC):
         super().__init__(param_dict)
         self.steps = []
 
+    def _clone(self, keep_uuid: bool, memo: Dict[int, Step]) -> Step:
+        """Base steps have no substeps, so are copied directly."""
+        copied = self._clone_state(keep_uuid, memo)
+        copied.steps = []
+        return copied
+
     @abstractmethod
     def execute(self, platform_controller) -> bool:
         """Execute method to be overridden for all base steps. Take platform
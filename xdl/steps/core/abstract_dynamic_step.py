@@ -1,5 +1,5 @@
 # Std
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 import copy
 from abc import abstractmethod
@@ -38,6 +38,10 @@ class AbstractDynamicStep(Step):
         param_dict (Dict[str, Any]): Step properties dict to initialize step
             with.
     """
+
+    # Dynamic steps are prepared for execution by the executor.
+    GRAPH_READ_ONLY = False
+
     def __init__(self, param_dict: Dict[str, Any]) -> None:
         super().__init__(param_dict)
         self.state = {}
@@ -49,6 +53,20 @@ class AbstractDynamicStep(Step):
         self.start_block = None
         self.started = False
 
+    @property
+    def start_block(self) -> Optional[List[Step]]:
+        """Steps executed once at start of step, returned by
+        :py:meth:`on_start`. ``None`` until step is prepared for execution.
+        Durations and reagents consumed are calculated from start block, so
+        cached analyses are cleared when it is assigned.
+        """
+        return self._start_block
+
+    @start_block.setter
+    def start_block(self, start_block: Optional[List[Step]]) -> None:
+        self._start_block = start_block
+        self._clear_caches()
+
     @abstractmethod
     def on_start(self) -> List[Step]:
         """Returns list of steps to be executed once at start of step.
@@ -309,6 +327,10 @@ class AbstractDynamicStep(Step):
         """
         return []
 
+    def _analysis_substeps(self) -> List[Step]:
+        """Durations and reagents consumed are calculated from start block."""
+        return self.start_block or []
+
     def reagents_consumed(self, graph: MultiDiGraph) -> Dict[str, float]:
         """Return dictionary of reagents and volumes consumed in mL like this:
         ``{ reagent: volume... }``. Can be overridden otherwise just recursively
@@ -324,7 +346,7 @@ class AbstractDynamicStep(Step):
         """
         reagents_consumed = {}
         for substep in self.start_block:
-            step_reagents_consumed = substep.reagents_consumed(graph)
+            step_reagents_consumed = substep.cached_reagents_consumed(graph)
             for reagent, volume in step_reagents_consumed.items():
                 if reagent in reagents_consumed:
                     reagents_consumed[reagent] += volume
@@ -340,5 +362,5 @@ class AbstractDynamicStep(Step):
         """
         duration = FTNDuration(0, 0, 0)
         for step in self.start_block:
-            duration += step.duration(graph)
+            duration += step.cached_duration(graph)
         return duration
@@ -1,5 +1,5 @@
 # Std
-from typing import List, Dict, Any, Iterator
+from typing import List, Dict, Any, Iterator, Callable, Tuple
 import logging
 import copy
 from abc import ABC, abstractmethod
@@ -12,8 +12,9 @@ import termcolor
 from .step import Step
 from .abstract_base_step import AbstractBaseStep
 from ..logging import start_executing_step_msg, finished_executing_step_msg
-from ..utils import pretty_props_table, FTNDuration
+from ..utils import pretty_props_table, FTNDuration, RepeatSequence
 from ...utils.logging import get_logger, log_duration
+from ...utils.xdl_base import same_objects
 
 
 def get_base_steps(step: Step) -> List[AbstractBaseStep]:
@@ -27,8 +28,24 @@ def get_base_steps(step: Step) -> List[AbstractBaseStep]:
     Returns:
         List[AbstractBaseStep]: List of step's base steps.
     """
+    return _get_substeps_base_steps(step.steps)
+
+def _get_substeps_base_steps(steps: List[Step]) -> List[AbstractBaseStep]:
+    """Return list of base steps of given substeps. If substeps are a
+    ``RepeatSequence`` the base steps of the repeated children are only found
+    once.
+
+    Args:
+        steps (List[Step]): Substeps to get base steps from.
+
+    Returns:
+        List[AbstractBaseStep]: List of substeps' base steps.
+    """
+    if isinstance(steps, RepeatSequence):
+        return _get_substeps_base_steps(steps.children) * steps.repeats
+
     base_steps = []
-    for step in step.steps:
+    for step in steps:
         if isinstance(step, AbstractBaseStep):
             base_steps.append(step)
         else:
@@ -51,25 +68,35 @@ class AbstractStep(Step, ABC):
 
     _steps = []
 
+    # Value of _properties_version and children when _steps was last generated.
+    # See steps.
+    _steps_version: int = None
+    _steps_children: List[Step] = None
+
+    # Deferred update of substeps and properties version of step at the time
+    # update was deferred. See defer_substeps_update.
+    _deferred_substeps_update: Tuple[
+        Callable[['AbstractStep'], None], int] = None
+
     def __init__(self, param_dict: Dict[str, Any]) -> None:
         super().__init__(param_dict)
 
-        # Initialise internal steps list and properties associated with this
-        # steps list.
-        self._steps = self.get_steps()
-        self._last_props = self._copy_props()
+        # Internal steps list is only generated when first asked for, so that
+        # substeps of steps that are never inspected or executed are never
+        # built.
+        self._steps = []
 
     @property
     def steps(self):
         """The internal steps list is calculated only when it is asked for, and
-        only when ``self.properties`` different to the last time steps was asked
-        for. This is for performance reasons since during
+        only when ``self.properties`` have changed since the last time steps
+        was asked for. This is for performance reasons since during
         ``prepare_for_execution`` the amount of updates to ``self.properties``
         is pretty large.
 
         ::
 
-            # steps updated
+            # steps not updated until first asked for
             step = Step(**props)
 
             # self.properties updated but steps not updated
@@ -81,44 +108,80 @@ class AbstractStep(Step, ABC):
             # steps not updated and returned, since properties haven't change
             # since last steps update
             print(step.steps)
+
+        Properties are tracked as changed when they are set as attributes, or
+        when :py:meth:`update` is called after editing ``self.properties``
+        directly, so editing ``self.properties`` or property values in place
+        without calling :py:meth:`update` doesn't regenerate steps. The one
+        exception is the list of child steps of steps with a ``children``
+        property, which is also checked for steps being added, removed or
+        replaced.
         """
         # Only update self._steps if self.properties has changed.
-        #
-        # Optimization note: This may seem long winded compared to
-        # self.properties != self._last_props but in Python 3.7 at least this is
-        # faster.
-        should_update = False
-        for k, v in self.properties.items():
-            if self._last_props[k] != v:
-                should_update = True
-                break
-
-        # If self.properties has changed, update self._steps
-        if should_update:
+        if (self._steps_version != self._properties_version
+                or self._children_changed()):
             self._steps = self.get_steps()
-            self._last_props = self._copy_props()
+            self._steps_version = self._properties_version
+            self._steps_children = self._get_children()
+
+        # Apply deferred update to substeps, unless properties have changed
+        # since the update was deferred in which case substeps have been
+        # regenerated and the update no longer applies.
+        if self._deferred_substeps_update is not None:
+            update, properties_version = self._deferred_substeps_update
+            self._deferred_substeps_update = None
+            if properties_version == self._properties_version:
+                update(self)
 
         return self._steps
 
-    def _copy_props(self) -> Dict[str, Any]:
-        """Return deep copy of ``self.properties`` for use when deciding whether
-        to use cached :py:attr:`_steps` or not.
+    def _clone(self, keep_uuid: bool, memo: Dict[int, Step]) -> Step:
+        """Copy step directly, including substeps if they are up to date so
+        they don't need to be generated again. See :py:meth:`Step.clone`.
+        """
+        copied = self._clone_state(keep_uuid, memo)
+        if self._steps_version != self._properties_version:
+            copied._steps = []
+            return copied
+
+        if self._steps_children is not None:
+            copied._steps_children = [
+                child.clone(keep_uuid, memo) for child in self._steps_children]
+
+        steps = self._steps
+        if isinstance(steps, RepeatSequence):
+            copied._steps = RepeatSequence(
+                [step.clone(keep_uuid, memo) for step in steps.children],
+                steps.repeats
+            )
+        else:
+            copied._steps = [step.clone(keep_uuid, memo) for step in steps]
+        return copied
 
-        Returns:
-            Dict[str, Any]: Deep copy of ``self.properties`` for use when
-                deciding whether to use cached :py:attr:`_steps` or not.
+    def _children_changed(self) -> bool:
+        """Return ``True`` if steps have been added to, removed from or
+        replaced in list of child steps since :py:attr:`steps` was last
+        generated.
         """
-        copy_props = {}
-        for k, v in self.properties.items():
-            # Don't copy callable. For example, if this is a class method,
-            # copying will copy the entire object, meaning that any comparison
-            # with the previous method will show them to be unequal, even if
-            # the method hasn't actually changed.
-            if callable(v):
-                copy_props[k] = v
-            else:
-                copy_props[k] = copy.deepcopy(v)
-        return copy_props
+        if self._steps_children is None:
+            return False
+        children = self._get_children()
+        return children is None or not same_objects(
+            children, self._steps_children)
+
+    def defer_substeps_update(
+            self, update: Callable[['AbstractStep'], None]) -> None:
+        """Defer update of substeps until :py:attr:`steps` is first accessed.
+        Used when loading xdlexe files lazily, so that the step record of the
+        substeps is only applied if the substeps are actually needed. If
+        properties of the step are changed before :py:attr:`steps` is
+        accessed, the substeps are regenerated and the update is discarded.
+
+        Args:
+            update (Callable[[AbstractStep], None]): Function taking this step
+                as its only argument and updating its substeps.
+        """
+        self._deferred_substeps_update = (update, self._properties_version)
 
     @abstractmethod
     def get_steps(self) -> List[Step]:
@@ -322,13 +385,7 @@ class AbstractStep(Step, ABC):
         Returns:
             List[AbstractBaseStep]: Step's base steps.
         """
-        base_steps = []
-        for step in self.steps:
-            if isinstance(step, AbstractBaseStep):
-                base_steps.append(step)
-            else:
-                base_steps.extend(get_base_steps(step))
-        return base_steps
+        return _get_substeps_base_steps(self.steps)
 
     def duration(self, graph: MultiDiGraph) -> FTNDuration:
         """Return approximate duration in seconds of step calculated as sum of
@@ -344,9 +401,13 @@ class AbstractStep(Step, ABC):
         """
         duration = FTNDuration(0, 0, 0)
         for step in self.steps:
-            duration += step.duration(graph)
+            duration += step.cached_duration(graph)
         return duration
 
+    def _analysis_substeps(self) -> List[Step]:
+        """Durations and reagents consumed are calculated from substeps."""
+        return self.steps
+
     def reagents_consumed(self, graph: MultiDiGraph) -> Dict[str, float]:
         """Return dictionary of reagents and volumes consumed in mL like this:
         ``{ reagent: volume... }``. Can be overridden otherwise just recursively
@@ -362,7 +423,7 @@ class AbstractStep(Step, ABC):
         """
         reagents_consumed = {}
         for substep in self.steps:
-            step_reagents_consumed = substep.reagents_consumed(graph)
+            step_reagents_consumed = substep.cached_reagents_consumed(graph)
             for reagent, volume in step_reagents_consumed.items():
                 if reagent in reagents_consumed:
                     reagents_consumed[reagent] += volume
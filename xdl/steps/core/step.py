@@ -1,6 +1,8 @@
 # Std
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Callable, Iterator
+import contextlib
 import copy
+import threading
 import uuid
 
 # Other
@@ -10,7 +12,9 @@ from networkx import MultiDiGraph
 from ..utils import FTNDuration
 from ...localisation import LOCALISATIONS
 from ...utils import XDLBase
+from ...utils.xdl_base import same_objects
 from ...utils.localisation import conditional_human_readable
+from ...utils.hashing import structural_hash, graph_hash as get_graph_hash
 from ...utils.misc import format_property, SanityCheck
 from ...utils.vessels import VesselSpec
 from ...errors import (
@@ -20,6 +24,36 @@ from ...errors import (
     XDLUndeclaredPropLimitError
 )
 
+# Graph being analysed in this thread and its graph hash, in the form
+# (graph, graph_hash). See analysis_graph_hash.
+_analysis_graph = threading.local()
+
+@contextlib.contextmanager
+def analysis_graph_hash(graph: MultiDiGraph) -> Iterator[str]:
+    """Context manager giving graph hash of graph used to cache analyses of
+    steps, such as durations. Within the context, cached analyses of steps
+    with the same graph reuse the graph hash, so analysing a whole procedure
+    only hashes the graph once. The graph must not be changed within the
+    context.
+
+    Args:
+        graph (MultiDiGraph): Graph used in analyses.
+
+    Yields:
+        str: Graph hash of graph, see :py:func:`xdl.utils.hashing.graph_hash`.
+    """
+    current = getattr(_analysis_graph, 'current', None)
+    if current is not None and current[0] is graph:
+        yield current[1]
+        return
+
+    _analysis_graph.current = (
+        graph, get_graph_hash(graph) if graph is not None else None)
+    try:
+        yield _analysis_graph.current[1]
+    finally:
+        _analysis_graph.current = current
+
 
 class Step(XDLBase):
     """Base class for all step objects.
@@ -43,14 +77,39 @@ class Step(XDLBase):
     # steps or steps do not conform to cross platform standard.
     localisation: Dict[str, str] = LOCALISATIONS
 
+    # True if compiling step, i.e. on_prepare_for_execution of step and all
+    # its substeps, only reads the graph and the properties of the step, so
+    # the step can be compiled at the same time as other steps. False if not.
+    # None to detect, in which case base steps that don't override
+    # on_prepare_for_execution are read only. Steps with children are only
+    # read only if all their children are too. See
+    # AbstractXDLExecutor.compile_workers.
+    GRAPH_READ_ONLY: bool = None
+
+    # Child steps when structural hash or analyses were cached. Children can
+    # be added, removed or replaced without changing properties of this step,
+    # so this is checked before using cached values. See _check_children.
+    _cached_children: List['Step'] = None
+
+    # Cached results of analyses such as duration, in the form
+    # { name: (graph_hash, result) }. Cleared whenever properties of the step
+    # or of any of its substeps change. See _cached_analysis.
+    _analysis_cache: Dict[str, Tuple] = None
+
+    # Value of _properties_version when step was last compiled. See
+    # needs_recompile.
+    _compiled_version: int = None
+
     def __init__(self, param_dict: Dict[str, Any]) -> None:
         super().__init__(param_dict)
 
         self.uuid = str(uuid.uuid4())
 
-        # Validate prop types
-        self._validate_prop_types()
-        self._validated_prop_types = True
+        # Validate prop types, only once per class as prop specification is
+        # the same for every instance.
+        if not type(self).__dict__.get('_validated_prop_types', False):
+            self._validate_prop_types()
+            type(self)._validated_prop_types = True
 
     def _validate_prop_types(self):
         """Make sure that all props specified in ``DEFAULT_PROPS``, ``INTERNAL_PROPS``,
@@ -102,6 +161,18 @@ class Step(XDLBase):
         """
         pass
 
+    @property
+    def needs_recompile(self) -> bool:
+        """``True`` if step hasn't been compiled, or its properties have
+        changed since it was compiled, otherwise ``False``. Used by
+        :py:meth:`xdl.XDL.recompile` to find steps that need compiling again.
+        """
+        return self._compiled_version != self._properties_version
+
+    def mark_compiled(self) -> None:
+        """Record that step has been compiled with its current properties."""
+        self._compiled_version = self._properties_version
+
     def sanity_checks(self, graph: MultiDiGraph) -> List[SanityCheck]:
         """Abstract methods that should return a list of ``SanityCheck`` objects
         to be checked by final_sanity_check. Not compulsory so not using
@@ -221,6 +292,93 @@ class Step(XDLBase):
         # instantaneous, such as starting stirring.
         return FTNDuration(0.5, 1, 2)
 
+    def cached_duration(self, graph: MultiDiGraph) -> FTNDuration:
+        """Return :py:meth:`duration` of step, cached until the properties of
+        the step or of any of its substeps change, or a graph with a different
+        graph hash is given. Editing a step clears the cached durations of the
+        step and the steps containing it, so only those are recalculated, and
+        steps that haven't changed return their cached duration without
+        looking at their substeps. The returned ``FTNDuration`` is shared and
+        must not be modified.
+
+        Args:
+            graph (MultiDiGraph): Graph to use when calculating step duration.
+
+        Returns:
+            FTNDuration: Estimated duration of step in seconds as FTN.
+        """
+        return self._cached_analysis('duration', graph, self.duration)
+
+    def cached_reagents_consumed(
+            self, graph: MultiDiGraph) -> Dict[str, float]:
+        """Return :py:meth:`reagents_consumed` of step, cached in the same way
+        as :py:meth:`cached_duration`. The returned dict is shared and must
+        not be modified.
+
+        Args:
+            graph (MultiDiGraph): Graph to use when calculating volume of
+                reagents consumed by step.
+
+        Returns:
+            Dict[str, float]: Dict of volumes of reagents consumed in format
+            ``{ reagent_id: volume_consumed... }``.
+        """
+        return self._cached_analysis(
+            'reagents_consumed', graph, self.reagents_consumed)
+
+    def _analysis_substeps(self) -> List['Step']:
+        """Return steps whose durations and reagents consumed are used to
+        calculate those of this step. Overridden by steps containing other
+        steps.
+        """
+        return []
+
+    def _cached_analysis(
+        self,
+        name: str,
+        graph: MultiDiGraph,
+        analyse: Callable[[MultiDiGraph], Any],
+    ) -> Any:
+        """Return cached result of analysis, or calculate and cache it if
+        the cache has been cleared since it was cached, or the graph hash is
+        different.
+
+        Args:
+            name (str): Name of analysis.
+            graph (MultiDiGraph): Graph to use in analysis. Compared by graph
+                hash, see :py:func:`analysis_graph_hash`.
+            analyse (Callable[[MultiDiGraph], Any]): Method calculating
+                result of analysis.
+
+        Returns:
+            Any: Result of analysis.
+        """
+        current = getattr(_analysis_graph, 'current', None)
+        if current is None or current[0] is not graph:
+            with analysis_graph_hash(graph):
+                return self._cached_analysis(name, graph, analyse)
+        graph_hash = current[1]
+
+        self._check_children()
+        if self._analysis_cache is not None:
+            cached = self._analysis_cache.get(name, None)
+            if cached is not None and cached[0] == graph_hash:
+                return cached[1]
+
+        result = analyse(graph)
+
+        # Substeps are only generated when analysed, so record this step as a
+        # dependent after analysis.
+        for substep in self._analysis_substeps():
+            substep._add_dependent(self)
+        if self._cached_children is None:
+            self._cached_children = self._get_children() if (
+                self.properties.get('children', None)) else []
+        if self._analysis_cache is None:
+            self._analysis_cache = {}
+        self._analysis_cache[name] = (graph_hash, result)
+        return result
+
     def locks(self, platform_controller: Any) -> Tuple[List]:
         """WIP: Abstract method used by parallelisation.
 
@@ -246,6 +404,76 @@ class Step(XDLBase):
         """Get class name."""
         return type(self).__name__
 
+    @property
+    def structural_hash(self) -> str:
+        """Hash of step type, properties and structural hashes of children.
+        Stable across processes and cached until properties or children
+        change. Changes to children clear the cached hash of this step, so the
+        cached hash is returned without hashing children again. Steps that are
+        equal always have the same hash, so steps with different hashes are
+        not equal. See :py:mod:`xdl.utils.hashing`.
+
+        Returns:
+            str: SHA256 hex digest of step.
+        """
+        cached_hash = self._structural_hash
+        if cached_hash is not None and self._check_children():
+            return cached_hash
+
+        children = self._get_children() if self.properties.get(
+            'children', None) else []
+        for child in children:
+            child._add_dependent(self)
+        self._cached_children = children
+        self._structural_hash = structural_hash(
+            self.name,
+            self.properties,
+            [child.structural_hash for child in children]
+        )
+        return self._structural_hash
+
+    def _get_children(self) -> List['Step']:
+        """Return copy of list of child steps, or ``None`` if step doesn't have
+        ``children`` property.
+        """
+        children = self.properties.get('children', None)
+        if children is None:
+            return None
+        elif isinstance(children, list):
+            return list(children)
+        return [children]
+
+    def _check_children(self) -> bool:
+        """Clear cached values if child steps have been added, removed or
+        replaced since they were cached. Only the list of children is checked,
+        as children clear the caches of this step themselves when they change.
+
+        Returns:
+            bool: ``True`` if children are unchanged, otherwise ``False``.
+        """
+        cached_children = self._cached_children
+        if cached_children is None:
+            return True
+        children = self.properties.get('children', None)
+        if not children:
+            unchanged = not cached_children
+        elif isinstance(children, list):
+            unchanged = same_objects(children, cached_children)
+        else:
+            unchanged = (
+                len(cached_children) == 1 and cached_children[0] is children)
+        if not unchanged:
+            self._clear_caches()
+        return unchanged
+
+    def _clear_caches(self) -> None:
+        """Clear cached structural hash and analyses, and the caches of steps
+        containing this step.
+        """
+        self._cached_children = None
+        self._analysis_cache = None
+        super()._clear_caches()
+
     @property
     def vessel_specs(self) -> Dict[str, VesselSpec]:
         """Return dictionary of required specifications of vessels used by the
@@ -273,6 +501,10 @@ class Step(XDLBase):
         if type(other) != type(self):
             return False
 
+        # Different structural hash, not equal
+        if self.structural_hash != other.structural_hash:
+            return False
+
         # Different name, not equal
         if other.name != self.name:
             return False
@@ -318,24 +550,77 @@ class Step(XDLBase):
     def __deepcopy__(self, memo):
         """Allow ``copy.deepcopy(step)`` to be called. Default deepcopy works,
         but not on Python 3.6, so that is what this is for. When Python 3.6 is
-        not supported this can go.
+        not supported this can go. Same as :py:meth:`clone`.
         """
-        # Copy children
-        children = []
-        if 'children' in self.properties and self.children:
-            for child in self.children:
-                children.append(child.__deepcopy__(memo))
-
-        # Copy properties
-        copy_props = {}
-        for k, v in self.properties.items():
-            if k != 'children':
-                copy_props[k] = v
+        return self.clone(memo=memo)
+
+    def clone(
+        self, keep_uuid: bool = False, memo: Dict[int, 'Step'] = None
+    ) -> 'Step':
+        """Return deep copy of step and its child steps. Where possible the
+        already sanitized properties and generated substeps of the step are
+        copied directly, so properties aren't sanitized and validated again
+        and substeps aren't generated again, which is much faster than
+        instantiating the step again from its properties. Async and dynamic
+        steps, which hold execution state, are instantiated again from their
+        properties so the copy hasn't been executed.
 
-        if children:
-            copy_props['children'] = children
-
-        # Make new self
-        copied_self = type(self)(**copy_props)
+        Args:
+            keep_uuid (bool): If ``True``, copies of step and its substeps and
+                child steps have the same UUIDs as the originals. Otherwise new
+                UUIDs are generated.
+            memo (Dict[int, Step]): Dict of ``id`` of steps already copied and
+                their copies, so that step objects occurring more than once in
+                the step tree, e.g. children of ``Repeat``, are only copied
+                once.
 
-        return copied_self
+        Returns:
+            Step: Copy of step.
+        """
+        if memo is None:
+            memo = {}
+        copied = memo.get(id(self))
+        if copied is None:
+            copied = self._clone(keep_uuid, memo)
+            memo[id(self)] = copied
+        return copied
+
+    def _clone(self, keep_uuid: bool, memo: Dict[int, 'Step']) -> 'Step':
+        """Copy step by instantiating it again from its properties. See
+        :py:meth:`clone`. Overridden by steps that can be copied directly.
+        """
+        copied = type(self)(**self._clone_properties(keep_uuid, memo))
+        if keep_uuid:
+            copied.uuid = self.uuid
+        return copied
+
+    def _clone_properties(
+        self, keep_uuid: bool, memo: Dict[int, 'Step']
+    ) -> Dict[str, Any]:
+        """Return copy of properties of step with child steps cloned. See
+        :py:meth:`clone`.
+        """
+        properties = dict(self.properties)
+        if properties.get('children'):
+            properties['children'] = [
+                child.clone(keep_uuid, memo)
+                for child in properties['children']
+            ]
+        return properties
+
+    def _clone_state(
+        self, keep_uuid: bool, memo: Dict[int, 'Step']
+    ) -> 'Step':
+        """Copy step by copying its attributes and already sanitized
+        properties directly. Cached analyses aren't copied. See
+        :py:meth:`clone`.
+        """
+        copied = self._copy_state()
+        state = copied.__dict__
+        state.pop('_analysis_cache', None)
+        state.pop('_cached_children', None)
+        state.pop('_structural_hash', None)
+        state['properties'] = self._clone_properties(keep_uuid, memo)
+        if not keep_uuid:
+            state['uuid'] = str(uuid.uuid4())
+        return copied
@@ -29,6 +29,9 @@ class Async(AbstractAsyncStep):
             has finished.
     """
 
+    # Substeps are the children, so read only if children are.
+    GRAPH_READ_ONLY = True
+
     PROP_TYPES = {
         'children': Union[Step, List[Step]],
         'pid': str,
@@ -1,14 +1,24 @@
-from typing import Union, List
+from typing import Union, List, Dict
+from networkx import MultiDiGraph
 from ..core import AbstractStep, Step
+from ..utils import FTNDuration, RepeatSequence
 
 class Repeat(AbstractStep):
     """Repeat children of this step ``self.repeats`` times.
 
+    The steps of this step are a :py:class:`RepeatSequence` of the children,
+    so the repeated steps list is never actually built, and duration and
+    reagents consumed are calculated once for the children and multiplied by
+    ``self.repeats``.
+
     Args:
         repeats (int): Number of times to repeat children.
         children (List[Step]): Child steps to repeat.
     """
 
+    # Substeps are the children, so read only if children are.
+    GRAPH_READ_ONLY = True
+
     PROP_TYPES = {
         'repeats': int,
         'children': Union[Step, List[Step]]
@@ -23,10 +33,32 @@ class Repeat(AbstractStep):
             self.children = [children]
 
     def get_steps(self):
-        steps = []
-        for _ in range(self.repeats):
-            steps.extend(self.children)
-        return steps
+        return RepeatSequence(self.children, self.repeats)
+
+    def _analysis_substeps(self) -> List[Step]:
+        """Durations and reagents consumed are calculated from children."""
+        return self.children
+
+    def duration(self, graph: MultiDiGraph) -> FTNDuration:
+        duration = FTNDuration(0, 0, 0)
+        for step in self.children:
+            duration += step.cached_duration(graph)
+        return duration * self.steps.repeats
+
+    def reagents_consumed(self, graph: MultiDiGraph) -> Dict[str, float]:
+        reagents_consumed = {}
+        for step in self.children:
+            for reagent, volume in step.cached_reagents_consumed(
+                    graph).items():
+                if reagent in reagents_consumed:
+                    reagents_consumed[reagent] += volume
+                else:
+                    reagents_consumed[reagent] = volume
+        repeats = self.steps.repeats
+        return {
+            reagent: volume * repeats
+            for reagent, volume in reagents_consumed.items()
+        }
 
     def human_readable(self, language='en'):
         human_readable = f'Repeat {self.repeats} times:\n'
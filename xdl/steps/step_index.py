@@ -0,0 +1,215 @@
+"""Index of every step in a procedure's step tree by UUID.
+
+The index covers top level steps, substeps and child steps, and gives the
+step, its parent steps and its position in the step tree for any UUID without
+searching the tree. Substeps are regenerated whenever step properties change,
+so rather than tracking every edit the index checks that the position of a
+step is still valid when it is looked up, and indexes the step tree again if
+it isn't.
+
+UUIDs that aren't found only cause the step tree to be indexed again if the
+tree may have changed since it was last indexed. The index is recorded as a
+dependent of every indexed step, see
+:py:meth:`xdl.utils.XDLBase._add_dependent`, so changing the properties of any
+step marks the index as out of date, as does adding, removing or replacing top
+level steps. Steps added to a ``children``
+list in place are only found once the step is updated with
+:py:meth:`xdl.utils.XDLBase.update`, or any other step changes.
+"""
+from typing import Dict, List, Tuple
+
+from .core import Step
+from .utils import RepeatSequence
+from ..utils.xdl_base import same_objects
+
+#: Position of step in step tree, in the form
+#: ``((attr, index), (attr, index)...)`` from top level step down to step.
+#: ``attr`` is ``'steps'`` or ``'children'``, the attribute of the parent step
+#: containing the step, or ``None`` for top level steps.
+StepPath = Tuple[Tuple[str, int], ...]
+
+class StepIndex(object):
+    """Index of steps in step tree by UUID.
+
+    Args:
+        steps (List[Step]): Top level steps of procedure. Kept by reference,
+            so steps added to or removed from the list later are found.
+    """
+
+    def __init__(self, steps: List[Step]) -> None:
+        self.steps = steps
+
+        # { step_uuid: (step, path, parents) }
+        self._entries: Dict[str, Tuple[Step, StepPath, Tuple[Step, ...]]] = {}
+
+        # Top level steps when index was built, and whether any step has
+        # changed since. If neither has changed, UUIDs not in the index are
+        # not in the step tree.
+        self._built_steps: List[Step] = []
+        self._stale = False
+        self._build()
+
+    def _build(self) -> None:
+        """Index whole step tree again."""
+        self._entries = {}
+        self._built_steps = list(self.steps)
+        self._stale = False
+        for i, step in enumerate(self.steps):
+            self._add_step(step, ((None, i),), ())
+
+    def _clear_caches(self) -> None:
+        """Mark index as out of date. Called by indexed steps when their
+        properties change.
+        """
+        self._stale = True
+
+    def _tree_changed(self) -> bool:
+        """Return ``True`` if step tree may have changed since it was last
+        indexed.
+        """
+        return self._stale or not same_objects(self.steps, self._built_steps)
+
+    def _add_step(
+        self, step: Step, path: StepPath, parents: Tuple[Step, ...]
+    ) -> None:
+        """Add step and all its child steps and substeps to index. If the
+        same step object occurs more than once, e.g. children of ``Repeat``,
+        only the first occurrence is indexed.
+
+        Args:
+            step (Step): Step to add.
+            path (StepPath): Position of step in step tree.
+            parents (Tuple[Step, ...]): Parent steps of step, from top level
+                step down to direct parent.
+        """
+        if step.uuid in self._entries:
+            return
+        self._entries[step.uuid] = (step, path, parents)
+        step._add_dependent(self)
+
+        substep_parents = parents + (step,)
+        for i, child in enumerate(_get_substeps(step, 'children')):
+            self._add_step(child, path + (('children', i),), substep_parents)
+
+        substeps = _get_substeps(step, 'steps')
+        if isinstance(substeps, RepeatSequence):
+            substeps = substeps.children
+        for i, substep in enumerate(substeps):
+            self._add_step(substep, path + (('steps', i),), substep_parents)
+
+    def _is_valid(
+        self, uuid: str, entry: Tuple[Step, StepPath, Tuple[Step, ...]]
+    ) -> bool:
+        """Return ``True`` if indexed position of step is still correct.
+
+        Args:
+            uuid (str): UUID step is indexed by.
+            entry (Tuple[Step, StepPath, Tuple[Step, ...]]): Index entry.
+
+        Returns:
+            bool: ``True`` if step still has given UUID and is still at
+            indexed position, otherwise ``False``.
+        """
+        step, path, parents = entry
+        if step.uuid != uuid:
+            return False
+
+        container, container_step = self.steps, None
+        for (attr, i), node in zip(path, parents + (step,)):
+            if attr is not None:
+                container = _get_substeps(container_step, attr)
+            if i >= len(container) or container[i] is not node:
+                return False
+            container_step = node
+        return True
+
+    def _lookup(self, uuid: str) -> Tuple[Step, StepPath, Tuple[Step, ...]]:
+        """Return index entry of step with given UUID, indexing step tree
+        again if step has moved, or isn't found and the step tree may have
+        changed since it was last indexed.
+
+        Raises:
+            KeyError: If no step with given UUID is in step tree.
+        """
+        entry = self._entries.get(uuid, None)
+        if entry is not None and self._is_valid(uuid, entry):
+            return entry
+
+        if entry is not None or self._tree_changed():
+            self._build()
+            entry = self._entries.get(uuid, None)
+        if entry is None:
+            raise KeyError(uuid)
+        return entry
+
+    def get(self, uuid: str) -> Step:
+        """Return step with given UUID.
+
+        Args:
+            uuid (str): UUID of step.
+
+        Returns:
+            Step: Step with given UUID.
+
+        Raises:
+            KeyError: If no step with given UUID is in step tree.
+        """
+        return self._lookup(uuid)[0]
+
+    def parents(self, uuid: str) -> Tuple[Step, ...]:
+        """Return parent steps of step with given UUID.
+
+        Args:
+            uuid (str): UUID of step.
+
+        Returns:
+            Tuple[Step, ...]: Parent steps from top level step down to direct
+            parent of step. Empty for top level steps.
+
+        Raises:
+            KeyError: If no step with given UUID is in step tree.
+        """
+        return self._lookup(uuid)[2]
+
+    def path(self, uuid: str) -> StepPath:
+        """Return position of step with given UUID in step tree.
+
+        Args:
+            uuid (str): UUID of step.
+
+        Returns:
+            StepPath: Position of step. For top level steps this is
+            ``((None, index),)`` where ``index`` is index of step in top level
+            steps.
+
+        Raises:
+            KeyError: If no step with given UUID is in step tree.
+        """
+        return self._lookup(uuid)[1]
+
+    def __contains__(self, uuid: str) -> bool:
+        try:
+            self._lookup(uuid)
+            return True
+        except KeyError:
+            return False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+def _get_substeps(step: Step, attr: str) -> List[Step]:
+    """Return steps in ``'steps'`` or ``'children'`` of step.
+
+    Args:
+        step (Step): Step to get substeps or child steps of.
+        attr (str): ``'steps'`` or ``'children'``.
+
+    Returns:
+        List[Step]: Substeps or child steps of step. Empty if step has none.
+    """
+    if attr == 'children':
+        children = step.properties.get('children', None)
+        if children is None:
+            return []
+        return children if isinstance(children, list) else [children]
+    return getattr(step, 'steps', None) or []
@@ -52,11 +52,20 @@ class AbstractXDLElementTemplate(XDLBase):
         """Validate that step implements all mandatory properties correctly and
         call ``super().__init__``.
         """
-        self.validate()
+        # Validate step class against template, only once per class as
+        # template and implementation are the same for every instance. Class
+        # isn't marked as validated if validation fails, so every
+        # instantiation of invalid class raises error.
+        if not type(self).__dict__.get('_validated_template', False):
+            self.validate()
+            type(self)._validated_template = True
         super().__init__(param_dict)
 
     def validate(self) -> None:
-        """Validate step class conforms to standard in step template class."""
+        """Validate step class conforms to standard in step template class.
+        Only depends on class attributes so is called on first instantiation
+        of step class only.
+        """
         self.validate_name()
         self.validate_prop_types()
         self.validate_default_props()
@@ -1,5 +1,5 @@
 # Std
-from typing import Dict, Any, Union
+from typing import Dict, Any, Union, Iterator, List, Sequence
 
 # Other
 import tabulate
@@ -62,9 +62,63 @@ class FTNDuration:
             max_value=max_value
         )
 
+    def __mul__(self, other):
+        """Allow FTNs to be multiplied by numbers using * operator, e.g. for
+        the duration of repeated steps.
+        """
+        return FTNDuration(
+            min_value=self.min * other,
+            most_likely=self.most_likely * other,
+            max_value=self.max * other
+        )
+
+    __rmul__ = __mul__
+
     def __repr__(self):
         return f'FTN({self.min:2.2f}s {self.most_likely:.2f}s {self.max:.2f}s'
 
+class RepeatSequence(Sequence):
+    """Read only sequence of steps repeated a number of times, e.g. the steps
+    of a ``Repeat`` step. Steps are looked up by index into the repeated
+    steps, so the full expansion is never built unless asked for.
+
+    Args:
+        children (List[Step]): Steps to repeat.
+        repeats (int): Number of times to repeat steps.
+    """
+
+    def __init__(self, children: List[Any], repeats: int) -> None:
+        self.children = tuple(children)
+        self.repeats = max(repeats, 0) if self.children else 0
+
+    def __len__(self) -> int:
+        return len(self.children) * self.repeats
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('RepeatSequence index out of range')
+        return self.children[index % len(self.children)]
+
+    def __iter__(self) -> Iterator[Any]:
+        for _ in range(self.repeats):
+            yield from self.children
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, RepeatSequence):
+            return (self.repeats == other.repeats
+                    and self.children == other.children)
+        elif isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'RepeatSequence({list(self.children)!r} * {self.repeats})'
+
 def pretty_props_table(props: Dict[str, Any]) -> str:
     """Make neat props table for printing to terminal. Has no table lines but
     aligns items neatly.
@@ -0,0 +1,534 @@
+"""Compact, read-only, array backed representation of graphs for large rigs.
+
+networkx graphs store every node and edge as dicts of dicts, which uses a lot
+of memory and is slow to traverse for graphs of several rigs. An
+:py:class:`ArrayGraph` stores adjacency in compressed sparse row (CSR) arrays
+indexed by integer node IDs, and node attributes as one column per attribute,
+so neighbor queries are array slices and breadth first searches process a
+whole frontier of nodes at once.
+
+Array graphs need numpy, which is an optional dependency of XDL. Load a graph
+as an array graph with ``get_graph(graph_file, array=True)``, or convert a
+networkx graph with :py:func:`get_array_graph`.
+"""
+import weakref
+from typing import Any, Dict, List, Optional
+
+from networkx import MultiDiGraph
+
+from .graph import is_fluidic_edge
+from ..errors import XDLGraphMissingDependencyError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Value of node attribute column for nodes that don't have the attribute, so
+# that missing attributes and attributes with value None can be told apart.
+_MISSING = object()
+
+def _require_numpy() -> None:
+    """Raise error if numpy is not installed.
+
+    Raises:
+        XDLGraphMissingDependencyError: If numpy is not installed.
+    """
+    if numpy is None:
+        raise XDLGraphMissingDependencyError('numpy', 'array graphs')
+
+class ArrayGraph(object):
+    """Read-only graph with adjacency stored in CSR arrays and node attributes
+    stored in columns. Nodes have integer IDs, in the order nodes are in the
+    networkx graph the array graph is made from. Parallel edges between the
+    same two nodes are stored as one entry in the adjacency arrays, with the
+    attributes of every parallel edge kept.
+
+    Args:
+        graph (MultiDiGraph): Graph to convert.
+
+    Attributes:
+        nodes (List[str]): Nodes, indexed by node ID.
+        node_ids (Dict[str, int]): Node IDs, by node.
+        indptr (numpy.ndarray): Successors of node ID ``i`` are
+            ``indices[indptr[i]:indptr[i + 1]]``.
+        indices (numpy.ndarray): Node IDs of successors of every node, sorted
+            by node ID for every node.
+        fluidic (numpy.ndarray): For every entry in :py:attr:`indices`,
+            ``True`` if edge is fluidic, see
+            :py:func:`xdl.utils.graph.is_fluidic_edge`.
+        pred_indptr (numpy.ndarray): Same as :py:attr:`indptr` for
+            predecessors.
+        pred_indices (numpy.ndarray): Same as :py:attr:`indices` for
+            predecessors.
+        classes (numpy.ndarray): Class code of every node. Class names are
+            ``class_names[code]``.
+        class_names (List[str]): Class names by class code.
+        node_attrs (Dict[str, numpy.ndarray]): Object array of values of every
+            node attribute, indexed by node ID.
+        graph_attrs (Dict[str, Any]): Graph attributes.
+
+    Raises:
+        XDLGraphMissingDependencyError: If numpy is not installed.
+    """
+
+    def __init__(self, graph: MultiDiGraph) -> None:
+        _require_numpy()
+        self.nodes: List[str] = list(graph.nodes)
+        self.node_ids: Dict[str, int] = {
+            node: i for i, node in enumerate(self.nodes)}
+        self.graph_attrs: Dict[str, Any] = dict(graph.graph)
+        n_nodes = len(self.nodes)
+        node_ids = self.node_ids
+
+        # Node attribute columns and class codes.
+        node_data = [graph.nodes[node] for node in self.nodes]
+        self.node_attrs: Dict[str, numpy.ndarray] = {}
+        for data in node_data:
+            for attr in data:
+                if attr not in self.node_attrs:
+                    column = numpy.empty(n_nodes, dtype=object)
+                    column.fill(_MISSING)
+                    self.node_attrs[attr] = column
+        for i, data in enumerate(node_data):
+            for attr, value in data.items():
+                self.node_attrs[attr][i] = value
+
+        class_codes = {}
+        self.classes = numpy.fromiter(
+            (class_codes.setdefault(data.get('class', None), len(class_codes))
+             for data in node_data),
+            dtype=numpy.int32,
+            count=n_nodes,
+        )
+        self.class_names: List[str] = list(class_codes)
+
+        # Edges, grouped into (src, dest) pairs sorted by node IDs.
+        edges: Dict[tuple, List[Dict[str, Any]]] = {}
+        for src, dest, data in graph.edges(data=True):
+            edges.setdefault(
+                (node_ids[src], node_ids[dest]), []).append(dict(data))
+        pairs = sorted(edges)
+        n_pairs = len(pairs)
+        src_ids = numpy.fromiter(
+            (src for src, _ in pairs), dtype=numpy.int32, count=n_pairs)
+        dest_ids = numpy.fromiter(
+            (dest for _, dest in pairs), dtype=numpy.int32, count=n_pairs)
+        self._edge_attrs: List[List[Dict[str, Any]]] = [
+            edges[pair] for pair in pairs]
+        self.fluidic = numpy.fromiter(
+            (is_fluidic_edge(graph, self.nodes[src], self.nodes[dest])
+             for src, dest in pairs),
+            dtype=bool,
+            count=n_pairs,
+        )
+
+        # Successors, CSR.
+        self.indptr = _make_indptr(src_ids, n_nodes)
+        self.indices = dest_ids
+
+        # Predecessors, CSR of reversed edges.
+        order = numpy.lexsort((src_ids, dest_ids))
+        self.pred_indptr = _make_indptr(dest_ids[order], n_nodes)
+        self.pred_indices = src_ids[order]
+
+        # Successors over fluidic edges only, used for fluidic paths.
+        self._fluidic_indptr = _make_indptr(src_ids[self.fluidic], n_nodes)
+        self._fluidic_indices = dest_ids[self.fluidic]
+
+        # Neighbors, CSR of edges in either direction.
+        undirected = numpy.unique(numpy.concatenate((
+            src_ids.astype(numpy.int64) * n_nodes + dest_ids,
+            dest_ids.astype(numpy.int64) * n_nodes + src_ids,
+        )))
+        self._undirected_indptr = _make_indptr(
+            undirected // n_nodes, n_nodes)
+        self._undirected_indices = (undirected % n_nodes).astype(numpy.int32)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of adjacency, class and node attribute arrays in bytes.
+        Doesn't include the size of attribute values.
+        """
+        arrays = [
+            self.indptr,
+            self.indices,
+            self.fluidic,
+            self.pred_indptr,
+            self.pred_indices,
+            self._fluidic_indptr,
+            self._fluidic_indices,
+            self._undirected_indptr,
+            self._undirected_indices,
+            self.classes,
+        ] + list(self.node_attrs.values())
+        return sum(array.nbytes for array in arrays)
+
+    def number_of_edges(self) -> int:
+        """Return number of edges, counting parallel edges.
+
+        Returns:
+            int: Number of edges.
+        """
+        return sum(len(edge_attrs) for edge_attrs in self._edge_attrs)
+
+    def node_id(self, node: str) -> int:
+        """Return integer ID of node.
+
+        Args:
+            node (str): Node to get ID of.
+
+        Returns:
+            int: ID of node.
+
+        Raises:
+            KeyError: If node is not in graph.
+        """
+        return self.node_ids[node]
+
+    def successors(self, node: str) -> List[str]:
+        """Return nodes connected by out edges of node.
+
+        Args:
+            node (str): Node to get successors of.
+
+        Returns:
+            List[str]: Successors of node, in node ID order.
+        """
+        return self._adjacent(self.indptr, self.indices, node)
+
+    def predecessors(self, node: str) -> List[str]:
+        """Return nodes connected by in edges of node.
+
+        Args:
+            node (str): Node to get predecessors of.
+
+        Returns:
+            List[str]: Predecessors of node, in node ID order.
+        """
+        return self._adjacent(self.pred_indptr, self.pred_indices, node)
+
+    def neighbors(self, node: str) -> List[str]:
+        """Return all neighbors of node, whether they are connected by in edges
+        or out edges.
+
+        Args:
+            node (str): Node to get neighbors of.
+
+        Returns:
+            List[str]: Neighbors of node, in node ID order.
+        """
+        return self._adjacent(
+            self._undirected_indptr, self._undirected_indices, node)
+
+    def _adjacent(
+        self, indptr: 'numpy.ndarray', indices: 'numpy.ndarray', node: str
+    ) -> List[str]:
+        """Return nodes adjacent to node in CSR arrays.
+
+        Args:
+            indptr (numpy.ndarray): CSR index pointer array.
+            indices (numpy.ndarray): CSR node ID array.
+            node (str): Node to get adjacent nodes of.
+
+        Returns:
+            List[str]: Adjacent nodes, in node ID order.
+        """
+        i = self.node_ids[node]
+        nodes = self.nodes
+        return [
+            nodes[j] for j in indices[indptr[i]:indptr[i + 1]].tolist()]
+
+    def nodes_of_class(self, node_class: str) -> List[str]:
+        """Return all nodes of given class.
+
+        Args:
+            node_class (str): Class of nodes, e.g. ``'ChemputerFlask'``.
+
+        Returns:
+            List[str]: Nodes of given class, in node ID order.
+        """
+        try:
+            code = self.class_names.index(node_class)
+        except ValueError:
+            return []
+        return [self.nodes[i] for i in numpy.flatnonzero(self.classes == code)]
+
+    def node_attr(self, node: str, attr: str, default: Any = None) -> Any:
+        """Return value of attribute of node.
+
+        Args:
+            node (str): Node to get attribute of.
+            attr (str): Attribute to get.
+            default (Any): Value to return if node doesn't have attribute.
+
+        Returns:
+            Any: Value of attribute.
+        """
+        column = self.node_attrs.get(attr, None)
+        if column is None:
+            return default
+        value = column[self.node_ids[node]]
+        return default if value is _MISSING else value
+
+    def node_data(self, node: str) -> Dict[str, Any]:
+        """Return dict of all attributes of node, as in networkx
+        ``graph.nodes[node]``.
+
+        Args:
+            node (str): Node to get attributes of.
+
+        Returns:
+            Dict[str, Any]: Attributes of node.
+        """
+        i = self.node_ids[node]
+        return {
+            attr: column[i]
+            for attr, column in self.node_attrs.items()
+            if column[i] is not _MISSING
+        }
+
+    def edge_data(self, src: str, dest: str) -> List[Dict[str, Any]]:
+        """Return attributes of every edge from ``src`` to ``dest``.
+
+        Args:
+            src (str): Source node of edges.
+            dest (str): Destination node of edges.
+
+        Returns:
+            List[Dict[str, Any]]: Attributes of every parallel edge from
+            ``src`` to ``dest``. Empty if there are no edges. Must not be
+            changed.
+        """
+        i, j = self.node_ids[src], self.node_ids[dest]
+        start, end = self.indptr[i], self.indptr[i + 1]
+        position = start + numpy.searchsorted(self.indices[start:end], j)
+        if position < end and self.indices[position] == j:
+            return self._edge_attrs[position]
+        return []
+
+    def shortest_path_lengths(
+            self, source: str, fluidic: bool = False) -> 'numpy.ndarray':
+        """Return number of edges in shortest path from ``source`` to every
+        node, following edge direction.
+
+        Args:
+            source (str): Node paths start at.
+            fluidic (bool): If ``True`` only follow fluidic edges.
+
+        Returns:
+            numpy.ndarray: Distance to every node, indexed by node ID. ``-1``
+            for nodes that can't be reached.
+        """
+        distances, _ = self._search(self.node_ids[source], fluidic)
+        return distances
+
+    def all_shortest_path_lengths(
+            self, fluidic: bool = False) -> 'numpy.ndarray':
+        """Return number of edges in shortest path between every pair of
+        nodes, following edge direction. Searches from every node at once, so
+        is much faster than calling :py:meth:`shortest_path_lengths` for every
+        node.
+
+        Args:
+            fluidic (bool): If ``True`` only follow fluidic edges.
+
+        Returns:
+            numpy.ndarray: Matrix of distances, ``distances[i, j]`` is distance
+            from node ID ``i`` to node ID ``j``. ``-1`` for pairs of nodes with
+            no path between them.
+        """
+        indptr, indices = self._csr(fluidic)
+        n_nodes = len(self.nodes)
+        distances = numpy.full((n_nodes, n_nodes), -1, dtype=numpy.int32)
+        flat_distances = distances.reshape(-1)
+
+        # Frontier of every search at once, as (source, node) pairs.
+        sources = numpy.arange(n_nodes, dtype=numpy.int64)
+        frontier = sources.copy()
+        distances[sources, frontier] = 0
+        level = 0
+        while frontier.size:
+            level += 1
+            successors, counts = _gather(indptr, indices, frontier)
+            if not successors.size:
+                break
+            pairs = numpy.repeat(sources, counts) * n_nodes + successors
+            pairs = numpy.unique(pairs[flat_distances[pairs] < 0])
+            flat_distances[pairs] = level
+            sources, frontier = numpy.divmod(pairs, n_nodes)
+        return distances
+
+    def path(
+        self, src: str, dest: str, fluidic: bool = False
+    ) -> Optional[List[str]]:
+        """Return a shortest path from ``src`` to ``dest``, following edge
+        direction.
+
+        Args:
+            src (str): Node path starts at.
+            dest (str): Node path ends at.
+            fluidic (bool): If ``True`` only follow fluidic edges.
+
+        Returns:
+            Optional[List[str]]: Nodes in path, including ``src`` and
+            ``dest``. ``None`` if there is no path.
+        """
+        dest_id = self.node_ids[dest]
+        distances, parents = self._search(
+            self.node_ids[src], fluidic, dest_id)
+        if distances[dest_id] < 0:
+            return None
+        path = [dest_id]
+        while distances[path[-1]] > 0:
+            path.append(parents[path[-1]])
+        return [self.nodes[i] for i in reversed(path)]
+
+    def _search(
+        self, source: int, fluidic: bool, target: int = None
+    ) -> tuple:
+        """Breadth first search from source, processing whole frontier of
+        nodes at every level with array operations.
+
+        Args:
+            source (int): Node ID to search from.
+            fluidic (bool): If ``True`` only follow fluidic edges.
+            target (int): If given, stop once node ID has been reached.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: Distance to every node, -1 if
+            not reached, and parent of every node in search tree.
+        """
+        indptr, indices = self._csr(fluidic)
+        distances = numpy.full(len(self.nodes), -1, dtype=numpy.int32)
+        parents = numpy.full(len(self.nodes), -1, dtype=numpy.int32)
+        distances[source] = 0
+        frontier = numpy.array([source], dtype=numpy.int64)
+        level = 0
+        while frontier.size and (target is None or distances[target] < 0):
+            level += 1
+            successors, counts = _gather(indptr, indices, frontier)
+            unvisited = distances[successors] < 0
+            # Node reached from more than one frontier node gets the last one
+            # as parent, which is as good as any other.
+            parents[successors[unvisited]] = numpy.repeat(
+                frontier, counts)[unvisited]
+            distances[successors[unvisited]] = level
+            frontier = numpy.flatnonzero(distances == level)
+        return distances, parents
+
+    def _csr(self, fluidic: bool) -> tuple:
+        """Return CSR arrays of successors to search.
+
+        Args:
+            fluidic (bool): If ``True`` return CSR arrays of fluidic edges only.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: Index pointer and node ID
+            arrays.
+        """
+        if fluidic:
+            return self._fluidic_indptr, self._fluidic_indices
+        return self.indptr, self.indices
+
+    def to_networkx(self) -> MultiDiGraph:
+        """Convert back to networkx graph. Nodes are in the same order as the
+        original graph, edges are grouped by source node.
+
+        Returns:
+            MultiDiGraph: Graph with same nodes, edges and attributes.
+        """
+        graph = MultiDiGraph(**self.graph_attrs)
+        for node in self.nodes:
+            graph.add_node(node, **self.node_data(node))
+        for i, src in enumerate(self.nodes):
+            for position in range(self.indptr[i], self.indptr[i + 1]):
+                dest = self.nodes[self.indices[position]]
+                for data in self._edge_attrs[position]:
+                    graph.add_edge(src, dest, **_copy_edge_data(data))
+        return graph
+
+
+#: Array graphs of networkx graphs that are never changed, i.e. graphs in
+#: graph memory cache. See :py:func:`get_array_graph`.
+_array_graphs: 'weakref.WeakKeyDictionary[MultiDiGraph, ArrayGraph]' = (
+    weakref.WeakKeyDictionary())
+
+def get_array_graph(graph: MultiDiGraph, cache: bool = False) -> ArrayGraph:
+    """Convert networkx graph to array graph.
+
+    Args:
+        graph (MultiDiGraph): Graph to convert.
+        cache (bool): If ``True``, keep array graph and return it again next
+            time graph is converted. Only use for graphs that are never
+            changed.
+
+    Returns:
+        ArrayGraph: Array graph.
+
+    Raises:
+        XDLGraphMissingDependencyError: If numpy is not installed.
+    """
+    _require_numpy()
+    if not cache:
+        return ArrayGraph(graph)
+    array_graph = _array_graphs.get(graph, None)
+    if array_graph is None:
+        array_graph = ArrayGraph(graph)
+        _array_graphs[graph] = array_graph
+    return array_graph
+
+def _make_indptr(src_ids: 'numpy.ndarray', n_nodes: int) -> 'numpy.ndarray':
+    """Return CSR index pointer array from sorted source node IDs of edges.
+
+    Args:
+        src_ids (numpy.ndarray): Sorted source node ID of every edge.
+        n_nodes (int): Number of nodes.
+
+    Returns:
+        numpy.ndarray: Index pointer array, length ``n_nodes + 1``.
+    """
+    indptr = numpy.zeros(n_nodes + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(src_ids, minlength=n_nodes), out=indptr[1:])
+    return indptr
+
+def _gather(
+    indptr: 'numpy.ndarray', indices: 'numpy.ndarray', nodes: 'numpy.ndarray'
+) -> tuple:
+    """Return successors of every node in array of node IDs.
+
+    Args:
+        indptr (numpy.ndarray): CSR index pointer array.
+        indices (numpy.ndarray): CSR node ID array.
+        nodes (numpy.ndarray): Node IDs to get successors of.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: Node IDs of successors of every
+        node, concatenated in order of ``nodes``, and number of successors of
+        every node.
+    """
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    # Position in indices of every successor is start of its node's slice
+    # plus its offset within the concatenated result minus the offset of the
+    # node's first successor.
+    offsets = numpy.repeat(starts - (numpy.cumsum(counts) - counts), counts)
+    successors = indices[offsets + numpy.arange(offsets.size)]
+    return successors.astype(numpy.int64), counts
+
+def _copy_edge_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return copy of edge attributes, copying port lists too.
+
+    Args:
+        data (Dict[str, Any]): Edge attributes.
+
+    Returns:
+        Dict[str, Any]: Copy of edge attributes.
+    """
+    return {
+        attr: list(value) if type(value) == list else value
+        for attr, value in data.items()
+    }
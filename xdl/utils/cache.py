@@ -0,0 +1,226 @@
+"""Opt-in, size bounded on-disk caches shared between processes.
+
+Caches are disabled by default. They can be enabled for the current process
+with :py:func:`enable_cache`, or for every process by setting the environment
+variable ``XDL_CACHE=1``. Each cache is a folder of files inside the cache
+directory, by default the appdirs user cache directory for xdl. Entries are
+written atomically, so caches are safe to share between concurrent processes.
+When a cache grows larger than its max size, the least recently used entries
+are evicted.
+"""
+import hashlib
+import os
+import tempfile
+from typing import Dict, Any, List, Optional
+
+import appdirs
+
+#: Environment variable that enables caches if set to ``'1'``.
+CACHE_ENV_VAR: str = 'XDL_CACHE'
+
+#: Environment variable that overrides default cache directory.
+CACHE_DIR_ENV_VAR: str = 'XDL_CACHE_DIR'
+
+#: Environment variable that overrides default max size of each cache in
+#: bytes.
+CACHE_MAX_SIZE_ENV_VAR: str = 'XDL_CACHE_MAX_SIZE'
+
+#: Default max size of each cache in bytes.
+DEFAULT_CACHE_MAX_SIZE: int = 256 * 1024 * 1024
+
+# Set by enable_cache / disable_cache. If None fall back to environment
+# variable.
+_cache_enabled = None
+
+def enable_cache() -> None:
+    """Enable caches for the current process."""
+    global _cache_enabled
+    _cache_enabled = True
+
+def disable_cache() -> None:
+    """Disable caches for the current process."""
+    global _cache_enabled
+    _cache_enabled = False
+
+def cache_enabled() -> bool:
+    """Return ``True`` if caches are enabled, otherwise ``False``."""
+    if _cache_enabled is None:
+        return os.environ.get(CACHE_ENV_VAR, '') == '1'
+    return _cache_enabled
+
+def get_cache_dir() -> str:
+    """Return directory containing all caches."""
+    return os.environ.get(
+        CACHE_DIR_ENV_VAR, appdirs.user_cache_dir('xdl'))
+
+def get_cache(name: str) -> 'DiskCache':
+    """Return cache with given name.
+
+    Args:
+        name (str): Name of cache, e.g. ``'parse'``.
+
+    Returns:
+        DiskCache: Cache stored in folder ``name`` in cache directory.
+    """
+    max_size = int(os.environ.get(
+        CACHE_MAX_SIZE_ENV_VAR, DEFAULT_CACHE_MAX_SIZE))
+    return DiskCache(os.path.join(get_cache_dir(), name), max_size=max_size)
+
+def get_all_caches() -> List['DiskCache']:
+    """Return all caches that exist in the cache directory."""
+    cache_dir = get_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return []
+    return [
+        get_cache(name)
+        for name in sorted(os.listdir(cache_dir))
+        if os.path.isdir(os.path.join(cache_dir, name))
+    ]
+
+def hash_key(*parts: Any) -> str:
+    """Return cache key made by hashing all given parts.
+
+    Args:
+        parts (Any): Parts of key. ``bytes`` are hashed directly, everything
+            else is hashed as ``str``.
+
+    Returns:
+        str: SHA256 hex digest of parts.
+    """
+    sha256 = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = str(part).encode('utf8')
+        sha256.update(part)
+        sha256.update(b'\0')
+    return sha256.hexdigest()
+
+class DiskCache(object):
+    """Size bounded LRU cache of bytes stored in a folder, one file per entry.
+
+    The modification time of entry files is used as the time the entry was
+    last used, and is updated whenever an entry is read.
+
+    Args:
+        folder (str): Folder to store cache entries in. Created if it doesn't
+            exist when first entry is written.
+        max_size (int): Max total size of entries in bytes.
+    """
+
+    def __init__(self, folder: str, max_size: int = DEFAULT_CACHE_MAX_SIZE):
+        self.folder = folder
+        self.max_size = max_size
+
+    @property
+    def name(self) -> str:
+        """Name of cache."""
+        return os.path.basename(self.folder)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.folder, hash_key(key))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return value stored for key, or ``None`` if key is not in cache.
+
+        Args:
+            key (str): Key to look up.
+
+        Returns:
+            Optional[bytes]: Value stored for ``key``.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as fd:
+                value = fd.read()
+            os.utime(entry_path)
+        except OSError:
+            return None
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store value for key, evicting least recently used entries if cache
+        is full.
+
+        Args:
+            key (str): Key to store value under.
+            value (bytes): Value to store.
+        """
+        if len(value) > self.max_size:
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_fd:
+                tmp_fd.write(value)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def delete(self, key: str) -> None:
+        """Remove key from cache if it exists.
+
+        Args:
+            key (str): Key to remove.
+        """
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Remove least recently used entries until total size of cache is
+        less than or equal to :py:attr:`max_size`.
+        """
+        entries = self._entries()
+        total_size = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Remove all entries from cache."""
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return stats of cache.
+
+        Returns:
+            Dict[str, Any]: Dict with keys ``'name'``, ``'folder'``,
+            ``'entries'``, ``'size'`` and ``'max_size'``. Sizes are in bytes.
+        """
+        entries = self._entries()
+        return {
+            'name': self.name,
+            'folder': self.folder,
+            'entries': len(entries),
+            'size': sum(size for _, size, _ in entries),
+            'max_size': self.max_size,
+        }
+
+    def _entries(self) -> List[tuple]:
+        """Return list of ``(path, size, mtime)`` of all entries in cache."""
+        if not os.path.isdir(self.folder):
+            return []
+        entries = []
+        for f in os.listdir(self.folder):
+            if f.endswith('.tmp'):
+                continue
+            path = os.path.join(self.folder, f)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
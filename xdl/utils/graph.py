@@ -4,21 +4,48 @@ repo.
 
 A lot of the class names here are Chemputer specific. In future it could be good
 to properly design the graph to be platform independent.
+
+Routing tables of shortest paths between nodes can be computed once per graph
+with :py:func:`get_routing_table`, for compiling steps that need to know how
+vessels are connected.
+
+Graphs loaded from files by :py:func:`get_graph` are cached in memory, keyed
+by path, modification time and size, so loading the same graph file again
+only copies the graph. If caches are enabled (see :py:mod:`xdl.utils.cache`),
+loaded graphs are also stored on disk, keyed by the hash of the file contents,
+so other processes skip parsing the file too. Graphs are stored on disk as
+node link JSON.
+
+For large rigs, ``get_graph(graph_file, array=True)`` returns a compact,
+read-only :py:class:`xdl.utils.array_graph.ArrayGraph` instead of a networkx
+graph. This needs numpy to be installed.
 """
 
-from typing import Union, Dict, Optional
+from typing import Union, Dict, Optional, Set, Tuple
+from collections import OrderedDict
+from itertools import repeat
+import copy
+import io
 import os
 import json
+import threading
+import weakref
+import networkx
 from networkx.readwrite import json_graph
 from networkx import MultiDiGraph, read_graphml, relabel_nodes
 
 from typing import List
+from .cache import cache_enabled, get_cache, hash_key
+from .hashing import graph_hash
 from ..errors import (
     XDLGraphFileNotFoundError,
     XDLGraphInvalidFileTypeError,
     XDLGraphTypeError,
 )
 
+if False:
+    from .array_graph import ArrayGraph
+
 #: Class name of filter
 FILTER: str = 'ChemputerFilter'
 
@@ -101,6 +128,220 @@ SEPARATOR_CLASSES: List[str] = [SEPARATOR]
 #: All class names of regular flasks.
 FLASK_CLASSES: List[str] = [FLASK]
 
+#: Max number of graphs loaded from files that are kept in memory by
+#: :py:func:`get_graph`.
+GRAPH_MEMORY_CACHE_SIZE: int = 16
+
+#: Name of graph cache folder in cache directory.
+GRAPH_CACHE_NAME: str = 'graph'
+
+#: Version of format graphs are stored in in graph cache. Increment if the way
+#: graphs are loaded changes, so that graphs cached by previous versions are
+#: not used.
+GRAPH_CACHE_FORMAT_VERSION: int = 2
+
+# Graphs loaded from files, in least recently used order, in the form
+# { (path, mtime, size): graph }. Graphs in here are never returned directly,
+# only copies of them, so are never changed.
+_graph_memory_cache: 'OrderedDict[Tuple[str, int, int], MultiDiGraph]' = (
+    OrderedDict())
+_graph_memory_cache_lock = threading.Lock()
+
+#: Max number of routing tables kept in memory by
+#: :py:func:`get_routing_table`.
+ROUTING_TABLE_MEMORY_CACHE_SIZE: int = 16
+
+#: Name of routing table cache folder in cache directory.
+ROUTING_CACHE_NAME: str = 'routing'
+
+#: Version of format routing tables are serialised in. Increment if
+#: :py:class:`RoutingTable` changes, so that routing tables cached by previous
+#: versions are not used.
+ROUTING_TABLE_FORMAT_VERSION: int = 1
+
+# Routing tables, in least recently used order, in the form
+# { graph_hash: routing_table }.
+_routing_tables: 'OrderedDict[str, RoutingTable]' = OrderedDict()
+_routing_tables_lock = threading.Lock()
+
+#: All class names of devices attached to vessels.
+DEVICE_CLASSES: List[str] = (
+    HEATER_CLASSES
+    + CHILLER_CLASSES
+    + ROTAVAP_CLASSES
+    + VACUUM_CLASSES
+    + STIRRER_CLASSES
+)
+
+class GraphIndex(object):
+    """Lookup tables of graph built in one pass over graph, so that neighbors,
+    nodes of a class, reagent flasks and attached devices can be found without
+    iterating over every node or edge in the graph. Use
+    :py:func:`get_graph_index` to get the index of a graph, rather than
+    instantiating this class directly, so that the index is shared.
+
+    networkx graphs don't record when they are changed, so every lookup
+    checks that the part of the graph it depends on hasn't changed, and builds
+    the index again if it has. Neighbors are checked against the successors
+    and predecessors of the node, so these lookups don't depend on the size of
+    the graph. Lookups by class and of reagent flasks check the class and
+    chemical of every node.
+
+    Args:
+        graph (MultiDiGraph): Graph to index. Only weakly referenced, so the
+            index doesn't keep the graph alive.
+    """
+
+    def __init__(self, graph: MultiDiGraph) -> None:
+        self._graph_ref = weakref.ref(graph)
+        self._build()
+
+    @property
+    def graph(self) -> MultiDiGraph:
+        """Indexed graph."""
+        return self._graph_ref()
+
+    def _build(self) -> None:
+        """Build lookup tables from graph."""
+        graph = self.graph
+
+        # { node: (neighbor...) } in same order as found by iterating over
+        # edges, and { node: {neighbor...} } to check neighbors against graph.
+        neighbors = {node: {} for node in graph.nodes}
+        for src, dest in graph.edges():
+            neighbors[src][dest] = None
+            neighbors[dest][src] = None
+        self._neighbors: Dict[str, Tuple[str, ...]] = {
+            node: tuple(node_neighbors)
+            for node, node_neighbors in neighbors.items()
+        }
+        self._neighbor_sets: Dict[str, Set[str]] = {
+            node: set(node_neighbors)
+            for node, node_neighbors in neighbors.items()
+        }
+
+        # { class: [node...] } and { chemical: flask }, first flask only.
+        self._class_nodes: Dict[str, List[str]] = {}
+        self._reagent_flasks: Dict[str, str] = {}
+        for node, data in graph.nodes(data=True):
+            node_class = data.get('class', None)
+            self._class_nodes.setdefault(node_class, []).append(node)
+            if node_class == FLASK:
+                self._reagent_flasks.setdefault(data.get('chemical'), node)
+        self._node_signature = _node_signature(graph)
+
+    def _check_nodes(self) -> None:
+        """Build index again if any nodes have been added or removed, or the
+        class or chemical of any node has changed.
+        """
+        if _node_signature(self.graph) != self._node_signature:
+            self._build()
+
+    def neighbors(self, node: str) -> Tuple[str, ...]:
+        """Return all neighbors of node, whether they are connected by in edges
+        or out edges.
+
+        Args:
+            node (str): Node to get neighbors of.
+
+        Returns:
+            Tuple[str, ...]: Neighbors of node. Empty if node not in graph.
+        """
+        graph = self.graph
+        if node not in graph._succ:
+            return ()
+        neighbor_set = self._neighbor_sets.get(node, None)
+        if (neighbor_set is None
+                or graph._succ[node].keys() | graph._pred[node].keys()
+                != neighbor_set):
+            self._build()
+        return self._neighbors[node]
+
+    def nodes_of_class(self, node_class: str) -> List[str]:
+        """Return all nodes of given class.
+
+        Args:
+            node_class (str): Class of nodes, e.g. ``'ChemputerFlask'``.
+
+        Returns:
+            List[str]: Nodes of given class, in graph order.
+        """
+        self._check_nodes()
+        return list(self._class_nodes.get(node_class, []))
+
+    def reagent_flask(self, reagent: str) -> Optional[str]:
+        """Return flask containing given reagent.
+
+        Args:
+            reagent (str): Reagent to find flask of.
+
+        Returns:
+            Optional[str]: First flask in graph containing reagent. ``None`` if
+            no flask contains reagent.
+        """
+        # Checking only the cached flask isn't enough, as an earlier flask in
+        # the graph may have been changed to contain the reagent.
+        self._check_nodes()
+        return self._reagent_flasks.get(reagent, None)
+
+    def attached_devices(self, node: str) -> List[str]:
+        """Return devices attached to node, i.e. neighbors with a class in
+        :py:data:`DEVICE_CLASSES`.
+
+        Args:
+            node (str): Node to get attached devices of.
+
+        Returns:
+            List[str]: Devices attached to node, in same order as
+            :py:meth:`neighbors`.
+        """
+        nodes = self.graph._node
+        return [
+            neighbor for neighbor in self.neighbors(node)
+            if nodes[neighbor].get('class', None) in DEVICE_CLASSES
+        ]
+
+
+#: Index of every graph indexed, by graph. Weak references to graphs, here and
+#: in the indexes, so indexes don't keep graphs alive.
+_GRAPH_INDEXES: 'weakref.WeakKeyDictionary[MultiDiGraph, GraphIndex]' = (
+    weakref.WeakKeyDictionary())
+
+def get_graph_index(graph: MultiDiGraph) -> GraphIndex:
+    """Get index of graph, building it the first time this is called for a
+    graph. See :py:class:`GraphIndex`.
+
+    Args:
+        graph (MultiDiGraph): Graph to get index of.
+
+    Returns:
+        GraphIndex: Index of graph.
+    """
+    index = _GRAPH_INDEXES.get(graph, None)
+    if index is None:
+        index = GraphIndex(graph)
+        _GRAPH_INDEXES[graph] = index
+    return index
+
+def _node_signature(graph: MultiDiGraph) -> Tuple:
+    """Return nodes of graph with the class and chemical of every node, so
+    that changes to nodes can be detected without comparing whole graph.
+
+    Args:
+        graph (MultiDiGraph): Graph to get signature of.
+
+    Returns:
+        Tuple: ``(nodes, classes, chemicals)``
+    """
+    # Built with map over C functions rather than a generator, as this is
+    # done on lookups.
+    node_data = graph._node.values()
+    return (
+        tuple(graph._node),
+        tuple(map(dict.get, node_data, repeat('class'))),
+        tuple(map(dict.get, node_data, repeat('chemical'))),
+    )
+
 def undirected_neighbors(graph, node, data=False):
     """Return all neighbors whether they come from in edges or out edges.
 
@@ -114,33 +355,37 @@ def undirected_neighbors(graph, node, data=False):
         (str, Optional[Dict]): If data is False, yields node name. If data is
            True, yields (node_name, node_properties).
     """
-    yielded_neighbors = []
-    for src, dest in graph.edges():
-        if src == node and dest not in yielded_neighbors:
-            yielded_neighbors.append(dest)
-            if data:
-                yield dest, graph.nodes[dest]
-            else:
-                yield dest
-
-        elif dest == node and src not in yielded_neighbors:
-            yielded_neighbors.append(src)
-            if data:
-                yield src, graph.nodes[src]
-            else:
-                yield src
-
-def get_graph(graph_file: Union[str, Dict]) -> MultiDiGraph:
+    for neighbor in get_graph_index(graph).neighbors(node):
+        if data:
+            yield neighbor, graph.nodes[neighbor]
+        else:
+            yield neighbor
+
+def get_graph(
+    graph_file: Union[str, Dict], array: bool = False
+) -> Union[MultiDiGraph, 'ArrayGraph']:
     """Given a path to a graph file or a dict containing graph in same format as
     JSON file, load and return networkx MultiDiGraph object.
 
+    Graphs loaded from files are cached, see module docstring. Every call
+    returns a new copy of the graph, so the returned graph can be changed
+    without affecting the cache.
+
     Args:
         graph_file (Union[str, Dict]): Path to graph file. May be GraphML file,
             JSON file with graph in node link format, or dict containing graph
             in same format as JSON file.
+        array (bool): If ``True``, return read-only
+            :py:class:`xdl.utils.array_graph.ArrayGraph` instead of networkx
+            graph. Array graphs of graph files are cached along with the
+            loaded graph, so are not copied. Needs numpy.
 
     Returns:
-        MultiDiGraph: Loaded graph.
+        Union[MultiDiGraph, ArrayGraph]: Loaded graph.
+
+    Raises:
+        XDLGraphMissingDependencyError: If ``array`` is ``True`` and numpy is
+            not installed.
     """
     graph = None
 
@@ -151,25 +396,15 @@ def get_graph(graph_file: Union[str, Dict]) -> MultiDiGraph:
         if not os.path.exists(graph_file):
             raise XDLGraphFileNotFoundError(graph_file)
 
-        # Graphml file
-        if graph_file.lower().endswith('.graphml'):
-            graph = MultiDiGraph(read_graphml(graph_file))
-            name_mapping = {}
-            for node in graph.nodes():
-                name_mapping[node] = graph.nodes[node]['label']
-            graph = relabel_nodes(graph, name_mapping)
-
-        # JSON graph file
-        elif graph_file.lower().endswith('.json'):
-            with open(graph_file) as fileobj:
-                json_data = json.load(fileobj)
-                graph = json_graph.node_link_graph(
-                    json_data, directed=True, multigraph=True)
-
         # Invalid file type, raise error
-        else:
+        if not graph_file.lower().endswith(('.graphml', '.json')):
             raise XDLGraphInvalidFileTypeError(graph_file)
 
+        if array:
+            from .array_graph import get_array_graph
+            return get_array_graph(_load_graph_file(graph_file), cache=True)
+        return _copy_graph(_load_graph_file(graph_file))
+
     # Graph supplied as dict loaded from JSON graph file
     elif type(graph_file) == dict:
         graph = json_graph.node_link_graph(
@@ -183,15 +418,142 @@ def get_graph(graph_file: Union[str, Dict]) -> MultiDiGraph:
     else:
         raise XDLGraphTypeError(graph_file)
 
-    # Convert port strings to lists, '(0,1)' -> ['0', '1']
+    _convert_ports(graph)
+    if array:
+        from .array_graph import get_array_graph
+        return get_array_graph(graph)
+    return graph
+
+def clear_graph_cache() -> None:
+    """Remove all graphs and routing tables from memory caches used by
+    :py:func:`get_graph` and :py:func:`get_routing_table`.
+    """
+    with _graph_memory_cache_lock:
+        _graph_memory_cache.clear()
+    with _routing_tables_lock:
+        _routing_tables.clear()
+
+def _load_graph_file(graph_file: str) -> MultiDiGraph:
+    """Load graph file, from memory cache or disk cache if possible. Graph
+    returned must not be changed as it may be in memory cache.
+
+    Args:
+        graph_file (str): Path to GraphML or JSON graph file.
+
+    Returns:
+        MultiDiGraph: Loaded graph.
+    """
+    stat = os.stat(graph_file)
+    memory_key = (os.path.abspath(graph_file), stat.st_mtime_ns, stat.st_size)
+    with _graph_memory_cache_lock:
+        graph = _graph_memory_cache.get(memory_key, None)
+        if graph is not None:
+            _graph_memory_cache.move_to_end(memory_key)
+            return graph
+
+    with open(graph_file, 'rb') as fd:
+        file_contents = fd.read()
+
+    if cache_enabled():
+        disk_key = hash_key(
+            file_contents,
+            os.path.splitext(graph_file)[1].lower(),
+            GRAPH_CACHE_FORMAT_VERSION,
+            networkx.__version__,
+        )
+        cache = get_cache(GRAPH_CACHE_NAME)
+        data = cache.get(disk_key)
+        if data is not None:
+            try:
+                graph = json_graph.node_link_graph(
+                    json.loads(data), directed=True, multigraph=True)
+
+            # Entry is corrupt, remove it and parse file.
+            except Exception:
+                cache.delete(disk_key)
+
+        if graph is None:
+            graph = _read_graph_file(graph_file, file_contents)
+            cache.set(disk_key, json.dumps(
+                json_graph.node_link_data(graph)).encode('utf8'))
+
+    else:
+        graph = _read_graph_file(graph_file, file_contents)
+
+    with _graph_memory_cache_lock:
+        _graph_memory_cache[memory_key] = graph
+        while len(_graph_memory_cache) > GRAPH_MEMORY_CACHE_SIZE:
+            _graph_memory_cache.popitem(last=False)
+    return graph
+
+def _read_graph_file(graph_file: str, file_contents: bytes) -> MultiDiGraph:
+    """Parse contents of graph file.
+
+    Args:
+        graph_file (str): Path to GraphML or JSON graph file.
+        file_contents (bytes): Contents of graph file.
+
+    Returns:
+        MultiDiGraph: Parsed graph.
+    """
+    # Graphml file
+    if graph_file.lower().endswith('.graphml'):
+        graph = MultiDiGraph(read_graphml(io.BytesIO(file_contents)))
+        name_mapping = {}
+        for node in graph.nodes():
+            name_mapping[node] = graph.nodes[node]['label']
+        graph = relabel_nodes(graph, name_mapping)
+
+    # JSON graph file
+    else:
+        json_data = json.loads(file_contents)
+        graph = json_graph.node_link_graph(
+            json_data, directed=True, multigraph=True)
+
+    _convert_ports(graph)
+    return graph
+
+def _convert_ports(graph: MultiDiGraph) -> None:
+    """Convert port strings to lists, ``'(0,1)' -> ['0', '1']``.
+
+    Args:
+        graph (MultiDiGraph): Graph to convert ports of in place.
+    """
     for edge in graph.edges:
         if 'port' in graph.edges[edge]:
             port_str = graph.edges[edge]['port']
             if type(port_str) == str:
                 graph.edges[edge]['port'] = port_str[1:-1].split(',')
 
+def _copy_graph(graph: MultiDiGraph) -> MultiDiGraph:
+    """Return copy of graph that can be changed without changing graph.
+    ``MultiDiGraph.copy`` copies attribute dicts but not their values, so
+    mutable attribute values, e.g. port lists, are deep copied too.
+
+    Args:
+        graph (MultiDiGraph): Graph to copy.
+
+    Returns:
+        MultiDiGraph: Copy of graph.
+    """
+    graph = graph.copy()
+    _copy_attr_values(graph.graph)
+    for _, data in graph.nodes(data=True):
+        _copy_attr_values(data)
+    for _, _, data in graph.edges(data=True):
+        _copy_attr_values(data)
     return graph
 
+def _copy_attr_values(attrs: Dict) -> None:
+    """Deep copy mutable values of node, edge or graph attributes in place.
+
+    Args:
+        attrs (Dict): Attributes to copy values of.
+    """
+    for attr, value in attrs.items():
+        if type(value) not in (str, int, float, bool, type(None)):
+            attrs[attr] = copy.deepcopy(value)
+
 def get_reagent_vessel(graph: MultiDiGraph, reagent: str) -> Optional[str]:
     """Get vessel containing given reagent.
 
@@ -203,12 +565,7 @@ def get_reagent_vessel(graph: MultiDiGraph, reagent: str) -> Optional[str]:
         Optional[str]: Node name of flask containing given reagent. None if no
             flask found containing reagent.
     """
-
-    for node, data in graph.nodes(data=True):
-        if data['class'] == FLASK:
-            if data['chemical'] == reagent:
-                return node
-    return None
+    return get_graph_index(graph).reagent_flask(reagent)
 
 def get_vessel_stirrer(graph: MultiDiGraph, vessel: str) -> Optional[str]:
     """Get any stirrer attached to given vessel
@@ -223,8 +580,9 @@ def get_vessel_stirrer(graph: MultiDiGraph, vessel: str) -> Optional[str]:
     """
     stirrer_neighbors, heater_neighbors = [], []
     stirrer = None
-    # Iterate through each neighbor node of the vessel
-    for neighbor, data in undirected_neighbors(graph, vessel, data=True):
+    # Iterate through each device attached to the vessel
+    for neighbor in get_graph_index(graph).attached_devices(vessel):
+        data = graph.nodes[neighbor]
         # Found a stirrer
         if data['class'] in STIRRER_CLASSES:
             stirrer_neighbors.append(neighbor)
@@ -242,3 +600,270 @@ def get_vessel_stirrer(graph: MultiDiGraph, vessel: str) -> Optional[str]:
         stirrer = heater_neighbors[0]
 
     return stirrer
+
+def is_fluidic_edge(graph: MultiDiGraph, src: str, dest: str) -> bool:
+    """Return ``True`` if liquid can flow along edge. Edges connecting devices
+    such as stirrers and chillers to vessels, which have no ports, are not
+    fluidic.
+
+    Args:
+        graph (MultiDiGraph): Graph edge is in.
+        src (str): Source node of edge.
+        dest (str): Destination node of edge.
+
+    Returns:
+        bool: ``True`` if any edge from ``src`` to ``dest`` connects ports,
+        and neither node is a device in :py:data:`DEVICE_CLASSES`.
+    """
+    for node in (src, dest):
+        if graph.nodes[node].get('class', None) in DEVICE_CLASSES:
+            return False
+    for data in graph._succ[src][dest].values():
+        port = data.get('port', None)
+        if port and any(str(item).strip() for item in port):
+            return True
+    return False
+
+class RoutingTable(object):
+    """Shortest paths between every pair of nodes over the fluidic edges of
+    a graph, computed once so that path queries made while compiling steps
+    are dictionary lookups. Use :py:func:`get_routing_table` to get the
+    routing table of a graph, rather than instantiating this class directly,
+    so that routing tables are shared between graphs with the same graph hash
+    and stored in the cache if caches are enabled.
+
+    Paths follow edge direction, and only contain fluidic edges, see
+    :py:func:`is_fluidic_edge`. Where there is more than one shortest path
+    between two nodes, the path found first by breadth first search is used.
+
+    Args:
+        graph (MultiDiGraph): Graph to compute routing table of.
+
+    Attributes:
+        graph_hash (str): Graph hash of graph routing table was computed for.
+            See :py:func:`xdl.utils.hashing.graph_hash`.
+    """
+
+    def __init__(self, graph: MultiDiGraph = None) -> None:
+        self.graph_hash: str = None
+
+        # { node: (fluidic_neighbor...) }, neighbors connected by fluidic
+        # edges in either direction.
+        self._neighbors: Dict[str, Tuple[str, ...]] = {}
+
+        # { src: { dest: next_hop } }, next node on shortest path from src to
+        # dest.
+        self._next_hops: Dict[str, Dict[str, str]] = {}
+
+        # { src: { dest: (src, ..., dest) } }
+        self._paths: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+
+        if graph is not None:
+            self._build(graph)
+
+    def _build(self, graph: MultiDiGraph) -> None:
+        """Compute fluidic neighbors of every node and shortest paths between
+        every pair of nodes.
+
+        Args:
+            graph (MultiDiGraph): Graph to compute routing table of.
+        """
+        self.graph_hash = graph_hash(graph)
+        successors = {node: [] for node in graph.nodes}
+        neighbors = {node: {} for node in graph.nodes}
+        for src, dest in graph.edges():
+            if (dest not in successors[src]
+                    and is_fluidic_edge(graph, src, dest)):
+                successors[src].append(dest)
+                neighbors[src][dest] = None
+                neighbors[dest][src] = None
+        self._neighbors = {
+            node: tuple(node_neighbors)
+            for node, node_neighbors in neighbors.items()
+        }
+
+        # Breadth first search from every node.
+        for src in graph.nodes:
+            next_hops = {}
+            queue = [src]
+            for node in queue:
+                for successor in successors[node]:
+                    if successor != src and successor not in next_hops:
+                        next_hops[successor] = (
+                            successor if node == src else next_hops[node])
+                        queue.append(successor)
+            self._next_hops[src] = next_hops
+        self._build_paths()
+
+    def _build_paths(self) -> None:
+        """Build shortest paths from next hops. Paths are always built this
+        way, rather than kept from the breadth first search, so that routing
+        tables loaded with :py:meth:`from_bytes` give the same paths.
+        """
+        self._paths = {}
+        for src, next_hops in self._next_hops.items():
+            paths = {src: (src,)}
+            for dest in next_hops:
+                path = [src]
+                while path[-1] != dest:
+                    path.append(self._next_hops[path[-1]][dest])
+                paths[dest] = tuple(path)
+            self._paths[src] = paths
+
+    def path(self, src: str, dest: str) -> Optional[Tuple[str, ...]]:
+        """Return shortest fluidic path from ``src`` to ``dest``.
+
+        Args:
+            src (str): Node path starts at.
+            dest (str): Node path ends at.
+
+        Returns:
+            Optional[Tuple[str, ...]]: Nodes in path, including ``src`` and
+            ``dest``. ``None`` if there is no path.
+        """
+        return self._paths.get(src, {}).get(dest, None)
+
+    def distance(self, src: str, dest: str) -> Optional[int]:
+        """Return number of edges in shortest fluidic path from ``src`` to
+        ``dest``.
+
+        Args:
+            src (str): Node path starts at.
+            dest (str): Node path ends at.
+
+        Returns:
+            Optional[int]: Number of edges in path. ``None`` if there is no
+            path.
+        """
+        path = self.path(src, dest)
+        if path is None:
+            return None
+        return len(path) - 1
+
+    def is_connected(self, src: str, dest: str) -> bool:
+        """Return ``True`` if there is a fluidic path from ``src`` to
+        ``dest``.
+
+        Args:
+            src (str): Node path starts at.
+            dest (str): Node path ends at.
+
+        Returns:
+            bool: ``True`` if there is a path, otherwise ``False``.
+        """
+        return dest in self._paths.get(src, {})
+
+    def nodes_between(self, src: str, dest: str) -> Tuple[str, ...]:
+        """Return nodes on shortest fluidic path from ``src`` to ``dest``,
+        not including ``src`` and ``dest``.
+
+        Args:
+            src (str): Node path starts at.
+            dest (str): Node path ends at.
+
+        Returns:
+            Tuple[str, ...]: Nodes between ``src`` and ``dest``. Empty if
+            nodes are neighbors or there is no path.
+        """
+        path = self.path(src, dest)
+        if path is None:
+            return ()
+        return path[1:-1]
+
+    def fluidic_neighbors(self, node: str) -> Tuple[str, ...]:
+        """Return nodes connected to node by a fluidic edge in either
+        direction.
+
+        Args:
+            node (str): Node to get fluidic neighbors of.
+
+        Returns:
+            Tuple[str, ...]: Fluidic neighbors of node, in edge order.
+        """
+        return self._neighbors.get(node, ())
+
+    def to_bytes(self) -> bytes:
+        """Serialise routing table, so that it can be stored in a cache.
+
+        Returns:
+            bytes: Routing table serialised as JSON. Paths are stored as next
+            hops to keep size proportional to number of node pairs.
+        """
+        return json.dumps({
+            'version': ROUTING_TABLE_FORMAT_VERSION,
+            'graph_hash': self.graph_hash,
+            'neighbors': self._neighbors,
+            'next_hops': self._next_hops,
+        }, separators=(',', ':')).encode('utf8')
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'RoutingTable':
+        """Load routing table serialised with :py:meth:`to_bytes`.
+
+        Args:
+            data (bytes): Serialised routing table.
+
+        Returns:
+            RoutingTable: Loaded routing table.
+
+        Raises:
+            ValueError: If data is not a routing table serialised with the
+                current format version.
+        """
+        table_json = json.loads(data.decode('utf8'))
+        if table_json.get('version', None) != ROUTING_TABLE_FORMAT_VERSION:
+            raise ValueError('Routing table has wrong format version.')
+
+        routing_table = cls()
+        routing_table.graph_hash = table_json['graph_hash']
+        routing_table._neighbors = {
+            node: tuple(neighbors)
+            for node, neighbors in table_json['neighbors'].items()
+        }
+        routing_table._next_hops = table_json['next_hops']
+        routing_table._build_paths()
+        return routing_table
+
+def get_routing_table(graph: MultiDiGraph) -> RoutingTable:
+    """Get routing table of graph. Routing tables are kept in memory by graph
+    hash, so are only computed once for every graph, and if caches are
+    enabled (see :py:mod:`xdl.utils.cache`) are stored on disk alongside
+    compiled procedures.
+
+    Args:
+        graph (MultiDiGraph): Graph to get routing table of.
+
+    Returns:
+        RoutingTable: Routing table of graph.
+    """
+    key = graph_hash(graph)
+    with _routing_tables_lock:
+        routing_table = _routing_tables.get(key, None)
+        if routing_table is not None:
+            _routing_tables.move_to_end(key)
+            return routing_table
+
+    if cache_enabled():
+        cache = get_cache(ROUTING_CACHE_NAME)
+        disk_key = hash_key(key, ROUTING_TABLE_FORMAT_VERSION)
+        data = cache.get(disk_key)
+        if data is not None:
+            try:
+                routing_table = RoutingTable.from_bytes(data)
+
+            # Entry is corrupt, remove it and compute routing table.
+            except (ValueError, KeyError, TypeError):
+                cache.delete(disk_key)
+
+        if routing_table is None:
+            routing_table = RoutingTable(graph)
+            cache.set(disk_key, routing_table.to_bytes())
+
+    else:
+        routing_table = RoutingTable(graph)
+
+    with _routing_tables_lock:
+        _routing_tables[key] = routing_table
+        while len(_routing_tables) > ROUTING_TABLE_MEMORY_CACHE_SIZE:
+            _routing_tables.popitem(last=False)
+    return routing_table
@@ -0,0 +1,178 @@
+"""Canonical, stable hashing of XDL elements.
+
+Structural hashes are SHA256 hex digests computed from the type of an element
+and its sanitised properties, and for steps, bottom up from the hashes of
+child steps. They don't depend on step UUIDs or on the process, so they are the
+same every time a procedure is loaded.
+
+Values are converted to a canonical form before hashing so that values that
+compare equal always give the same hash. This means that hashes that differ
+prove that elements are not equal, but hashes that are the same don't prove
+that elements are equal, as some distinct values share a canonical form:
+
+    * ``int``, ``float`` and ``bool`` values are hashed as floats, as
+      ``1 == 1.0 == True``.
+    * ``None`` and ``''`` are hashed the same, as they are treated as equal by
+      :py:func:`xdl.utils.misc.steps_are_equal`.
+    * Callables are hashed by qualified name, and any other object not listed
+      here by type name.
+
+Graph hashes are computed the same way from the nodes and edges of the graph
+and their attributes, leaving out attributes that only affect how the
+graph is drawn in the graph editor, such as node positions. Moving nodes
+around therefore doesn't change the graph hash, so doesn't stop procedures
+compiled with the graph from being executed.
+"""
+import hashlib
+from typing import Any, Dict, FrozenSet, Iterable
+
+from networkx import MultiDiGraph
+
+def canonical_value(value: Any) -> str:
+    """Return canonical str of property value for hashing.
+
+    Args:
+        value (Any): Property value.
+
+    Returns:
+        str: Canonical str of ``value``.
+    """
+    value_type = type(value)
+    if value is None or value == '':
+        return 'e'
+
+    # Length prefixed so that strings containing separators can't be confused
+    # with lists of strings.
+    elif value_type is str:
+        return f's{len(value)}:{value}'
+
+    elif value_type in (float, int, bool):
+        try:
+            return f'n{float(value)!r}'
+        except OverflowError:
+            return f'n{value}'
+
+    elif value_type in (list, tuple):
+        return 'l[' + ','.join(canonical_value(item) for item in value) + ']'
+
+    elif value_type is dict:
+        return 'd{' + ','.join(
+            f'{canonical_value(k)}:{canonical_value(v)}'
+            for k, v in sorted(value.items(), key=lambda item: str(item[0]))
+        ) + '}'
+
+    # Steps
+    elif hasattr(value, 'structural_hash'):
+        return f'h{value.structural_hash}'
+
+    elif callable(value):
+        func = getattr(value, '__func__', value)
+        return 'f' + getattr(func, '__module__', '') + '.' + getattr(
+            func, '__qualname__', type(value).__qualname__)
+
+    return f'o{value_type.__module__}.{value_type.__qualname__}'
+
+def structural_hash(
+    name: str,
+    properties: Dict[str, Any],
+    child_hashes: Iterable[str] = (),
+) -> str:
+    """Return structural hash of XDL element.
+
+    Args:
+        name (str): Type name of element.
+        properties (Dict[str, Any]): Properties of element. ``'children'``
+            property is ignored, the hashes of the children should be given
+            as ``child_hashes``.
+        child_hashes (Iterable[str]): Structural hashes of child steps.
+
+    Returns:
+        str: SHA256 hex digest.
+    """
+    parts = [name]
+    for prop, value in sorted(properties.items()):
+        if prop != 'children':
+            parts.append(f'{prop}={canonical_value(value)}')
+    parts.append('children=' + ','.join(child_hashes))
+    return hashlib.sha256('\n'.join(parts).encode('utf8')).hexdigest()
+
+
+#: Node, edge and graph attributes left out of graph hashes. These are the
+#: layout of the graph and the IDs used internally by the graph editor, which
+#: don't affect compilation or execution.
+GRAPH_HASH_IGNORED_ATTRS: FrozenSet[str] = frozenset({
+    'x',
+    'y',
+    'position',
+    'id',
+    'internalId',
+    'sourceInternal',
+    'targetInternal',
+})
+
+#: Modulus of sums of node and edge hashes in graph hashes.
+_GRAPH_HASH_MODULUS = 1 << 256
+
+def graph_hash(graph: MultiDiGraph) -> str:
+    """Return canonical hash of graph. The hash doesn't depend on the order
+    nodes and edges were added to the graph, or on attributes in
+    :py:data:`GRAPH_HASH_IGNORED_ATTRS`.
+
+    Nodes and edges are hashed one at a time and their hashes summed, so the
+    hash is computed in one pass without sorting the nodes and edges. The hash
+    isn't cached, as attribute values of the graph can be changed in place.
+
+    Args:
+        graph (MultiDiGraph): Graph to hash.
+
+    Returns:
+        str: SHA256 hex digest of graph.
+    """
+    node_sum = 0
+    for node, data in graph.nodes(data=True):
+        node_sum += _item_hash(
+            f'n{canonical_value(node)}{_canonical_attrs(data)}')
+
+    edge_sum = 0
+    for src, dest, data in graph.edges(data=True):
+        edge_sum += _item_hash(
+            f'e{canonical_value(src)}>{canonical_value(dest)}'
+            f'{_canonical_attrs(data)}')
+
+    sha256 = hashlib.sha256()
+    sha256.update(f'g{_canonical_attrs(graph.graph)}\n'.encode('utf8'))
+    sha256.update(
+        f'n{graph.number_of_nodes()}:{node_sum % _GRAPH_HASH_MODULUS:064x}\n'
+        .encode('utf8'))
+    sha256.update(
+        f'e{graph.number_of_edges()}:{edge_sum % _GRAPH_HASH_MODULUS:064x}\n'
+        .encode('utf8'))
+    return sha256.hexdigest()
+
+def _item_hash(canonical_item: str) -> int:
+    """Return hash of canonical str of graph node or edge as int, for summing
+    into graph hash.
+
+    Args:
+        canonical_item (str): Canonical str of node or edge.
+
+    Returns:
+        int: SHA256 digest of ``canonical_item`` as int.
+    """
+    return int.from_bytes(
+        hashlib.sha256(canonical_item.encode('utf8')).digest(), 'big')
+
+def _canonical_attrs(attrs: Dict[str, Any]) -> str:
+    """Return canonical str of node, edge or graph attributes, leaving out
+    attributes in :py:data:`GRAPH_HASH_IGNORED_ATTRS`.
+
+    Args:
+        attrs (Dict[str, Any]): Attributes.
+
+    Returns:
+        str: Canonical str of attributes.
+    """
+    return canonical_value({
+        attr: value for attr, value in attrs.items()
+        if attr not in GRAPH_HASH_IGNORED_ATTRS
+    })
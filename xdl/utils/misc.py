@@ -292,12 +292,15 @@ def steps_are_equal(step: 'Step', other_step: 'Step') -> bool:
     accepted_none_values = [None, '']
     if step.name != other_step.name:
         return False
+    # Different structural hash, not equal
+    if step.structural_hash != other_step.structural_hash:
+        return False
     for prop, val in step.properties.items():
         if prop != 'children':
             # Accept '' and None as being equal, otherwise JSON loading and
             # XML loading differ as JSON converts empty strings to None.
             if (val in accepted_none_values
-                    and step.properties[prop] in accepted_none_values):
+                    and other_step.properties[prop] in accepted_none_values):
                 continue
             if val != other_step.properties[prop]:
                 return False
@@ -328,11 +331,15 @@ def xdl_elements_are_equal(
     accepted_none_values = [None, '']
     if type(xdl_element).__name__ != type(other_xdl_element).__name__:
         return False
+    # Different structural hash, not equal
+    if xdl_element.structural_hash != other_xdl_element.structural_hash:
+        return False
     for prop, val in xdl_element.properties.items():
         # Accept '' and None as being equal, otherwise JSON loading and
         # XML loading differ as JSON converts empty strings to None.
         if (val in accepted_none_values
-                and xdl_element.properties[prop] in accepted_none_values):
+                and other_xdl_element.properties[prop]
+                in accepted_none_values):
             continue
         if val != other_xdl_element.properties[prop]:
             return False
@@ -5,7 +5,7 @@ that property.
 """
 
 import re
-from typing import List, Optional
+from typing import FrozenSet, List, Optional, Pattern
 
 class PropLimit(object):
     """Convenience class for storing prop limit. A prop limit is essentially a
@@ -27,6 +27,14 @@ class PropLimit(object):
         enum (List[str]): List of values that the prop can take. This is used
             to automatically generate a regex from the list of allowed values.
     """
+
+    # Compiled regex. Compiled whenever regex is set.
+    _pattern: Pattern = None
+
+    # Values in enum that match regex. Checked with a set lookup before falling
+    # back to regex, as this is much faster.
+    _valid_enum_values: FrozenSet[str] = frozenset()
+
     def __init__(
         self,
         regex: Optional[str] = None,
@@ -41,7 +49,7 @@ class PropLimit(object):
         self.default = default
 
         # If enum given generate regex from this
-        self.enum = enum
+        self._enum = enum
         if enum:
             if not regex:
                 self.regex = self.generate_enum_regex()
@@ -58,6 +66,37 @@ class PropLimit(object):
             self.regex = regex
             self.hint = hint
 
+    @property
+    def regex(self) -> str:
+        """Regex pattern that valid values match."""
+        return self._regex
+
+    @regex.setter
+    def regex(self, regex: str) -> None:
+        self._regex = regex
+        self._pattern = re.compile(regex)
+        self._update_valid_enum_values()
+
+    @property
+    def enum(self) -> List[str]:
+        """List of values that the prop can take."""
+        return self._enum
+
+    @enum.setter
+    def enum(self, enum: List[str]) -> None:
+        self._enum = enum
+        self._update_valid_enum_values()
+
+    def _update_valid_enum_values(self) -> None:
+        """Update set of enum values that are valid according to regex, used
+        as fast path in :py:meth:`validate`.
+        """
+        if self._pattern is None or not self._enum:
+            self._valid_enum_values = frozenset()
+        else:
+            self._valid_enum_values = frozenset(
+                item for item in self._enum if self._pattern.match(item))
+
     def validate(self, value: str) -> bool:
         """Validate given value against prop limit regex.
 
@@ -67,7 +106,9 @@ class PropLimit(object):
         Returns:
             bool: True if the value matches the prop limit, otherwise False.
         """
-        return re.match(self.regex, value) is not None
+        if value in self._valid_enum_values:
+            return True
+        return self._pattern.match(value) is not None
 
     def generate_enum_regex(self) -> str:
         """Generate regex from :py:attr:`enum`. Regex will match any of the
@@ -2,7 +2,8 @@
 and converting values to floats in standard units.
 """
 
-from typing import Union, Dict, Callable
+from typing import Any, Union, Dict, Callable, Iterable, List
+import functools
 import re
 from .prop_limits import (
     POSITIVE_FLOAT_PROP_LIMIT,
@@ -29,6 +30,15 @@ FLOAT_REGEX_PATTERN: str = r'([-]?[0-9]+(?:[.][0-9]+)?)'
 #: e.g. match 'mL' in '5 mL'. The 3 is there to match 'cm3'.
 UNITS_REGEX_PATTERN: str = r'[a-zA-Zμ°]+[3]?'
 
+#: Max number of distinct strings to remember the converted values of in
+#: :py:func:`convert_val_to_std_units`.
+UNIT_CONVERSION_CACHE_SIZE: int = 4096
+
+# Compiled once here, rather than looked up in the re module cache for every
+# value converted.
+_FLOAT_REGEX = re.compile(FLOAT_REGEX_PATTERN)
+_UNITS_REGEX = re.compile(UNITS_REGEX_PATTERN)
+
 #########
 # Utils #
 #########
@@ -272,6 +282,9 @@ def convert_val_to_std_units(val: Union[str, float]) -> float:
     temp      °c
     mass      g
 
+    Converted values of strings are remembered, so converting the same string
+    again is just a lookup.
+
     Arguments:
         val (Union[str, float]): Value (and units) as str, or float. If no units
             are specified it is assumed value is already in default units. If
@@ -284,13 +297,50 @@ def convert_val_to_std_units(val: Union[str, float]) -> float:
     if type(val) != str:
         return val
 
+    return _convert_str_to_std_units(val)
+
+def convert_vals_to_std_units(vals: Iterable[Union[str, float]]) -> List[Any]:
+    """Convert many values to standard units in one call, for example all
+    ``volume`` props in a procedure. Each distinct string is only converted
+    once.
+
+    Arguments:
+        vals (Iterable[Union[str, float]]): Values (and units) as str, or
+            floats. See :py:func:`convert_val_to_std_units`.
+
+    Returns:
+        List[Any]: Values in default units, in the same order as ``vals``.
+    """
+    converted = {}
+    result = []
+    for val in vals:
+        if type(val) != str:
+            result.append(val)
+        else:
+            if val not in converted:
+                converted[val] = _convert_str_to_std_units(val)
+            result.append(converted[val])
+    return result
+
+@functools.lru_cache(maxsize=UNIT_CONVERSION_CACHE_SIZE)
+def _convert_str_to_std_units(val: str) -> Union[str, float]:
+    """Convert str of value with/without units to float in standard units. See
+    :py:func:`convert_val_to_std_units`.
+
+    Arguments:
+        val (str): Value (and units) as str.
+
+    Returns:
+        Union[str, float]: Value in default units, or ``val`` unchanged if no
+        number can be found in it.
+    """
     # Get number from string
-    number_search = re.search(FLOAT_REGEX_PATTERN, val)
+    number_search = _FLOAT_REGEX.search(val)
     if number_search:
         number = float(number_search[0])
 
         # Get unit from string
-        unit_search = re.search(UNITS_REGEX_PATTERN, val)
+        unit_search = _UNITS_REGEX.search(val)
         if unit_search:
             unit = unit_search[0]
 
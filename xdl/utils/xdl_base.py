@@ -1,8 +1,9 @@
-from typing import Dict, Any, List, Union
+from typing import Callable, Dict, Any, List, Optional, Sequence, Union
 import json
-import copy
+import weakref
 from .sanitisation import (
     DEFAULT_PROP_LIMITS, convert_val_to_std_units, parse_bool)
+from .hashing import structural_hash
 from .logging import get_logger
 from ..errors import (
     XDLMissingDefaultPropError,
@@ -23,8 +24,11 @@ class XDLBase(object):
     This is where ``XDLBase`` subclasses become funky. After initialization,
     everything in the properties dict, so everything that was passed to the
     constructor (essentially everything in ``PROP_TYPES``), can be accessed as a
-    class attribute, due to the ``__getattr__`` and ``__setattr__`` overrides
-    here.
+    class attribute. This is done by :py:class:`PropDescriptor` data
+    descriptors added to the class for every prop in ``PROP_TYPES`` when the
+    first instance of the class is created, with the ``__getattr__`` and
+    ``__setattr__`` overrides here as a fallback for props that don't have a
+    descriptor.
 
     So taking a step as an example:
 
@@ -36,7 +40,7 @@ class XDLBase(object):
 
     ``step.volume = 15`` is not the same as ``step.properties[volume] = 15``.
 
-    The override of ``__setattr__`` means that when any value in the properties
+    The prop descriptors mean that when any value in the properties
     dict is set, as well as updating the properties dict, the update method is
     called. This sanitizes/validates values and adds defaults as necessary.
 
@@ -131,15 +135,27 @@ class XDLBase(object):
     # as described by the prop specification variables above.
     properties: Dict[str, Any] = {}
 
+    # Cached structural hash. Reset whenever properties change.
+    _structural_hash: str = None
+
+    # Weak references to objects with cached values calculated from this
+    # object, e.g. the structural hashes of steps containing it. Their caches
+    # are cleared whenever the caches of this object are. See _add_dependent.
+    _dependents: List['weakref.ref'] = None
+
+    # Incremented whenever properties change, so that anything derived from
+    # properties can tell whether it is out of date without comparing
+    # properties.
+    _properties_version: int = 0
+
     def __init__(self, param_dict: Dict[str, Any]) -> None:
         """Initialize properties dict and loggger."""
-        # Make copies so that class attributes remain unaffected.
-        self.PROP_TYPES = copy.copy(self.PROP_TYPES)
-        self.DEFAULT_PROPS = copy.copy(self.DEFAULT_PROPS)
-
-        # Add global optional comment prop
-        self.PROP_TYPES['comment'] = str
-        self.DEFAULT_PROPS['comment'] = ''
+        # Use prop specification of class with global optional comment prop
+        # added. These dicts are shared by all instances of the class so must
+        # not be modified.
+        schema = self._get_schema()
+        self.PROP_TYPES = schema.prop_types
+        self.DEFAULT_PROPS = schema.default_props
 
         # comment property passed in kwargs so add this to main param_dict
         if 'kwargs' in param_dict:
@@ -174,10 +190,79 @@ class XDLBase(object):
         """
         self._load_properties(self.properties)
 
+    @property
+    def structural_hash(self) -> str:
+        """Hash of element type and properties. Stable across processes and
+        cached until properties change. Elements that are equal always have
+        the same hash, so elements with different hashes are not equal. See
+        :py:mod:`xdl.utils.hashing`.
+
+        Returns:
+            str: SHA256 hex digest of element.
+        """
+        if self._structural_hash is None:
+            self._structural_hash = structural_hash(
+                type(self).__name__, self.properties)
+        return self._structural_hash
+
+    def _on_properties_changed(self) -> None:
+        """Called whenever properties are changed via attribute assignment or
+        :py:meth:`update`. Clears everything cached based on properties and
+        increments :py:attr:`_properties_version`.
+        """
+        self._clear_caches()
+        self._properties_version += 1
+
+    def _add_dependent(self, dependent: Any) -> None:
+        """Record that ``dependent`` has cached values calculated from this
+        object, so that its caches are cleared when the caches of this object
+        are. Dependents are forgotten once their caches are cleared, and add
+        themselves again when they next cache anything.
+
+        Args:
+            dependent (Any): Object with ``_clear_caches`` method, e.g. step
+                containing this object.
+        """
+        ref = weakref.ref(dependent)
+        if self._dependents is None:
+            self._dependents = [ref]
+        elif ref not in self._dependents:
+            self._dependents.append(ref)
+
+    def _clear_caches(self) -> None:
+        """Clear everything cached based on properties, and the caches of all
+        dependents, so that edits propagate up to the root of the step tree
+        without anything having to check its children for changes.
+        """
+        self._structural_hash = None
+        dependents = self._dependents
+        if dependents is not None:
+            self._dependents = None
+            for ref in dependents:
+                dependent = ref()
+                if dependent is not None:
+                    dependent._clear_caches()
+
     #####################
     # Prop Sanitization #
     #####################
 
+    @classmethod
+    def _get_schema(cls) -> 'PropSchema':
+        """Return compiled prop specification of class, compiling it on first
+        use. Changes made to the prop specification variables of a class after
+        the first instance has been created are not picked up.
+
+        Returns:
+            PropSchema: Compiled prop specification of class.
+        """
+        schema = cls.__dict__.get('_prop_schema', None)
+        if schema is None:
+            schema = PropSchema(cls)
+            _add_prop_descriptors(cls, schema.prop_types)
+            cls._prop_schema = schema
+        return schema
+
     def _load_properties(self, properties: Dict[str, Any]) -> None:
         """Load dict of properties into :py:attr:`properties`.
         Add default values from ``DEFAULT_PROPS`` where ``'default'`` is given
@@ -187,10 +272,15 @@ class XDLBase(object):
             properties (Dict[str, Any]): dict of property names and values.
         """
         # Add new properties to self.properties
-        for prop in self.PROP_TYPES:
+        self_properties = self.properties
+        for prop, clean in self._get_schema().cleaners.items():
             if prop in properties:
-                self.properties[prop] = self._load_property(
-                    prop, properties[prop])
+                value = properties[prop]
+                if value == 'default':
+                    self_properties[prop] = self._get_default(prop)
+                else:
+                    self_properties[prop] = clean(value)
+        self._on_properties_changed()
 
     def _load_property(self, prop: str, value: Any) -> Any:
         """If value is ``'default'``, return default value. Otherwise return
@@ -244,12 +334,270 @@ class XDLBase(object):
             XDLFailedPropLimitError: If prop limit validation fails.
             XDLTypeConversionError: If unable to convert to type specified in
                 :py:attr:`PROP_TYPES`
+            XDLMissingPropTypeError: If prop type not found for prop in
+                :py:attr:`PROP_TYPES`
         """
+        try:
+            clean = self._get_schema().cleaners[prop]
+        except KeyError:
+            raise XDLMissingPropTypeError(type(self).__name__, prop)
+        return clean(value)
 
-        # Return children unchanged.
-        if prop == 'children':
-            return value
+    #################
+    # Magic Methods #
+    #################
+
+    def _set_property(self, name: str, value: Any) -> None:
+        """Do ``self.properties[name] = value`` after sanitizing/validating
+        value and adding default value if necessary. Properties are only marked
+        as changed if the sanitized value is different to the current value.
+
+        Args:
+            name (str): Prop to set. Must be in :py:attr:`properties`.
+            value (Any): New value of prop.
+        """
+        value = self._load_property(name, value)
+        if not _is_same_value(self.properties[name], value):
+            self.properties[name] = value
+            self._on_properties_changed()
+
+    def __getattr__(self, name: str) -> None:
+        """
+        If name is in :py:attr:`properties` return ``self.properties[name]``.
+        Otherwise return attribute as normal. Only used for props that don't
+        have a :py:class:`PropDescriptor`, see :py:func:`_add_prop_descriptors`.
+        """
+        # attr in self.properties, return value from self.properties
+        if name in self.properties:
+            return self.properties[name]
+
+        # attr not in self.properties, return as normal
+        else:
+            return object.__getattribute__(self, name)
 
+    def __deepcopy__(self, memo):
+        """Allow ``copy.deepcopy(step)`` to be called. Default deepcopy works,
+        but not on Python 3.6, so that is what this is for. When Python 3.6 is
+        not supported this can go.
+        """
+        return self._copy_state()
+
+    def _copy_state(self) -> 'XDLBase':
+        """Return copy of object made by copying its attributes and properties
+        directly, rather than calling ``__init__``, so properties that have
+        already been sanitized and validated aren't sanitized and validated
+        again. List property values are copied, other values are immutable
+        once sanitized so are shared.
+
+        Returns:
+            XDLBase: Copy of object.
+        """
+        copied = object.__new__(type(self))
+        state = dict(self.__dict__)
+        state.pop('_dependents', None)
+        state['properties'] = {
+            prop: list(value) if type(value) == list else value
+            for prop, value in self.properties.items()
+        }
+        copied.__dict__.update(state)
+        return copied
+
+
+def _setattr_fallback(self: XDLBase, name: str, value: Any) -> None:
+    """``__setattr__`` of classes with props that don't have a
+    :py:class:`PropDescriptor`. If name is in :py:attr:`XDLBase.properties`
+    set property with :py:meth:`XDLBase._set_property`, otherwise set attribute
+    as normal.
+    """
+    if name in self.properties:
+        self._set_property(name, value)
+    else:
+        object.__setattr__(self, name, value)
+
+class PropDescriptor(object):
+    """Data descriptor giving attribute access to a prop in
+    :py:attr:`XDLBase.properties`. Getting the attribute returns the value in
+    the properties dict directly, and setting it sanitizes and validates the
+    new value with :py:meth:`XDLBase._set_property`.
+
+    As with the ``__getattr__`` and ``__setattr__`` overrides this replaces,
+    if the prop is not in the properties dict the attribute is got and set as
+    normal, and a value in the instance ``__dict__`` takes precedence over the
+    properties dict.
+
+    Args:
+        name (str): Name of prop.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: XDLBase, objtype: type = None) -> Any:
+        if obj is None:
+            return self
+        name = self.name
+        attrs = obj.__dict__
+        if name in attrs:
+            return attrs[name]
+        try:
+            return attrs['properties'][name]
+        except KeyError:
+            raise AttributeError(
+                f'{type(obj).__name__!r} object has no attribute {name!r}')
+
+    def __set__(self, obj: XDLBase, value: Any) -> None:
+        name = self.name
+        attrs = obj.__dict__
+        properties = attrs.get('properties', None)
+        if properties is not None and name in properties:
+            # Same as XDLBase._set_property, inlined as this is called every
+            # time a prop is set.
+            value = obj._load_property(name, value)
+            if not _is_same_value(properties[name], value):
+                properties[name] = value
+                obj._on_properties_changed()
+        else:
+            attrs[name] = value
+
+    def __delete__(self, obj: XDLBase) -> None:
+        try:
+            del obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+def _add_prop_descriptors(cls: type, prop_types: Dict[str, Any]) -> None:
+    """Add :py:class:`PropDescriptor` to class for every prop that doesn't
+    already have one. Props with the same name as a method or other class
+    attribute are left to the ``__getattr__`` override, as before, and the
+    ``__setattr__`` fallback is added to the class so that setting them still
+    updates the properties dict.
+
+    Args:
+        cls (type): ``XDLBase`` subclass to add descriptors to.
+        prop_types (Dict[str, Any]): Prop types of class.
+    """
+    shadowed = False
+    for prop in prop_types:
+        for klass in cls.__mro__:
+            if prop in klass.__dict__:
+                if type(klass.__dict__[prop]) is not PropDescriptor:
+                    shadowed = True
+                break
+        else:
+            setattr(cls, prop, PropDescriptor(prop))
+    if shadowed:
+        cls.__setattr__ = _setattr_fallback
+
+
+#: Types of property values that are compared by value to decide whether a
+#: property has changed. Any other values, e.g. lists of child steps, are only
+#: unchanged if they are the same object.
+_VALUE_TYPES = (str, int, float, bool, type(None))
+
+def same_objects(objects: Sequence, other_objects: Sequence) -> bool:
+    """Return ``True`` if both sequences contain the same objects, compared
+    by identity, in the same order. Used to check whether lists of child steps
+    have been changed in place since something was cached from them.
+
+    Args:
+        objects (Sequence): Objects to compare.
+        other_objects (Sequence): Objects to compare with.
+
+    Returns:
+        bool: ``True`` if sequences contain the same objects.
+    """
+    if len(objects) != len(other_objects):
+        return False
+    for obj, other_obj in zip(objects, other_objects):
+        if obj is not other_obj:
+            return False
+    return True
+
+def _is_same_value(old_value: Any, new_value: Any) -> bool:
+    """Return ``True`` if setting property to ``new_value`` doesn't change it
+    from ``old_value``.
+
+    Args:
+        old_value (Any): Current value of property.
+        new_value (Any): Sanitized new value of property.
+
+    Returns:
+        bool: ``True`` if property is unchanged, otherwise ``False``.
+    """
+    if old_value is new_value:
+        return True
+    return (type(old_value) is type(new_value)
+            and type(new_value) in _VALUE_TYPES
+            and old_value == new_value)
+
+class PropSchema(object):
+    """Prop specification of an ``XDLBase`` subclass compiled into a table of
+    cleaning functions, one per prop. Compiled once per class by
+    :py:meth:`XDLBase._get_schema`, so that the prop type and prop limit of
+    every prop don't have to be looked up every time a value is cleaned.
+
+    Args:
+        cls (type): ``XDLBase`` subclass to compile prop specification of.
+
+    Attributes:
+        prop_types (Dict[str, Union[type, str]]): ``PROP_TYPES`` of class with
+            global ``comment`` prop added.
+        default_props (Dict[str, Any]): ``DEFAULT_PROPS`` of class with
+            default for global ``comment`` prop added.
+        prop_limits (Dict[str, Optional[PropLimit]]): Prop limit of every prop,
+            either from ``PROP_LIMITS`` or the default prop limit for the prop
+            type. ``None`` if prop has no prop limit.
+        cleaners (Dict[str, Callable[[Any], Any]]): Function for every prop that
+            validates a value against the prop limit and converts it to the
+            prop type.
+    """
+
+    def __init__(self, cls: type) -> None:
+        self.prop_types = dict(cls.PROP_TYPES, comment=str)
+        self.default_props = dict(cls.DEFAULT_PROPS, comment='')
+        self.prop_limits = {}
+        self.cleaners = {}
+        for prop, prop_type in self.prop_types.items():
+            if prop in cls.PROP_LIMITS:
+                prop_limit = cls.PROP_LIMITS[prop]
+            else:
+                prop_limit = DEFAULT_PROP_LIMITS.get(prop_type, None)
+            self.prop_limits[prop] = prop_limit
+            self.cleaners[prop] = _make_cleaner(
+                cls.__name__, prop, prop_type, prop_limit)
+
+def _make_cleaner(
+    name: str,
+    prop: str,
+    prop_type: Union[type, str],
+    prop_limit: Optional[PropLimit],
+) -> Callable[[Any], Any]:
+    """Return function that cleans values of prop. Strings have double spaces
+    removed and are stripped, ``'None'`` is converted to ``None``, and then
+    values are validated against the prop limit and converted to the prop type.
+
+    Args:
+        name (str): Name of class prop belongs to, used in error messages.
+        prop (str): Prop to clean values of.
+        prop_type (Union[type, str]): Prop type of prop.
+        prop_limit (Optional[PropLimit]): Prop limit of prop.
+
+    Returns:
+        Callable[[Any], Any]: Function that takes value and returns cleaned
+        value.
+
+    Raises (returned function):
+        XDLFailedPropLimitError: If prop limit validation fails.
+        XDLTypeConversionError: If unable to convert to prop type.
+    """
+    # Return children unchanged.
+    if prop == 'children':
+        return lambda value: value
+
+    convert = _make_converter(name, prop, prop_type)
+    validate = prop_limit.validate if prop_limit is not None else None
+
+    def clean(value: Any) -> Any:
         # If string, remove any double spaces and strip
         if type(value) == str:
             while '  ' in value:
@@ -261,80 +609,98 @@ class XDLBase(object):
             return None
 
         # Validate using prop limit
-        self._test_prop_limit(prop, value)
+        if validate is not None and value != '':
+            str_value = str(value)
+            if not validate(str_value):
+                raise XDLFailedPropLimitError(
+                    name, prop, str_value, prop_limit)
 
         # Convert value to correct type, and convert to standard units if
         # necessary.
-        prop_type = self._get_prop_type(prop)
+        return convert(value)
+
+    return clean
 
-        # str prop type, reagent and vessel prop types are also str in terms
-        # of value sanitization
-        if prop_type in [str, REAGENT_PROP_TYPE, VESSEL_PROP_TYPE]:
+def _make_converter(
+    name: str, prop: str, prop_type: Union[type, str]
+) -> Callable[[Any], Any]:
+    """Return function that converts values of prop to the prop type. See
+    :py:attr:`XDLBase.PROP_TYPES` for the handling of each prop type.
+
+    Args:
+        name (str): Name of class prop belongs to, used in error messages.
+        prop (str): Prop to convert values of.
+        prop_type (Union[type, str]): Prop type of prop.
+
+    Returns:
+        Callable[[Any], Any]: Function that takes value and returns value
+        converted to prop type.
+    """
+    # str prop type, reagent and vessel prop types are also str in terms
+    # of value sanitization
+    if prop_type in [str, REAGENT_PROP_TYPE, VESSEL_PROP_TYPE]:
+        def convert(value):
             # Convert None values to empty string
             if value in [[], {}]:
                 return ''
             return str(value)
 
-        # float prop type, convert str to standard units. If value is not a str
-        # try to cast to float, if TypeError or ValueError is raised, raise
-        # XDLTypeConversionError.
-        elif prop_type == float:
+    # float prop type, convert str to standard units. If value is not a str
+    # try to cast to float, if TypeError or ValueError is raised, raise
+    # XDLTypeConversionError.
+    elif prop_type == float:
+        def convert(value):
             if type(value) == str:
                 return convert_val_to_std_units(value)
-            else:
-                try:
-                    return float(value)
-                except (TypeError, ValueError):
-                    raise XDLTypeConversionError(
-                        type(self).__name__, prop, prop_type, value)
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                raise XDLTypeConversionError(name, prop, prop_type, value)
 
-        # bool prop type
-        elif prop_type == bool:
+    # bool prop type
+    elif prop_type == bool:
+        def convert(value):
             if type(value) == str:
                 return parse_bool(value)
             elif type(value) == bool:
                 return value
-            else:
-                raise XDLTypeConversionError(
-                    type(self).__name__, prop, prop_type, value)
+            raise XDLTypeConversionError(name, prop, prop_type, value)
 
-        # Used by 3 option stir property in WashSolid (True, 'solvent' or False)
-        elif prop_type == Union[bool, str]:
+    # Used by 3 option stir property in WashSolid (True, 'solvent' or False)
+    elif prop_type == Union[bool, str]:
+        def convert(value):
             bool_value = parse_bool(value)
             # bool value found, return bool
             if bool_value is not None:
                 return bool_value
             # bool val not found just return str value
-            else:
-                return str(value)
+            return str(value)
 
-        # int prop type, try and cast to int, if TypeError or ValueError raised,
-        # raise XDLTypeConversionError
-        elif prop_type == int:
+    # int prop type, try and cast to int, if TypeError or ValueError raised,
+    # raise XDLTypeConversionError
+    elif prop_type == int:
+        def convert(value):
             try:
                 return int(value)
             except (TypeError, ValueError):
-                raise XDLTypeConversionError(
-                    type(self).__name__, prop, prop_type, value)
-
-        # List[str] prop type, parse space separated list or return
-        # list unchanged
-        elif prop_type == List[str]:
-            # Parse space separated list
+                raise XDLTypeConversionError(name, prop, prop_type, value)
+
+    # List[str] prop type, parse space separated list or return value
+    # unchanged
+    elif prop_type == List[str]:
+        def convert(value):
+            # Parse space separated list, converting 'None' string to
+            # NoneType
             if type(value) == str:
-                split_list = value.split()
-                # Convert 'None' string to NoneType
-                for i in range(len(split_list)):
-                    if split_list[i].lower() == 'none':
-                        split_list[i] = None
-                return split_list
-
-            # Value if already list, return unchanged
-            elif type(value) == list:
-                return value
+                return [
+                    None if item.lower() == 'none' else item
+                    for item in value.split()
+                ]
+            return value
 
-        # Union[str, int] prop type, used for ports
-        elif prop_type == Union[str, int]:
+    # Union[str, int] prop type, used for ports
+    elif prop_type == Union[str, int]:
+        def convert(value):
             if type(value) == str:
                 # Try and cast to int
                 try:
@@ -344,136 +710,19 @@ class XDLBase(object):
                     return str(value)
             elif type(value) == int:
                 return value
-            else:
-                return str(value)
+            return str(value)
 
-        # JSON string prop type
-        elif prop_type == JSON_PROP_TYPE:
+    # JSON string prop type
+    elif prop_type == JSON_PROP_TYPE:
+        def convert(value):
             if type(value) == str:
                 return json.loads(value.replace("'", '"'))
             return value
 
-        # If prop type not matched by any of these conditions, just return
-        # unchanged.
-        return value
-
-    def _get_prop_type(self, prop: str) -> Union[str, type]:
-        """Get prop type, raise error if prop type can't be found.
-
-        Returns:
-            Union[str, type]: Prop type of given prop.
-
-        Raises:
-            XDLMissingPropTypeError: If prop type not found for prop in
-                :py:attr:`PROP_TYPES`
-        """
-        try:
-            return self.PROP_TYPES[prop]
-        except KeyError:
-            raise XDLMissingPropTypeError(type(self).__name__, prop)
-
-    def _get_prop_limit(self, prop: str) -> PropLimit:
-        """Get prop limit.  If prop limit not found in :py:attr:`PROP_LIMITS`,
-        look for default prop limit based on type. If this can't be found return
-        ``None`` and don't do any prop limit validation.
-
-        Returns:
-            PropLimit: Prop limit of given prop.
-        """
-        # Try to get prop limit from self.PROP_LIMITS
-        try:
-            return self.PROP_LIMITS[prop]
-
-        except KeyError:
-            # Look for default prop limit to use based on type
-            prop_type = self.PROP_TYPES[prop]
-            if prop_type in DEFAULT_PROP_LIMITS:
-                return DEFAULT_PROP_LIMITS[prop_type]
-
-            # If no default prop limit can be found, allow None prop limit that
-            # does no validation, since some types can't really be validated.
-            else:
-                return None
-
-    def _test_prop_limit(self, prop: str, value: Any) -> None:
-        """Test given property value against prop limit.
-
-        Args:
-            prop (str): Property value corresponds to.
-            value (str): Value to test against relevant prop limit.
-
-        Raises:
-            XDLFailedPropLimitError: If given value is deemed invalid by prop
-                limit.
-        """
-        # None value, don't test
-        if value is None or value == '':
-            return
-
-        # Get prop limit
-        prop_limit = self._get_prop_limit(prop)
-
-        # No prop limit found, don't test
-        if prop_limit is None:
-            return
-
-        # Convert value to string if it isn't already a string
-        value = str(value)
-
-        # Test value against prop limit, and raise error if it fails the test
-        try:
-            assert prop_limit.validate(value)
-        except AssertionError:
-            # Value did not pass prop limit validation.
-            raise XDLFailedPropLimitError(
-                type(self).__name__, prop, value, prop_limit)
-
-    #################
-    # Magic Methods #
-    #################
-
-    def __setattr__(self, name: str, value: Any) -> None:
-        """
-        If name is in :py:attr:`properties` do ``self.properties[name] = value``
-        and call :py:meth:`update`. The purpose of this is that so whenever a
-        property is changed, it is sanitized/validated and default values are
-        added.
-
-        If attr is not in :py:attr:`properties` just set attribute as normal.
-        """
-        # attr in self.properties, add to properties dict and update
-        if name in self.properties:
-            self.properties[name] = self._load_property(name, value)
-
-        # attr not in self.properties, update as normal
-        else:
-            object.__setattr__(self, name, value)
-
-    def __getattr__(self, name: str) -> None:
-        """
-        If name is in :py:attr:`properties` return ``self.properties[name]``.
-        Otherwise return attribute as normal.
-        """
-        # attr in self.properties, return value from self.properties
-        if name in self.properties:
-            return self.properties[name]
-
-        # attr not in self.properties, return as normal
-        else:
-            return object.__getattribute__(self, name)
-
-    def __deepcopy__(self, memo):
-        """Allow ``copy.deepcopy(step)`` to be called. Default deepcopy works,
-        but not on Python 3.6, so that is what this is for. When Python 3.6 is
-        not supported this can go.
-        """
-        # Copy properties
-        copy_props = {}
-        for k, v in self.properties.items():
-            if k != 'children':
-                copy_props[k] = v
-
-        # Make new self
-        copied_self = type(self)(**copy_props)
+    # If prop type not matched by any of these conditions, just return
+    # unchanged.
+    else:
+        def convert(value):
+            return value
 
-        return copied_self
+    return convert
@@ -1,10 +1,10 @@
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union
 import os
 import copy
 import logging
 import json
-import re
 import datetime
+import functools
 import tabulate
 
 from .errors import (
@@ -20,6 +20,9 @@ from .errors import (
     XDLFileNotFoundError,
     XDLInvalidArgsError,
     XDLDoubleCompilationError,
+    XDLRecompileBeforeCompilationError,
+    XDLRecompileWithoutGraphError,
+    XDLRecompileOnDifferentGraphError,
     XDLLanguageUnavailableError,
     XDLInvalidSaveFormatError,
     XDLDurationBeforeCompilationError,
@@ -30,11 +33,17 @@ from .hardware import Hardware
 from .metadata import Metadata
 from .platforms.abstract_platform import AbstractPlatform
 from .reagents import Reagent
-from .readwrite.utils import read_file
-from .readwrite.xml_interpreter import xdl_str_to_objs
+from .readwrite.xml_interpreter import xdl_str_to_objs, xdl_file_to_objs
 from .readwrite.xml_generator import xdl_to_xml_string
 from .readwrite.json import xdl_to_json, xdl_from_json_file, xdl_from_json
+from .readwrite.binary import xdl_to_binary, xdl_binary_file_to_objs
+from .readwrite.parse_cache import load_cached
+from .execution.compile_cache import (
+    compile_cache_key, load_compiled, store_compiled)
+from .execution.plan import ExecutionPlan
 from .steps import Step, AbstractBaseStep
+from .steps.core.step import analysis_graph_hash
+from .steps.step_index import StepIndex
 from .steps.utils import FTNDuration
 from .utils.logging import get_logger
 from .utils.vessels import VesselSpec
@@ -44,6 +53,10 @@ from .utils.misc import (
     reagent_volumes_table
 )
 from .utils.localisation import get_available_languages
+from .utils.cache import cache_enabled
+from .utils.graph import get_graph
+from .utils.hashing import structural_hash
+from .utils.xdl_base import same_objects
 
 class XDL(object):
     """
@@ -53,7 +66,8 @@ class XDL(object):
     to ``__init__``.
 
     Args:
-        xdl(Union[str, Dict]): Path to XDL file  (.json, .xdl or .xdlexe), XDL
+        xdl(Union[str, Dict]): Path to XDL file  (.json, .xdl, .xdlexe or
+            .xdlbin), XDL
             XML string, or XDL JSON dict.
         steps (List[Step]): List of Step objects.
         hardware (Hardware): Hardware object containing all
@@ -66,6 +80,10 @@ class XDL(object):
             not be saved to a file.
         platform (AbstractPlatform): Optional. Target platform. If not given or
             given as ``None``, ``chemputerxdl.ChemputerPlatform`` will be used.
+        lazy (bool): Optional. If ``True`` and loading xdlexe, the substeps of
+            each step are only built from the xdlexe step record the first
+            time they are executed or inspected. Makes opening long compiled
+            procedures near instant. Defaults to ``False``.
 
     Raises:
         ValueError: If insufficient args provided to instantiate object.
@@ -96,6 +114,18 @@ class XDL(object):
     # self.compiled == True implies that procedure is ready to execute
     compiled = False
 
+    # Cached structural hash and lists of steps, reagents and components it
+    # was calculated from.
+    _structural_hash = None
+    _hashed_elements = None
+
+    # Flat execution plan of compiled procedure. Built when procedure is
+    # compiled, or when first asked for if loaded from xdlexe.
+    _execution_plan = None
+
+    # Index of steps by UUID. Built when first asked for.
+    _step_index = None
+
     def __init__(
         self,
         xdl: Union[str, Dict] = None,
@@ -104,7 +134,9 @@ class XDL(object):
         reagents: List[Reagent] = None,
         logging_level: int = logging.INFO,
         platform: AbstractPlatform = None,
+        lazy: bool = False,
     ) -> None:
+        self._lazy = lazy
         self._initialize_logging(logging_level)
         self._load_platform(platform)
         self._load_xdl(xdl, steps=steps, hardware=hardware, reagents=reagents)
@@ -153,11 +185,11 @@ class XDL(object):
     ) -> None:
         """Load XDL from given arguments. Valid argument combinations are
         just xdl, or all of steps, reagents and hardware. xdl can be a path to a
-        .xdl, .xdlexe or .json file, or an XML string of the XDL.
+        .xdl, .xdlexe, .xdlbin or .json file, or an XML string of the XDL.
 
         Args:
-            xdl (str): Path to .xdl, .xdlexe or .json XDL file, XML string, or
-                JSON dict.
+            xdl (str): Path to .xdl, .xdlexe, .xdlbin or .json XDL file, XML
+                string, or JSON dict.
             steps (List[Step]): List of Step objects to instantiate XDL with.
             reagents (List[Reagent]): List of Reagent objects to instantiate XDL
                 with.
@@ -185,7 +217,7 @@ class XDL(object):
                     self._load_xdl_from_file(xdl)
 
                 # Incorrect file path, raise error.
-                elif xdl.endswith(('.xdl', '.xdlexe', '.json')):
+                elif xdl.endswith(('.xdl', '.xdlexe', '.xdlbin', '.json')):
                     raise XDLFileNotFoundError(xdl)
 
                 # Load XDL from string, check string is not mismatched file path
@@ -221,21 +253,45 @@ class XDL(object):
         self.metadata = parsed_xdl['metadata']
 
     def _load_xdl_from_file(self, xdl_file):
-        """Load XDL from .xdl, .xdlexe or .json file.
+        """Load XDL from .xdl, .xdlexe, .xdlbin or .json file.
 
         Args:
-            xdl_file (str): .xdl, .xdlexe or .json file to load XDL from.
+            xdl_file (str): .xdl, .xdlexe, .xdlbin or .json file to load XDL
+                from.
 
         Raises:
-            XDLInvalidFileTypeError: If given file is not .xdl, .xdlexe or .json
+            XDLInvalidFileTypeError: If given file is not .xdl, .xdlexe, .xdlbin
+                or .json
         """
         file_ext = os.path.splitext(xdl_file)[1]
 
         # Load from XML .xdl or .xdlexe file
         if file_ext == '.xdl' or file_ext == '.xdlexe':
             self._xdl_file = xdl_file
-            xdl_str = read_file(xdl_file)
-            self._load_xdl_from_xml_string(xdl_str)
+            parsed_xdl = load_cached(
+                xdl_file,
+                self.platform,
+                functools.partial(
+                    xdl_file_to_objs, xdl_file, self.platform,
+                    lazy=self._lazy),
+                lazy=self._lazy
+            )
+            self._load_graph_hash(parsed_xdl['procedure_attrs'])
+            self._load_steps(parsed_xdl['steps'])
+            self.hardware = parsed_xdl['hardware']
+            self.reagents = parsed_xdl['reagents']
+            self.metadata = parsed_xdl['metadata']
+
+        # Load from binary .xdlbin file
+        elif file_ext == '.xdlbin':
+            self._xdl_file = xdl_file
+            parsed_xdl = xdl_binary_file_to_objs(
+                xdl_file, self.platform, lazy=self._lazy)
+            self._load_graph_hash(parsed_xdl['procedure_attrs'])
+            self._load_steps(parsed_xdl['steps'])
+            self.hardware = parsed_xdl['hardware']
+            self.reagents = parsed_xdl['reagents']
+            self.metadata = parsed_xdl['metadata']
 
         # Load from .json file
         elif file_ext == '.json':
@@ -256,22 +312,26 @@ class XDL(object):
             xdl_str (str): XML string of XDL.
         """
         parsed_xdl = xdl_str_to_objs(
-            xdl_str=xdl_str, platform=self.platform)
+            xdl_str=xdl_str, platform=self.platform, lazy=self._lazy)
 
-        self._load_graph_hash(xdl_str)
+        self._load_graph_hash(parsed_xdl['procedure_attrs'])
 
         self._load_steps(parsed_xdl['steps'])
         self.hardware = parsed_xdl['hardware']
         self.reagents = parsed_xdl['reagents']
         self.metadata = parsed_xdl['metadata']
 
-    def _load_graph_hash(self, xdl_str: str) -> Optional[str]:
-        """Obtain graph hash from given xdl string. If xdl string is not xdlexe,
-        there will be no graph hash so return ``None``.
+    def _load_graph_hash(self, procedure_attrs: Dict[str, Any]) -> None:
+        """Obtain graph hash from attrs of parsed ``<Synthesis>`` tag. If XDL
+        is not xdlexe, there will be no graph hash so :py:attr:`graph_sha256`
+        is left as ``None``.
+
+        Args:
+            procedure_attrs (Dict[str, Any]): Attrs of ``<Synthesis>`` tag as
+                returned by the XDL parser.
         """
-        graph_hash_search = re.search(r'graph_sha256="([a-z0-9]+)"', xdl_str)
-        if graph_hash_search:
-            self.graph_sha256 = graph_hash_search[1]
+        if procedure_attrs.get('graph_sha256'):
+            self.graph_sha256 = procedure_attrs['graph_sha256']
 
     def _validate_loaded_xdl(self):
         """Validate loaded XDL at end of ``__init__``"""
@@ -331,6 +391,53 @@ class XDL(object):
                     substep, reagent_ids, vessel_ids
                 )
 
+    @property
+    def step_index(self) -> StepIndex:
+        """Index of every step in procedure, including substeps and child
+        steps, by UUID. See :py:class:`xdl.steps.step_index.StepIndex`.
+
+        Returns:
+            StepIndex: Index of steps by UUID.
+        """
+        index = self._step_index
+        if index is None or index.steps is not self.steps:
+            self._step_index = StepIndex(self.steps)
+        return self._step_index
+
+    def get_step(self, uuid: str) -> Step:
+        """Return step with given UUID. Step can be a top level step, substep
+        or child step.
+
+        Args:
+            uuid (str): UUID of step.
+
+        Returns:
+            Step: Step with given UUID.
+
+        Raises:
+            KeyError: If no step with given UUID is in procedure.
+        """
+        return self.step_index.get(uuid)
+
+    def step_sections(self) -> Dict[str, str]:
+        """Return procedure sections of top level steps.
+
+        Returns:
+            Dict[str, str]: Dict of ``{ step_uuid: section }`` where section is
+            ``'prep'``, ``'reaction'``, ``'workup'`` or ``'purification'``.
+            Steps not in any of these sections are not included.
+        """
+        step_sections = {}
+        for section, section_uuids in [
+            ('prep', self.prep_steps),
+            ('reaction', self.reaction_steps),
+            ('workup', self.workup_steps),
+            ('purification', self.purification_steps),
+        ]:
+            for uuid in section_uuids:
+                step_sections[uuid] = section
+        return step_sections
+
     def _load_steps(
             self, steps: Union[List[Step], Dict[str, List[Step]]]) -> None:
         """Load steps. Called from constructor. If procedure sections are used
@@ -420,7 +527,9 @@ class XDL(object):
 
     def duration(self, fmt=False) -> Union[int, str]:
         """Estimated duration of procedure. It is approximate but should give a
-        give a rough idea how long the procedure should take.
+        give a rough idea how long the procedure should take. Durations of
+        steps are cached, so after editing a step only the durations of that
+        step and the steps containing it are recalculated.
 
         Returns:
             int: Estimated runtime of procedure in seconds.
@@ -431,8 +540,10 @@ class XDL(object):
 
         # Calculate duration
         duration = FTNDuration(0, 0, 0)
-        for step in self.steps:
-            duration += step.duration(self.executor._graph)
+        graph = self.executor._graph
+        with analysis_graph_hash(graph):
+            for step in self.steps:
+                duration += step.cached_duration(graph)
 
         # Return formatted time string
         if fmt:
@@ -462,14 +573,15 @@ class XDL(object):
 
         # Calculate volume of liquid reagents consumed by procedure
         reagents_consumed = {}
-        for step in self.steps:
-            step_reagents_consumed = step.reagents_consumed(
-                self.executor._graph)
-            for reagent, volume in step_reagents_consumed.items():
-                if reagent in reagents_consumed:
-                    reagents_consumed[reagent] += volume
-                else:
-                    reagents_consumed[reagent] = volume
+        graph = self.executor._graph
+        with analysis_graph_hash(graph):
+            for step in self.steps:
+                step_reagents_consumed = step.cached_reagents_consumed(graph)
+                for reagent, volume in step_reagents_consumed.items():
+                    if reagent in reagents_consumed:
+                        reagents_consumed[reagent] += volume
+                    else:
+                        reagents_consumed[reagent] = volume
 
         # Return pretty printed table str
         if fmt:
@@ -490,6 +602,23 @@ class XDL(object):
             base_steps.extend(step.base_steps)
         return base_steps
 
+    @property
+    def execution_plan(self) -> ExecutionPlan:
+        """Flat execution plan of compiled procedure. See
+        :py:mod:`xdl.execution.plan`.
+
+        Returns:
+            ExecutionPlan: Execution plan of procedure.
+
+        Raises:
+            XDLExecutionBeforeCompilationError: If procedure isn't compiled.
+        """
+        if not self.compiled:
+            raise XDLExecutionBeforeCompilationError()
+        if self._execution_plan is None:
+            self._execution_plan = ExecutionPlan(self.steps)
+        return self._execution_plan
+
     @property
     def vessel_specs(self) -> Dict[str, VesselSpec]:
         """Get specification of every vessel in procedure."""
@@ -503,6 +632,44 @@ class XDL(object):
                     vessel_specs[vessel] = spec
         return vessel_specs
 
+    @property
+    def structural_hash(self) -> str:
+        """Hash of procedure calculated from the structural hashes of all
+        steps, reagents and components. Doesn't depend on step UUIDs so is the
+        same every time the procedure is loaded. Cached until steps, reagents
+        or components are changed, added, removed or replaced. Procedures that
+        are equal always have the same hash, so procedures with different
+        hashes are not equal. See :py:mod:`xdl.utils.hashing`.
+
+        Returns:
+            str: SHA256 hex digest of procedure.
+        """
+        elements = (self.steps, self.reagents, self.hardware.components)
+        if self._hashed_elements is None or not all(
+            same_objects(element_list, hashed_element_list)
+            for element_list, hashed_element_list in zip(
+                elements, self._hashed_elements)
+        ):
+            self._structural_hash = None
+
+        if self._structural_hash is None:
+            self._hashed_elements = tuple(
+                list(element_list) for element_list in elements)
+            element_hashes = []
+            for element_list in elements:
+                for element in element_list:
+                    element._add_dependent(self)
+                element_hashes.append('|'.join(
+                    element.structural_hash for element in element_list))
+            self._structural_hash = structural_hash('XDL', {}, element_hashes)
+        return self._structural_hash
+
+    def _clear_caches(self) -> None:
+        """Clear cached structural hash. Called by steps, reagents and
+        components when they change.
+        """
+        self._structural_hash = None
+
     #########
     # Tools #
     #########
@@ -553,6 +720,7 @@ class XDL(object):
         interactive: bool = True,
         save_path: str = None,
         sanity_check: bool = True,
+        compile_workers: int = None,
         **kwargs
     ) -> None:
         """Check hardware compatibility and prepare XDL for execution on given
@@ -562,40 +730,73 @@ class XDL(object):
             graph_file (str, optional): Path to graph file. May be GraphML file,
                 JSON file with graph in node link format, or dict containing
                 graph in same format as JSON file.
+            save_path (str, optional): Path to save compiled procedure to. If
+                path ends with ``.xdlbin`` procedure is saved in binary format,
+                otherwise it is saved as xdlexe. Defaults to the path XDL was
+                loaded from with the extension ``.xdlexe``, or
+                ``.compiled.xdlbin`` if loaded from a ``.xdlbin`` file.
+            compile_workers (int, optional): Number of threads to use to
+                compile independent top level steps in parallel. See
+                :py:attr:`xdl.execution.AbstractXDLExecutor.compile_workers`.
+
+        If caches are enabled (see :py:mod:`xdl.utils.cache`), the compiled
+        procedure is loaded from the compile cache if the same procedure has
+        already been compiled with the same graph and options, skipping
+        compilation completely (see :py:mod:`xdl.execution.compile_cache`).
         """
         # Not already compiled, try to compile procedure.
         if not self.compiled:
 
             # Get XDLEXE save path from name of _xdl_file used to instantiate
-            # XDL object.
-            if self._xdl_file:
-                save_path = self._xdl_file.replace('.xdl', '.xdlexe')
-
-            # Compile procedure
-            self.executor.prepare_for_execution(
-                graph_file,
-                interactive=interactive,
-                sanity_check=sanity_check,
-                **kwargs
-            )
+            # XDL object. Uncompiled .xdlbin files are compiled to a new
+            # .xdlbin file rather than overwriting the source file.
+            if self._xdl_file and not save_path:
+                if self._xdl_file.endswith('.xdlbin'):
+                    save_path = (
+                        os.path.splitext(self._xdl_file)[0]
+                        + '.compiled.xdlbin')
+                else:
+                    save_path = self._xdl_file.replace('.xdl', '.xdlexe')
+
+            # Load compiled procedure from compile cache if possible, otherwise
+            # compile procedure.
+            compile_options = dict(
+                kwargs, interactive=interactive, sanity_check=sanity_check)
+            cache_key = None
+            if cache_enabled() and graph_file is not None:
+                graph = get_graph(graph_file)
+                cache_key = compile_cache_key(
+                    self, self.executor._graph_hash(graph), compile_options)
+
+            if cache_key and self._load_compiled(cache_key):
+                # Leave executor in the same state as after compiling. Graph is
+                # still needed to calculate duration and reagent volumes.
+                self.executor._graph = graph
+                self.executor._prepared_for_execution = True
+                prepared = True
+
+            else:
+                self.executor.compile_workers = compile_workers
+                self.executor.prepare_for_execution(
+                    graph_file, **compile_options)
+                prepared = self.executor._prepared_for_execution
+                if prepared:
+                    self.graph_sha256 = self.executor._graph_hash()
+                    self.executor.mark_compiled()
+                    if cache_key:
+                        store_compiled(cache_key, self)
 
             # Save XDLEXE, switch self.compiled flag to True, and log reagent
             # volumes consumed by procedure and estimated duration.
-            if self.executor._prepared_for_execution:
+            if prepared:
                 # Save XDLEXE
-                self.graph_sha256 = self.executor._graph_hash()
                 if save_path:
-                    xdlexe = xdl_to_xml_string(
-                        self,
-                        graph_hash=self.graph_sha256,
-                        full_properties=True,
-                        full_tree=True
-                    )
-                    with open(save_path, 'w') as fd:
-                        fd.write(xdlexe)
-
-                # Switch self.compiled flag to True and log procedure info
+                    self._save_compiled(save_path)
+
+                # Switch self.compiled flag to True, build execution plan and
+                # log procedure info
                 self.compiled = True
+                self._execution_plan = ExecutionPlan(self.steps)
                 self.logger.info(
                     f'Reagents Consumed\n{self.reagent_volumes(fmt=True)}\n')
                 self.logger.info(f'{self.duration(fmt=True)}\n')
@@ -604,6 +805,125 @@ class XDL(object):
         else:
             raise XDLDoubleCompilationError()
 
+    def recompile(
+        self,
+        graph_file: str = None,
+        save_path: str = None,
+        sanity_check: bool = True,
+    ) -> List[Step]:
+        """Compile again only the steps of compiled procedure that have been
+        added or had their properties changed since the procedure was
+        compiled, instead of compiling the whole procedure from scratch. The
+        rest of the compiled procedure is left as it is. See
+        :py:meth:`xdl.execution.AbstractXDLExecutor.recompile`.
+
+        Args:
+            graph_file (str, optional): Path to graph file, or loaded graph,
+                the procedure was compiled with. Only needed if procedure was
+                loaded from xdlexe.
+            save_path (str, optional): Path to save recompiled procedure to.
+                Saved in the same way as in :py:meth:`prepare_for_execution`.
+            sanity_check (bool): If ``True``, perform sanity checks on
+                recompiled steps.
+
+        Returns:
+            List[Step]: Steps that were recompiled.
+
+        Raises:
+            XDLRecompileBeforeCompilationError: If procedure isn't compiled.
+            XDLRecompileWithoutGraphError: If procedure was loaded from xdlexe
+                and no graph is given.
+            XDLRecompileOnDifferentGraphError: If graph is different to the
+                graph procedure was compiled with.
+        """
+        if not self.compiled:
+            raise XDLRecompileBeforeCompilationError()
+
+        graph = self.executor._graph
+        if graph_file is not None:
+            graph = get_graph(graph_file)
+            if not self.executor._graph_hash_matches(
+                    self.graph_sha256, graph):
+                raise XDLRecompileOnDifferentGraphError()
+        elif graph is None:
+            raise XDLRecompileWithoutGraphError()
+
+        steps = self.executor.recompile(graph, sanity_check=sanity_check)
+        if steps:
+            self._execution_plan = ExecutionPlan(self.steps)
+            self._step_index = None
+            self.logger.info(f'Recompiled {len(steps)} steps.')
+        if save_path:
+            self._save_compiled(save_path)
+        return steps
+
+    def _top_level_step_index(self, step: Step) -> int:
+        """Return index of step in top level steps.
+
+        Args:
+            step (Step): Top level step, or step equal to a top level step.
+
+        Returns:
+            int: Index of step in :py:attr:`steps`.
+
+        Raises:
+            XDLStepNotInStepsListError: If step is not in top level steps.
+        """
+        try:
+            path = self.step_index.path(step.uuid)
+        except KeyError:
+            path = None
+        if path is not None and len(path) == 1 and (
+                self.steps[path[0][1]] is step):
+            return path[0][1]
+        try:
+            return self.steps.index(step)
+        except ValueError:
+            raise XDLStepNotInStepsListError(step)
+
+    def _save_compiled(self, save_path: str) -> None:
+        """Save compiled procedure. If path ends with ``.xdlbin`` procedure is
+        saved in binary format, otherwise it is saved as xdlexe.
+
+        Args:
+            save_path (str): Path to save compiled procedure to.
+        """
+        if save_path.endswith('.xdlbin'):
+            with open(save_path, 'wb') as fd:
+                fd.write(xdl_to_binary(self, graph_hash=self.graph_sha256))
+
+        else:
+            xdlexe = xdl_to_xml_string(
+                self,
+                graph_hash=self.graph_sha256,
+                full_properties=True,
+                full_tree=True
+            )
+            with open(save_path, 'w') as fd:
+                fd.write(xdlexe)
+
+    def _load_compiled(self, cache_key: str) -> bool:
+        """Load compiled procedure from compile cache. Compiled properties and
+        substeps are applied to the existing steps, so steps keep their UUIDs.
+
+        Args:
+            cache_key (str): Compile cache key of procedure.
+
+        Returns:
+            bool: ``True`` if compiled procedure was found in the compile cache
+            and loaded, otherwise ``False``.
+        """
+        parsed_xdl = load_compiled(cache_key, self, lazy=self._lazy)
+        if parsed_xdl is None:
+            return False
+
+        self.logger.info('Loaded compiled procedure from compile cache.')
+        self.graph_sha256 = parsed_xdl['procedure_attrs']['graph_sha256']
+        self.hardware = parsed_xdl['hardware']
+        self.reagents = parsed_xdl['reagents']
+        self.metadata = parsed_xdl['metadata']
+        return True
+
     def execute(self, platform_controller: Any, step: int = None) -> None:
         """Execute XDL using given platform controller object.
         XDL object must either be loaded from a xdlexe file, or it must have
@@ -637,10 +957,7 @@ class XDL(object):
 
                 # Step object given.
                 elif isinstance(step, Step):
-                    try:
-                        step_index = self.steps.index(step)
-                    except ValueError:
-                        raise XDLStepNotInStepsListError(step)
+                    step_index = self._top_level_step_index(step)
 
                 # Execute step
                 self.executor.execute_step(
@@ -681,12 +998,10 @@ class XDL(object):
 
         Args:
             save_file (str): File path to save XDL to.
-            full_properties (bool): If True, all properties will be included.
-                If False, only properties that differ from their default values
-                will be included.
-                Including full properties is recommended for making XDL files
-                that will stand the test of time, as defaults may change in new
-                versions of XDL.
+            file_format (str): Format to save XDL in. ``'xml'``, ``'json'`` or
+                ``'binary'``. ``'binary'`` saves the full step tree, including
+                the graph hash if the procedure has been compiled, in the
+                ``.xdlbin`` format.
         """
         # Save XML
         if file_format == 'xml':
@@ -702,6 +1017,11 @@ class XDL(object):
                     fd, indent=2
                 )
 
+        # Save binary
+        elif file_format == 'binary':
+            with open(save_file, 'wb') as fd:
+                fd.write(xdl_to_binary(self))
+
         # Invalid file format given, raise error
         else:
             raise XDLInvalidSaveFormatError(file_format)
@@ -745,6 +1065,10 @@ class XDL(object):
         if len(self.hardware.components) != len(other.hardware.components):
             return False
 
+        # Different structural hash, not equal
+        if self.structural_hash != other.structural_hash:
+            return False
+
         # Detailed comparison of all step types and properties, including all
         # substeps and children.
         for i, step in enumerate(self.steps):
@@ -767,30 +1091,54 @@ class XDL(object):
     def __deepcopy__(self, memo) -> 'XDL':
         """Allow `copy.deepcopy(xdl)` to be called. Default does not work on
         Python 3.6 so that is why this method is here. Once 3.6 is no longer
-        supported this method can go.
+        supported this method can go. Same as :py:meth:`clone`.
         """
-        copy_steps = []
-        copy_reagents = []
-        copy_hardware = []
+        return self.clone()
 
-        # Copy steps
-        for step in self.steps:
-            copy_steps.append(copy.deepcopy(step, memo))
+    def clone(self, keep_uuids: bool = False) -> 'XDL':
+        """Return deep copy of procedure. Steps are copied with
+        :py:meth:`Step.clone`, and reagents and hardware are copied without
+        sanitizing and validating their properties again. If procedure is
+        compiled the copy is too.
 
-        # Copy reagents
-        for reagent in self.reagents:
-            copy_props = copy.deepcopy(reagent.properties)
-            copy_reagents.append(type(reagent)(**copy_props))
-
-        # Copy hardware
-        for component in self.hardware:
-            copy_props = copy.deepcopy(component.properties)
-            copy_hardware.append(type(component)(**copy_props))
+        Args:
+            keep_uuids (bool): If ``True``, copies of steps have the same UUIDs
+                as the originals. Otherwise new UUIDs are generated.
 
-        # Return new XDL object
-        return XDL(
+        Returns:
+            XDL: Copy of procedure.
+        """
+        memo = {}
+        copy_steps = [step.clone(keep_uuids, memo) for step in self.steps]
+        copied = XDL(
             steps=copy_steps,
-            reagents=copy_reagents,
-            hardware=Hardware(copy_hardware),
-            logging_level=self.logging_level
+            reagents=[copy.deepcopy(reagent) for reagent in self.reagents],
+            hardware=Hardware([
+                copy.deepcopy(component) for component in self.hardware]),
+            logging_level=self.logging_level,
+            platform=type(self.platform),
         )
+        copied.metadata = copy.deepcopy(self.metadata)
+
+        # Link UUIDs of copied steps to same sections as original steps.
+        copy_uuids = {
+            step.uuid: copy_step.uuid
+            for step, copy_step in zip(self.steps, copy_steps)
+        }
+        for section in [
+            'no_section_steps',
+            'prep_steps',
+            'reaction_steps',
+            'workup_steps',
+            'purification_steps',
+        ]:
+            setattr(copied, section, [
+                copy_uuids[uuid] for uuid in getattr(self, section)
+                if uuid in copy_uuids
+            ])
+
+        if self.compiled:
+            copied.graph_sha256 = self.graph_sha256
+            copied.compiled = True
+            copied.executor._graph = self.executor._graph
+        return copied